@@ -0,0 +1,229 @@
+import threading
+from typing import Any, Dict, List, Optional
+from columnar import cents_sql
+from database import DatabaseManager, DateLike
+from sales_analyzer import SalesAnalyzer
+from sketches import CountMinSketch, HyperLogLog, ReservoirSample, SpaceSaving
+
+ORDER_DELTA_SQL = f"""
+SELECT id, customer_id, {cents_sql('total_amount')}
+FROM orders WHERE id > ? ORDER BY id
+"""
+ITEM_DELTA_SQL = f"""
+SELECT id, product_id, quantity, {cents_sql('unit_price')}, {cents_sql('total_price')}
+FROM order_items WHERE id > ? ORDER BY id
+"""
+
+class SalesSketches:
+    """Sketches over orders and order_items, persisted in the sketch_state table.
+
+    ``refresh`` folds in the rows whose id is above the stored watermarks, so
+    its cost follows the number of new rows rather than the size of the
+    history. Ids must only grow; deleted or edited rows are not reflected
+    until ``rebuild``.
+    """
+
+    ORDER_SKETCHES = ("distinct_orders", "distinct_customers", "order_value_sample")
+    ITEM_SKETCHES = ("top_products", "product_quantity", "product_revenue",
+                     "product_unit_price", "product_lines")
+
+    def __init__(self, db: DatabaseManager, precision: int = 12, top_capacity: int = 1000,
+                 epsilon: float = 0.001, delta: float = 0.01, sample_size: int = 10000,
+                 batch_size: int = 10000):
+        self.db = db
+        self.precision = precision
+        self.top_capacity = top_capacity
+        self.epsilon = epsilon
+        self.delta = delta
+        self.sample_size = sample_size
+        self.batch_size = batch_size
+        self.lock = threading.Lock()
+        self._reset()
+        self._load()
+
+    def _reset(self):
+        self.distinct_orders = HyperLogLog(self.precision)
+        self.distinct_customers = HyperLogLog(self.precision)
+        self.order_value_sample = ReservoirSample(self.sample_size)
+        self.top_products = SpaceSaving(self.top_capacity)
+        self.product_quantity = CountMinSketch.for_error(self.epsilon, self.delta)
+        self.product_revenue = CountMinSketch.for_error(self.epsilon, self.delta)
+        # Sum of unit prices and number of lines, for the same average price as SalesAnalyzer
+        self.product_unit_price = CountMinSketch.for_error(self.epsilon, self.delta)
+        self.product_lines = CountMinSketch.for_error(self.epsilon, self.delta)
+        self.order_watermark = 0
+        self.item_watermark = 0
+
+    def _load(self):
+        rows = self.db.get_connection().execute(
+            "SELECT name, state, watermark FROM sketch_state").fetchall()
+        states = {row['name']: (row['state'], row['watermark']) for row in rows}
+        if not all(name in states for name in self.ORDER_SKETCHES + self.ITEM_SKETCHES):
+            # Nothing stored yet, or saved before a sketch was added: refresh starts over
+            return
+        self.distinct_orders = HyperLogLog.from_bytes(states["distinct_orders"][0])
+        self.distinct_customers = HyperLogLog.from_bytes(states["distinct_customers"][0])
+        self.order_value_sample = ReservoirSample.from_bytes(states["order_value_sample"][0])
+        self.top_products = SpaceSaving.from_bytes(states["top_products"][0])
+        self.product_quantity = CountMinSketch.from_bytes(states["product_quantity"][0])
+        self.product_revenue = CountMinSketch.from_bytes(states["product_revenue"][0])
+        self.product_unit_price = CountMinSketch.from_bytes(states["product_unit_price"][0])
+        self.product_lines = CountMinSketch.from_bytes(states["product_lines"][0])
+        self.order_watermark = states["distinct_orders"][1]
+        self.item_watermark = states["top_products"][1]
+
+    def _save(self):
+        conn = self.db.get_connection()
+        rows = [(name, getattr(self, name).to_bytes(), self.order_watermark)
+                for name in self.ORDER_SKETCHES]
+        rows += [(name, getattr(self, name).to_bytes(), self.item_watermark)
+                 for name in self.ITEM_SKETCHES]
+        try:
+            conn.executemany("""
+                INSERT INTO sketch_state (name, state, watermark, updated_at)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(name) DO UPDATE SET
+                    state = excluded.state,
+                    watermark = excluded.watermark,
+                    updated_at = excluded.updated_at
+            """, rows)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise e
+
+    def _fetch(self, query: str, watermark: int):
+        cursor = self.db.get_connection().cursor()
+        cursor.row_factory = None
+        cursor.execute(query, (watermark,))
+        while True:
+            rows = cursor.fetchmany(self.batch_size)
+            if not rows:
+                break
+            yield from rows
+
+    def refresh(self) -> int:
+        """Fold new orders and items into the sketches; returns the number of rows read."""
+        with self.lock:
+            count = 0
+            for order_id, customer_id, total_cents in self._fetch(ORDER_DELTA_SQL, self.order_watermark):
+                self.distinct_orders.add(order_id)
+                self.distinct_customers.add(customer_id)
+                self.order_value_sample.add(total_cents)
+                self.order_watermark = order_id
+                count += 1
+            for item_id, product_id, quantity, unit_cents, total_cents in self._fetch(ITEM_DELTA_SQL,
+                                                                                     self.item_watermark):
+                self.top_products.add(product_id, quantity)
+                self.product_quantity.add(product_id, quantity)
+                self.product_revenue.add(product_id, total_cents)
+                self.product_unit_price.add(product_id, unit_cents)
+                self.product_lines.add(product_id)
+                self.item_watermark = item_id
+                count += 1
+            if count:
+                self._save()
+            return count
+
+    def rebuild(self) -> int:
+        """Start over from empty sketches, e.g. after orders were deleted or edited."""
+        with self.lock:
+            self._reset()
+        return self.refresh()
+
+class ApproximateSalesAnalyzer(SalesAnalyzer):
+    """SalesAnalyzer with sketch-based answers whose cost does not grow with history.
+
+    Unfiltered top products come from Space-Saving with Count-Min revenue
+    estimates, and distinct counts and average order value from HyperLogLog
+    and a reservoir sample. Every approximate answer carries its error bound.
+    Filtered reports and the rollup-based ones stay exact.
+    """
+
+    def __init__(self, db_path: str = "ecommerce_sample.db", cache_size: int = 128,
+                 cache_ttl: Optional[float] = 60.0, db: Optional[DatabaseManager] = None,
+                 **sketch_options):
+        super().__init__(db_path, cache_size, cache_ttl, db)
+        self.sketches = SalesSketches(self.db, **sketch_options)
+
+    def get_top_selling_products(self, limit: int = 10, start_date: Optional[DateLike] = None,
+                                 end_date: Optional[DateLike] = None, category: Optional[str] = None,
+                                 status: Optional[str] = None) -> List[Dict[str, Any]]:
+        if start_date is not None or end_date is not None or category is not None or status is not None:
+            return super().get_top_selling_products(limit, start_date, end_date, category, status)
+
+        sketches = self.sketches
+        sketches.refresh()
+        with sketches.lock:
+            # (product_id, quantity, error, revenue cents, unit price cents, lines)
+            top = [(product_id, quantity, error, sketches.product_revenue.estimate(product_id),
+                    sketches.product_unit_price.estimate(product_id), sketches.product_lines.estimate(product_id))
+                   for product_id, quantity, error in sketches.top_products.top(limit)]
+        ids = [entry[0] for entry in top]
+        conn = self.db.get_connection()
+        rows = conn.execute(f"""
+            SELECT p.id, p.name, p.sku, c.name as category
+            FROM products p LEFT JOIN categories c ON p.category_id = c.id
+            WHERE p.id IN ({", ".join("?" for _ in ids)})
+        """, ids).fetchall()
+        products = {row['id']: row for row in rows}
+
+        results = []
+        for product_id, quantity, error, revenue_cents, unit_price_cents, lines in top:
+            product = products.get(product_id)
+            if product is None:
+                continue
+            revenue = revenue_cents / 100
+            results.append({
+                "product_name": product['name'],
+                "sku": product['sku'],
+                "category": product['category'],
+                "quantity_sold": quantity,
+                "revenue": revenue,
+                "avg_price": unit_price_cents / lines / 100 if lines else 0.0,
+                "quantity_error": error
+            })
+        return results
+
+    def estimate_quantity_sold(self, product_id: int) -> Dict[str, float]:
+        """Count-Min estimate; overcounts by at most ``error`` with probability ``confidence``."""
+        self.sketches.refresh()
+        sketch = self.sketches.product_quantity
+        return {"estimate": sketch.estimate(product_id), "error": sketch.error_bound,
+                "confidence": 1 - sketch.delta}
+
+    def get_distinct_customers(self) -> Dict[str, float]:
+        self.sketches.refresh()
+        sketch = self.sketches.distinct_customers
+        return {"estimate": sketch.count(), "relative_error": sketch.relative_error}
+
+    def get_order_count(self) -> Dict[str, float]:
+        self.sketches.refresh()
+        sketch = self.sketches.distinct_orders
+        return {"estimate": sketch.count(), "relative_error": sketch.relative_error}
+
+    def get_average_order_value(self) -> Dict[str, float]:
+        """Sample mean with a 95% confidence interval of +/- ``margin``."""
+        self.sketches.refresh()
+        sample = self.sketches.order_value_sample
+        return {
+            "estimate": sample.mean() / 100,
+            "margin": 1.96 * sample.standard_error() / 100,
+            "sample_size": len(sample.values),
+            "orders_seen": sample.seen
+        }
+
+    def print_sales_report(self, full_summary: bool = False):
+        super().print_sales_report(full_summary)
+        orders = self.get_order_count()
+        customers = self.get_distinct_customers()
+        average = self.get_average_order_value()
+        top_error = self.sketches.top_products.error_bound
+
+        print("\nAPPROXIMATE METRICS:")
+        print(f"Orders: ~{orders['estimate']} (+/-{orders['relative_error']:.1%} std. error)")
+        print(f"Distinct customers: ~{customers['estimate']} "
+              f"(+/-{customers['relative_error']:.1%} std. error)")
+        print(f"Average order value: ${average['estimate']:.2f} +/- ${average['margin']:.2f} "
+              f"(95%, {average['sample_size']} of {average['orders_seen']} orders sampled)")
+        print(f"Top product quantities overcount by at most {top_error:.0f} units")
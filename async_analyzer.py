@@ -0,0 +1,122 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from connection_pool import ConnectionPool
+from database import DatabaseManager, DateLike
+from sales_analyzer import SalesAnalyzer
+
+class _Job:
+    """Tracks which connection a running report uses so it can be interrupted."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.conn = None
+        self.cancelled = False
+
+    def interrupt(self):
+        with self.lock:
+            self.cancelled = True
+            if self.conn is not None:
+                self.conn.interrupt()
+
+class AsyncSalesAnalyzer:
+    """asyncio facade over SalesAnalyzer.
+
+    Queries run on a dedicated thread pool whose threads draw from their own
+    ConnectionPool, so the event loop never blocks on SQLite. A call that times
+    out or is cancelled interrupts its running SQLite statement instead of
+    letting it run on in the background.
+    """
+
+    def __init__(self, db_path: str = "ecommerce_sample.db", max_workers: int = 3,
+                 timeout: Optional[float] = None, cache_size: int = 128,
+                 cache_ttl: Optional[float] = 60.0, pragmas: Optional[Dict[str, Any]] = None):
+        self.pool = ConnectionPool(db_path, pragmas)
+        db = DatabaseManager(db_path, pool=self.pool)
+        self.analyzer = SalesAnalyzer(db_path, cache_size, cache_ttl, db=db)
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="async-analyzer")
+
+    async def _run(self, func: Callable, *args, timeout: Optional[float] = None, **kwargs):
+        job = _Job()
+
+        def work():
+            with job.lock:
+                if job.cancelled:
+                    raise asyncio.CancelledError()
+                job.conn = self.analyzer.db.get_connection()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with job.lock:
+                    job.conn = None
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, work)
+        try:
+            return await asyncio.wait_for(future, timeout if timeout is not None else self.timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            job.interrupt()
+            raise
+
+    async def get_top_selling_products(self, limit: int = 10, start_date: Optional[DateLike] = None,
+                                       end_date: Optional[DateLike] = None,
+                                       category: Optional[str] = None, status: Optional[str] = None,
+                                       timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        return await self._run(self.analyzer.get_top_selling_products, limit, start_date,
+                               end_date, category, status, timeout=timeout)
+
+    async def get_revenue_by_category(self, start_date: Optional[DateLike] = None,
+                                      end_date: Optional[DateLike] = None,
+                                      status: Optional[str] = None,
+                                      timeout: Optional[float] = None) -> Dict[str, float]:
+        return await self._run(self.analyzer.get_revenue_by_category, start_date, end_date,
+                               status, timeout=timeout)
+
+    async def get_daily_sales_report(self, days: int = 7,
+                                     timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        return await self._run(self.analyzer.get_daily_sales_report, days, timeout=timeout)
+
+    async def get_sales_trend(self, start_date: Optional[DateLike] = None,
+                              end_date: Optional[DateLike] = None, granularity: str = "day",
+                              timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        return await self._run(self.analyzer.get_sales_trend, start_date, end_date, granularity,
+                               timeout=timeout)
+
+    async def get_sales_report(self, top_n: int = 5, days: int = 7,
+                               timeout: Optional[float] = None) -> Dict[str, Any]:
+        """The three print_sales_report sections, computed concurrently.
+
+        ``timeout`` applies to the report as a whole; if it expires or the
+        caller is cancelled, all unfinished sections are interrupted.
+        """
+        sections = asyncio.gather(
+            self.get_top_selling_products(top_n),
+            self.get_revenue_by_category(),
+            self.get_daily_sales_report(days),
+        )
+        top_products, category_revenue, daily_sales = await asyncio.wait_for(
+            sections, timeout if timeout is not None else self.timeout)
+        return {
+            "top_products": top_products,
+            "revenue_by_category": category_revenue,
+            "daily_sales": daily_sales,
+        }
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return self.analyzer.cache_stats()
+
+    async def close(self):
+        def shutdown():
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self.pool.close_all()
+
+        await asyncio.get_running_loop().run_in_executor(None, shutdown)
+
+    async def __aenter__(self) -> "AsyncSalesAnalyzer":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
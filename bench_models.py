@@ -0,0 +1,74 @@
+"""Micro-benchmark: per-instance memory and construction cost of the model types.
+
+Compares the original ``__dict__``-backed dataclass with the slotted
+``SalesData`` dataclass, a frozen slotted dataclass and the tuple-backed
+``SalesRow``. Run with ``python bench_models.py [count]``.
+"""
+import sys
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+from decimal import Decimal
+from models import SalesData, SalesRow
+
+@dataclass
+class DictSalesData:
+    """SalesData as it was defined before slots were added."""
+    product_name: str = ""
+    sku: str = ""
+    category: str = ""
+    total_quantity_sold: int = 0
+    total_revenue: Decimal = Decimal('0.00')
+    avg_selling_price: Decimal = Decimal('0.00')
+    number_of_orders: int = 0
+
+@dataclass(frozen=True, slots=True)
+class FrozenSalesData:
+    product_name: str = ""
+    sku: str = ""
+    category: str = ""
+    total_quantity_sold: int = 0
+    total_revenue: Decimal = Decimal('0.00')
+    avg_selling_price: Decimal = Decimal('0.00')
+    number_of_orders: int = 0
+
+# Raw rows as sqlite3 returns them: money as float
+ROW = ("Smartphone X1", "PHONE001", "Electronics", 12, 8399.88, 699.99, 9)
+
+def build_decimal(cls):
+    name, sku, category, quantity, revenue, price, orders = ROW
+    return cls(name, sku, category, quantity, Decimal(str(revenue)), Decimal(str(price)), orders)
+
+def build_cents():
+    name, sku, category, quantity, revenue, price, orders = ROW
+    return SalesRow(name, sku, category, quantity, round(revenue * 100), round(price * 100), orders)
+
+CASES = [
+    ("dataclass (__dict__, Decimal)", lambda: build_decimal(DictSalesData)),
+    ("dataclass slots (Decimal)", lambda: build_decimal(SalesData)),
+    ("dataclass frozen+slots (Decimal)", lambda: build_decimal(FrozenSalesData)),
+    ("SalesRow tuple (int cents)", build_cents),
+]
+
+def measure_memory(factory, count: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    instances = [factory() for _ in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    # Exclude the list holding the instances
+    allocated -= sys.getsizeof(instances)
+    return allocated / count
+
+def run(count: int = 100000):
+    print(f"{'model':36} {'bytes/instance':>15} {'ns/construct':>13} {'ns/attr read':>13}")
+    for label, factory in CASES:
+        memory = measure_memory(factory, count)
+        construct = timeit.timeit(factory, number=count) / count * 1e9
+        instance = factory()
+        read = timeit.timeit(lambda: instance.total_revenue, number=count) / count * 1e9
+        print(f"{label:36} {memory:15.0f} {construct:13.0f} {read:13.0f}")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,59 @@
+"""Micro-benchmark: orders per second through create_order and BatchedOrderWriter.
+
+Each case writes the same orders into a fresh database, once with the
+default ``synchronous = NORMAL`` and once with ``FULL`` (an fsync per
+commit). Run with ``python bench_order_writes.py [orders]``.
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from decimal import Decimal
+from connection_pool import DEFAULT_PRAGMAS, ConnectionPool
+from database import DatabaseManager
+from models import Category, Customer, Order, OrderItem, Product
+from order_writer import BatchedOrderWriter
+
+BATCH_SIZES = [1, 10, 100, 1000]
+
+def fresh_database(directory: str, name: str, synchronous: str) -> DatabaseManager:
+    pragmas = dict(DEFAULT_PRAGMAS, synchronous=synchronous)
+    db = DatabaseManager(os.path.join(directory, name), pool=ConnectionPool(os.path.join(directory, name), pragmas))
+    category_id = db.add_category(Category(name="Bench"))
+    db.add_product(Product(name="Widget", sku="W1", category_id=category_id, price=Decimal("9.99")))
+    db.add_customer(Customer(email="bench@example.com"))
+    return db
+
+def make_orders(count: int):
+    now = datetime(2026, 1, 1)
+    return [
+        (Order(customer_id=1, order_date=now, status="completed", total_amount=Decimal("19.98")),
+         [OrderItem(product_id=1, quantity=2, unit_price=Decimal("9.99"), total_price=Decimal("19.98"))])
+        for _ in range(count)
+    ]
+
+def run(count: int = 2000):
+    orders = make_orders(count)
+    print(f"{'synchronous':12} {'writer':24} {'orders/sec':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for synchronous in ("NORMAL", "FULL"):
+            db = fresh_database(directory, f"single_{synchronous}.db", synchronous)
+            started = time.perf_counter()
+            for order, items in orders:
+                db.create_order(order, items)
+            print(f"{synchronous:12} {'create_order':24} {count / (time.perf_counter() - started):12,.0f}")
+            db.close()
+
+            for batch_size in BATCH_SIZES:
+                db = fresh_database(directory, f"batched_{synchronous}_{batch_size}.db", synchronous)
+                started = time.perf_counter()
+                with BatchedOrderWriter(db, max_batch=batch_size) as writer:
+                    futures = [writer.submit(order, items) for order, items in orders]
+                assert all(future.result() for future in futures)
+                label = f"batched, max_batch={batch_size}"
+                print(f"{synchronous:12} {label:24} {count / (time.perf_counter() - started):12,.0f}")
+                db.close()
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
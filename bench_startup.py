@@ -0,0 +1,51 @@
+"""Micro-benchmark: wall time and imported modules of trivial CLI invocations.
+
+Each case runs ``main.py`` in a fresh interpreter, as cron jobs and health
+checks do, next to a bare ``python -c pass`` baseline. Run with
+``python bench_startup.py [repeat]``.
+"""
+import os
+import subprocess
+import sys
+import time
+
+MAIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+CASES = [
+    ("python -c pass", ["-c", "pass"]),
+    ("main.py", [MAIN]),
+    ("main.py --help", [MAIN, "--help"]),
+    ("main.py unknown-command", [MAIN, "unknown-command"]),
+]
+
+# Project modules a trivial invocation should not import
+HEAVY_MODULES = ["database", "sales_analyzer", "csv_loader", "sample_data", "sqlite3"]
+
+def best_wall_time(args, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, *args], stdout=subprocess.DEVNULL, check=True)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+def imported_modules(args) -> set:
+    """Top-level modules the interpreter imported, from ``-X importtime``."""
+    result = subprocess.run([sys.executable, "-X", "importtime", *args], stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, text=True, check=True)
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            modules.add(line.rsplit("|", 1)[1].strip().split(".")[0])
+    return modules
+
+def run(repeat: int = 20):
+    print(f"{'invocation':28} {'best ms':>9} {'modules':>8}  heavy imports")
+    for label, args in CASES:
+        seconds = best_wall_time(args, repeat)
+        modules = imported_modules(args)
+        heavy = [name for name in HEAVY_MODULES if name in modules]
+        print(f"{label:28} {seconds * 1000:9.1f} {len(modules):8}  {', '.join(heavy) or '-'}")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
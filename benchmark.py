@@ -0,0 +1,147 @@
+"""Benchmark data generation, CSV ingestion and the SalesAnalyzer reports at several scales.
+
+    python benchmark.py --scales 10000 100000 --output bench_results/current.json
+    python benchmark.py --scales 10000 --compare bench_results/previous.json
+
+Each scale gets a fresh synthetic dataset in ``--workdir``. Report timings are
+the best of ``--repeat`` runs with the result cache disabled.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from csv_loader import CSVLoader
+from sales_analyzer import SalesAnalyzer
+from synthetic_data import generate_synthetic_data
+
+DEFAULT_SCALES = [10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+
+def timed(func: Callable[[], Any]) -> Tuple[float, Any]:
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+def best_of(func: Callable[[], Any], repeat: int) -> float:
+    return min(timed(func)[0] for _ in range(repeat))
+
+def report_cases(analyzer: SalesAnalyzer) -> List[Tuple[str, Callable[[], Any]]]:
+    return [
+        ("top_selling_products", lambda: analyzer.get_top_selling_products(10)),
+        ("revenue_by_category", lambda: analyzer.get_revenue_by_category()),
+        ("daily_sales_report", lambda: analyzer.get_daily_sales_report(30)),
+        ("print_sales_report", lambda: analyzer.print_sales_report()),
+    ]
+
+def run_scale(orders: int, workdir: str, repeat: int, seed: int) -> Dict[str, Any]:
+    scale_dir = os.path.join(workdir, str(orders))
+    shutil.rmtree(scale_dir, ignore_errors=True)
+    csv_dir = os.path.join(scale_dir, "data")
+    db_path = os.path.join(scale_dir, "bench.db")
+
+    products = max(100, orders // 100)
+    customers = max(100, orders // 10)
+    timings: Dict[str, float] = {}
+
+    timings["generate_csv"], counts = timed(lambda: generate_synthetic_data(
+        csv_dir=csv_dir, orders=orders, products=products, customers=customers, seed=seed))
+
+    loader = CSVLoader(db_path, csv_dir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        timings["csv_bulk_load"], _ = timed(loader.bulk_load_all_data)
+        fresh_loader = CSVLoader(os.path.join(scale_dir, "fresh.db"), csv_dir)
+        timings["csv_fresh_load"], _ = timed(lambda: fresh_loader.bulk_load_all_data(fresh=True))
+
+    analyzer = SalesAnalyzer(db_path, cache_size=0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name, case in report_cases(analyzer):
+            timings[name] = best_of(case, repeat)
+
+    rows = sum(counts.values())
+    return {
+        "orders": orders,
+        "rows": counts,
+        "timings": timings,
+        "load_rows_per_sec": rows / timings["csv_bulk_load"] if timings["csv_bulk_load"] else None,
+        "db_bytes": os.path.getsize(db_path),
+    }
+
+def environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+    }
+
+def compare(current: Dict[str, Any], previous: Dict[str, Any], threshold: float = 1.2,
+            min_delta: float = 0.001) -> int:
+    """Print timing ratios against a previous run; return the number of regressions.
+
+    A timing regresses when it is ``threshold`` times slower and at least
+    ``min_delta`` seconds slower, so sub-millisecond noise is not flagged.
+    """
+    before = {result["orders"]: result["timings"] for result in previous["results"]}
+    regressions = 0
+    print(f"\nComparison with {previous['environment'].get('commit')} "
+          f"({previous['environment'].get('timestamp')}):")
+    for result in current["results"]:
+        old = before.get(result["orders"])
+        if old is None:
+            continue
+        for name, seconds in result["timings"].items():
+            if name not in old or not old[name]:
+                continue
+            ratio = seconds / old[name]
+            slower = ratio > threshold and seconds - old[name] >= min_delta
+            flag = "  REGRESSION" if slower else ""
+            regressions += bool(flag)
+            print(f"  {result['orders']:>9} {name:22} {old[name]:9.4f}s -> {seconds:9.4f}s ({ratio:5.2f}x){flag}")
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES,
+                        help="order counts to benchmark")
+    parser.add_argument("--workdir", default="bench_data")
+    parser.add_argument("--output", default=os.path.join("bench_results", "latest.json"))
+    parser.add_argument("--compare", help="previous results JSON to compare against")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    results = {"environment": environment(), "results": []}
+    for orders in args.scales:
+        print(f"Benchmarking {orders:,} orders...")
+        result = run_scale(orders, args.workdir, args.repeat, args.seed)
+        results["results"].append(result)
+        for name, seconds in result["timings"].items():
+            print(f"  {name:22} {seconds:9.4f}s")
+        print(f"  {'load rows/sec':22} {result['load_rows_per_sec']:,.0f}")
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            return 1 if compare(results, json.load(f)) else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+import sqlite3
+from array import array
+from typing import Any, Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Integer columns cannot hold NULL, so missing ids and amounts read as this.
+MISSING = -1
+
+# Column kinds understood by read_columns
+INT = "int"
+FLOAT = "float"
+TEXT = "text"
+
+def cents_sql(expression: str) -> str:
+    """SQL that converts a stored money column to integer cents."""
+    return f"CAST(ROUND({expression} * 100) AS INTEGER)"
+
+def _finish(kind: str, values):
+    if np is None:
+        return values
+    if kind == INT:
+        return np.frombuffer(values, dtype=np.int64) if len(values) else np.zeros(0, dtype=np.int64)
+    if kind == FLOAT:
+        return np.frombuffer(values, dtype=np.float64) if len(values) else np.zeros(0, dtype=np.float64)
+    return np.array(values, dtype=object)
+
+def read_columns(conn: sqlite3.Connection, query: str, schema: Sequence[Tuple[str, str]],
+                 params: Sequence[Any] = (), batch_size: int = 10000) -> Dict[str, Any]:
+    """Run ``query`` and return its result as one array per column.
+
+    ``schema`` lists ``(name, kind)`` pairs in select-list order. Integer and
+    float columns come back as NumPy arrays when NumPy is installed and as
+    ``array.array`` otherwise; text columns as object arrays or lists.
+    """
+    buffers: List[Any] = []
+    for _, kind in schema:
+        if kind == INT:
+            buffers.append(array("q"))
+        elif kind == FLOAT:
+            buffers.append(array("d"))
+        else:
+            buffers.append([])
+
+    cursor = conn.cursor()
+    cursor.row_factory = None  # plain tuples, no sqlite3.Row per row
+    cursor.execute(query, params)
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        for index, column in enumerate(zip(*rows)):
+            kind = schema[index][1]
+            if kind == INT:
+                buffers[index].extend(MISSING if v is None else v for v in column)
+            elif kind == FLOAT:
+                buffers[index].extend(float("nan") if v is None else v for v in column)
+            else:
+                buffers[index].extend(column)
+    cursor.close()
+
+    return {name: _finish(kind, buffer) for (name, kind), buffer in zip(schema, buffers)}
+
+def group_sum(keys, values) -> Dict[Any, int]:
+    """Sum integer ``values`` per distinct key."""
+    if np is not None:
+        keys = np.asarray(keys)
+        values = np.asarray(values, dtype=np.int64)
+        if not len(keys):
+            return {}
+        unique, inverse = np.unique(keys, return_inverse=True)
+        sums = np.zeros(len(unique), dtype=np.int64)
+        np.add.at(sums, inverse, values)
+        return {key: int(total) for key, total in zip(unique.tolist(), sums.tolist())}
+
+    totals: Dict[Any, int] = {}
+    for key, value in zip(keys, values):
+        totals[key] = totals.get(key, 0) + value
+    return totals
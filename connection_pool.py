@@ -0,0 +1,106 @@
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Optional, Tuple
+from instrumentation import InstrumentedConnection, instrumentation
+
+# Applied to every pooled connection. Pass ``pragmas`` to override or extend.
+DEFAULT_PRAGMAS: Dict[str, Any] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -64000,      # negative means KiB, so 64 MB of page cache
+    "mmap_size": 268435456,    # 256 MB
+    "temp_store": "MEMORY",
+}
+
+class ConnectionPool:
+    """Long-lived SQLite connections for one database file, one per thread.
+
+    sqlite3 connections must not be shared between threads while in use, so
+    each thread gets its own connection which is reused for the life of the
+    thread. Connections owned by threads that have exited are closed the next
+    time a new connection is opened.
+    """
+
+    def __init__(self, db_path: str, pragmas: Optional[Dict[str, Any]] = None):
+        self.db_path = db_path
+        self.pragmas = dict(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+        self.schema_ready = False
+        self.write_version = 0
+        self.lock = threading.RLock()
+        self._local = threading.local()
+        self._connections: Dict[int, Tuple[threading.Thread, sqlite3.Connection]] = {}
+        self._generation = 0
+        # Never writes, so its data_version moves on every commit by any other connection
+        self._watcher: Optional[sqlite3.Connection] = None
+
+    def connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, factory=InstrumentedConnection)
+        instrumentation.count("connections_opened")
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def get(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.generation == self._generation:
+            return conn
+
+        conn = self.connect()
+        thread = threading.current_thread()
+        with self.lock:
+            self._prune()
+            self._connections[thread.ident] = (thread, conn)
+            self._local.conn = conn
+            self._local.generation = self._generation
+        return conn
+
+    def data_version(self) -> int:
+        """PRAGMA data_version of one shared read-only connection.
+
+        The pragma is per connection, so each thread's own connection would
+        count commits differently; this one value is the same for every thread.
+        """
+        with self.lock:
+            if self._watcher is None:
+                self._watcher = sqlite3.connect(self.db_path, check_same_thread=False)
+            return self._watcher.execute("PRAGMA data_version").fetchone()[0]
+
+    def _prune(self):
+        for ident, (thread, conn) in list(self._connections.items()):
+            if not thread.is_alive():
+                conn.close()
+                instrumentation.count("connections_closed")
+                del self._connections[ident]
+
+    def close_all(self):
+        with self.lock:
+            for _, conn in self._connections.values():
+                conn.close()
+                instrumentation.count("connections_closed")
+            self._connections.clear()
+            self._generation += 1
+            if self._watcher is not None:
+                self._watcher.close()
+                self._watcher = None
+
+    @property
+    def size(self) -> int:
+        return len(self._connections)
+
+_pools: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+def get_pool(db_path: str, pragmas: Optional[Dict[str, Any]] = None) -> ConnectionPool:
+    """Return the process-wide pool for ``db_path``, creating it on first use."""
+    settings = DEFAULT_PRAGMAS if pragmas is None else pragmas
+    path = db_path if db_path == ":memory:" else os.path.abspath(db_path)
+    key = (path, tuple(sorted((name, str(value)) for name, value in settings.items())))
+
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(db_path, pragmas)
+            _pools[key] = pool
+        return pool
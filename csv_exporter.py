@@ -0,0 +1,50 @@
+import csv
+import os
+from dataclasses import astuple, fields
+from typing import Dict, Iterable
+from database import DatabaseManager
+from models import Product, SalesData
+
+class CSVExporter:
+    def __init__(self, db_path: str = "ecommerce.db", output_dir: str = "export",
+                 batch_size: int = 1000):
+        self.db = DatabaseManager(db_path)
+        self.output_dir = output_dir
+        self.batch_size = batch_size
+
+    def write_records(self, file_name: str, record_type: type, records: Iterable) -> int:
+        """Write dataclass records to a CSV file as they arrive, one row at a time."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        csv_path = os.path.join(self.output_dir, file_name)
+        count = 0
+
+        with open(csv_path, 'w', encoding='utf-8', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow([field.name for field in fields(record_type)])
+            for record in records:
+                writer.writerow(astuple(record))
+                count += 1
+
+        return count
+
+    def export_sales_summary(self) -> int:
+        return self.write_records("sales_summary.csv", SalesData,
+                                  self.db.iter_sales_summary(self.batch_size))
+
+    def export_products(self) -> int:
+        return self.write_records("products.csv", Product,
+                                  self.db.iter_products(self.batch_size))
+
+    def export_all_data(self) -> Dict[str, int]:
+        print(f"Exporting data to {self.output_dir}...")
+        counts = {
+            "sales_summary": self.export_sales_summary(),
+            "products": self.export_products(),
+        }
+        for name, count in counts.items():
+            print(f"   Exported {count} rows to {name}.csv")
+        return counts
+
+if __name__ == "__main__":
+    exporter = CSVExporter("ecommerce_csv.db")
+    exporter.export_all_data()
@@ -1,15 +1,149 @@
 import csv
 import os
-from typing import List
+import time
+from contextlib import nullcontext
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
 from decimal import Decimal
 from datetime import datetime
 from database import DatabaseManager
+from external_sort import check_sorted, external_sort, merge_join
+from instrumentation import instrumentation
 from models import Category, Product, Customer, Order, OrderItem
 
+# Column lists and row converters used by the bulk load path. Each converter
+# turns a csv.DictReader row into a tuple matching its column list.
+CATEGORY_COLUMNS = ["name", "description"]
+PRODUCT_COLUMNS = ["name", "sku", "category_id", "price", "cost", "description",
+                   "stock_quantity", "is_active"]
+CUSTOMER_COLUMNS = ["email", "first_name", "last_name", "phone"]
+ORDER_COLUMNS = ["id", "customer_id", "order_date", "status", "total_amount",
+                 "shipping_cost", "tax_amount"]
+ORDER_ITEM_COLUMNS = ["order_id", "product_id", "quantity", "unit_price", "total_price"]
+
+def category_row(row: Dict[str, str]) -> tuple:
+    return (row['name'], row['description'])
+
+def product_row(row: Dict[str, str]) -> tuple:
+    return (
+        row['name'],
+        row['sku'],
+        int(row['category_id']),
+        float(row['price']),
+        float(row['cost']) if row['cost'] else None,
+        row['description'],
+        int(row['stock_quantity']),
+        bool(int(row['is_active']))
+    )
+
+def customer_row(row: Dict[str, str]) -> tuple:
+    return (row['email'], row['first_name'], row['last_name'], row['phone'])
+
+def order_row(row: Dict[str, str]) -> tuple:
+    return (
+        int(row['id']),
+        int(row['customer_id']),
+        datetime.fromisoformat(row['order_date']).isoformat(" "),
+        row['status'],
+        float(row['total_amount']),
+        float(row['shipping_cost']),
+        float(row['tax_amount'])
+    )
+
+def order_item_row(row: Dict[str, str]) -> tuple:
+    return (
+        int(row['order_id']),
+        int(row['product_id']),
+        int(row['quantity']),
+        float(row['unit_price']),
+        float(row['total_price'])
+    )
+
+def with_id(convert: Callable[[Dict[str, str]], tuple]) -> Callable[[Dict[str, str]], tuple]:
+    """Prefix a converter's tuple with the row's source id."""
+    return lambda row: (int(row['id']),) + convert(row)
+
+# (table, csv file, columns, converter) in foreign-key order. Every table
+# keeps its source ids, so the foreign keys in the files resolve as written.
+BULK_TABLES = [
+    ("categories", "categories.csv", ["id"] + CATEGORY_COLUMNS, with_id(category_row)),
+    ("products", "products.csv", ["id"] + PRODUCT_COLUMNS, with_id(product_row)),
+    ("customers", "customers.csv", ["id"] + CUSTOMER_COLUMNS, with_id(customer_row)),
+    ("orders", "orders.csv", ORDER_COLUMNS, order_row),
+    ("order_items", "order_items.csv", ["id"] + ORDER_ITEM_COLUMNS, with_id(order_item_row)),
+]
+
+def upsert_clause(columns: Sequence[str], touch: Sequence[str] = ()) -> str:
+    """ON CONFLICT(id) clause that only rewrites rows whose values changed.
+
+    Columns in ``touch`` are set to CURRENT_TIMESTAMP when a row changes.
+    """
+    updates = [column for column in columns if column != "id"]
+    assignments = [f"{column} = excluded.{column}" for column in updates]
+    assignments += [f"{column} = CURRENT_TIMESTAMP" for column in touch]
+    changed = " OR ".join(f"{column} IS NOT excluded.{column}" for column in updates)
+    return f"ON CONFLICT(id) DO UPDATE SET {', '.join(assignments)} WHERE {changed}"
+
+# (table, csv file, columns, converter, append only) for incremental loads.
+# Every table keeps its source ids. Dimension files are upserted whenever they
+# change; orders and items are append-only and resume at a byte offset.
+INCREMENTAL_TABLES = [
+    ("categories", "categories.csv", ["id"] + CATEGORY_COLUMNS, with_id(category_row), False),
+    ("products", "products.csv", ["id"] + PRODUCT_COLUMNS, with_id(product_row), False),
+    ("customers", "customers.csv", ["id"] + CUSTOMER_COLUMNS, with_id(customer_row), False),
+    ("orders", "orders.csv", ORDER_COLUMNS, order_row, True),
+    ("order_items", "order_items.csv", ["id"] + ORDER_ITEM_COLUMNS, with_id(order_item_row), True),
+]
+
+# Columns stamped when an upsert changes a row
+TOUCH_COLUMNS = {"products": ["updated_at"]}
+
+class AppendedRows:
+    """Rows of a CSV file from byte ``offset`` on, as dicts keyed by ``header``.
+
+    Only lines ending in a newline are read; an unterminated last line may
+    still be being written, so it is left for the next run. Pass
+    ``producer_closed`` once the writer has closed the file for good to take
+    that line as its final row. ``offset``, ``rows`` and ``high_water_id``
+    always describe the rows yielded so far.
+    """
+
+    def __init__(self, path: str, header: List[str], offset: int,
+                 high_water_id: Optional[int] = None, producer_closed: bool = False):
+        self.path = path
+        self.header = header
+        self.offset = offset
+        self.producer_closed = producer_closed
+        self.rows = 0
+        self.high_water_id = high_water_id
+
+    def _lines(self, file) -> Iterator[str]:
+        for line in file:
+            if not line.endswith(b"\n") and not self.producer_closed:
+                break
+            self.offset += len(line)
+            yield line.decode("utf-8")
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        with open(self.path, 'rb') as file:
+            file.seek(self.offset)
+            for values in csv.reader(self._lines(file)):
+                if not values:
+                    # The newline that starts a row appended after an unterminated last line
+                    continue
+                row = dict(zip(self.header, values))
+                row_id = int(row['id'])
+                if self.high_water_id is None or row_id > self.high_water_id:
+                    self.high_water_id = row_id
+                self.rows += 1
+                yield row
+
 class CSVLoader:
-    def __init__(self, db_path: str = "ecommerce.db", data_dir: str = "data"):
+    def __init__(self, db_path: str = "ecommerce.db", data_dir: str = "data",
+                 batch_size: int = 10000, max_rows_in_memory: int = 100000):
         self.db = DatabaseManager(db_path)
         self.data_dir = data_dir
+        self.batch_size = batch_size
+        self.max_rows_in_memory = max_rows_in_memory
     
     def load_categories(self) -> List[int]:
         category_ids = []
@@ -67,65 +201,221 @@ class CSVLoader:
         
         return customer_ids
     
-    def load_orders_and_items(self):
-        orders_path = os.path.join(self.data_dir, "orders.csv")
-        items_path = os.path.join(self.data_dir, "order_items.csv")
+    def read_rows(self, file_name: str, key_column: str, sorted_input: bool) -> Iterator[Dict[str, str]]:
+        """Yield the rows of ``file_name`` in ``key_column`` order within the memory cap."""
+        csv_path = os.path.join(self.data_dir, file_name)
         
-        # Load order items into memory first
-        order_items_dict = {}
-        with open(items_path, 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                order_id = int(row['order_id'])
-                if order_id not in order_items_dict:
-                    order_items_dict[order_id] = []
-                
-                item = OrderItem(
-                    product_id=int(row['product_id']),
-                    quantity=int(row['quantity']),
-                    unit_price=Decimal(row['unit_price']),
-                    total_price=Decimal(row['total_price'])
-                )
-                order_items_dict[order_id].append(item)
+        with open(csv_path, 'r', encoding='utf-8', newline='') as file:
+            reader = csv.reader(file)
+            header = next(reader, [])
+            index = header.index(key_column)
+            key = lambda row: int(row[index])
+            
+            if sorted_input:
+                rows = check_sorted(reader, key, file_name)
+            else:
+                rows = external_sort(reader, key, self.max_rows_in_memory)
+            for row in rows:
+                yield dict(zip(header, row))
+    
+    def load_orders_and_items(self, sorted_input: bool = False):
+        """Create each order with its items, holding at most ``max_rows_in_memory`` rows.
+
+        With ``sorted_input`` both files must already be ordered by order id and
+        are merge-joined as they stream; otherwise they are sorted externally,
+        spilling to temporary files when they exceed the cap.
+        """
+        orders = self.read_rows("orders.csv", "id", sorted_input)
+        items = self.read_rows("order_items.csv", "order_id", sorted_input)
+        order_key = lambda row: int(row['id'])
+        item_key = lambda row: int(row['order_id'])
         
-        # Load orders and create them with their items
-        with open(orders_path, 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                order_id = int(row['id'])
-                order = Order(
-                    customer_id=int(row['customer_id']),
-                    order_date=datetime.fromisoformat(row['order_date']),
-                    status=row['status'],
-                    total_amount=Decimal(row['total_amount']),
-                    shipping_cost=Decimal(row['shipping_cost']),
-                    tax_amount=Decimal(row['tax_amount'])
+        for row, item_rows in merge_join(orders, items, order_key, item_key):
+            order = Order(
+                customer_id=int(row['customer_id']),
+                order_date=datetime.fromisoformat(row['order_date']),
+                status=row['status'],
+                total_amount=Decimal(row['total_amount']),
+                shipping_cost=Decimal(row['shipping_cost']),
+                tax_amount=Decimal(row['tax_amount'])
+            )
+            
+            items = [
+                OrderItem(
+                    product_id=int(item['product_id']),
+                    quantity=int(item['quantity']),
+                    unit_price=Decimal(item['unit_price']),
+                    total_price=Decimal(item['total_price'])
                 )
-                
-                items = order_items_dict.get(order_id, [])
-                self.db.create_order(order, items)
+                for item in item_rows
+            ]
+            self.db.create_order(order, items)
     
-    def load_all_data(self):
+    def load_all_data(self, sorted_input: bool = False):
         print("Loading data from CSV files...")
         
         print("1. Loading categories...")
-        category_ids = self.load_categories()
+        with instrumentation.phase("load categories"):
+            category_ids = self.load_categories()
         print(f"   Loaded {len(category_ids)} categories")
         
         print("2. Loading products...")
-        product_ids = self.load_products()
+        with instrumentation.phase("load products"):
+            product_ids = self.load_products()
         print(f"   Loaded {len(product_ids)} products")
         
         print("3. Loading customers...")
-        customer_ids = self.load_customers()
+        with instrumentation.phase("load customers"):
+            customer_ids = self.load_customers()
         print(f"   Loaded {len(customer_ids)} customers")
         
         print("4. Loading orders and order items...")
-        self.load_orders_and_items()
+        with instrumentation.phase("load orders and items"):
+            self.load_orders_and_items(sorted_input)
         print("   Orders and items loaded")
         
         print("Data loading completed successfully!")
 
+    def bulk_load_table(self, table: str, file_name: str, columns: Sequence[str],
+                        convert: Callable[[Dict[str, str]], tuple]) -> int:
+        csv_path = os.path.join(self.data_dir, file_name)
+        start = time.perf_counter()
+        
+        with open(csv_path, 'r', encoding='utf-8') as file:
+            reader = csv.DictReader(file)
+            count = self.db.bulk_insert(table, columns, map(convert, reader),
+                                        self.batch_size)
+        
+        elapsed = time.perf_counter() - start
+        rate = count / elapsed if elapsed > 0 else 0.0
+        print(f"   Loaded {count} {table} in {elapsed:.2f}s ({rate:,.0f} rows/sec)")
+        return count
+    
+    def bulk_load_all_data(self, fresh: bool = False) -> Dict[str, int]:
+        """Stream every CSV file into the database on the pooled connection.
+
+        Rows are inserted with ``executemany`` and committed every
+        ``batch_size`` rows. Every table keeps its CSV ids, so products,
+        orders and items reference the rows their files name without an
+        in-memory id lookup.
+        With ``fresh`` an empty database is filled via ``DatabaseManager.fresh_load``.
+        """
+        print(f"Bulk loading data from CSV files (batch size {self.batch_size})...")
+        
+        counts = {}
+        start = time.perf_counter()
+        finish = None
+        with self.db.fresh_load() if fresh else nullcontext():
+            for step, (table, file_name, columns, convert) in enumerate(BULK_TABLES, 1):
+                print(f"{step}. Loading {table}...")
+                with instrumentation.phase(f"bulk load {table}"):
+                    counts[table] = self.bulk_load_table(table, file_name, columns, convert)
+            if fresh:
+                print("Building indexes, triggers and aggregates...")
+                # fresh_load rebuilds them on leaving the block
+                finish = time.perf_counter()
+        if finish is not None:
+            print(f"   Done in {time.perf_counter() - finish:.2f}s")
+        
+        elapsed = time.perf_counter() - start
+        total = sum(counts.values())
+        rate = total / elapsed if elapsed > 0 else 0.0
+        print(f"Bulk load completed: {total} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec)")
+        return counts
+
+    def upsert_table(self, table: str, file_name: str, columns: Sequence[str],
+                     convert: Callable[[Dict[str, str]], tuple]) -> int:
+        """Upsert a dimension file by id unless it is unchanged since the last load."""
+        csv_path = os.path.abspath(os.path.join(self.data_dir, file_name))
+        stat = os.stat(csv_path)
+        checkpoint = self.db.get_checkpoint(csv_path)
+        if (checkpoint is not None and checkpoint['file_size'] == stat.st_size
+                and checkpoint['mtime_ns'] == stat.st_mtime_ns):
+            print(f"   {file_name} unchanged since last load, skipped")
+            return 0
+        
+        start = time.perf_counter()
+        with open(csv_path, 'r', encoding='utf-8', newline='') as file:
+            reader = csv.DictReader(file)
+            count = self.db.bulk_insert(table, columns, map(convert, reader), self.batch_size,
+                                        on_conflict=upsert_clause(columns, TOUCH_COLUMNS.get(table, ())))
+            header = ",".join(reader.fieldnames or [])
+        # Stat taken before reading, so a file rewritten meanwhile is loaded again next time
+        self.db.save_checkpoint(csv_path, header, stat.st_size, stat.st_size, stat.st_mtime_ns,
+                                None, count)
+        
+        elapsed = time.perf_counter() - start
+        rate = count / elapsed if elapsed > 0 else 0.0
+        print(f"   Merged {count} {table} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec)")
+        return count
+    
+    def append_table(self, table: str, file_name: str, columns: Sequence[str],
+                     convert: Callable[[Dict[str, str]], tuple], producer_closed: bool = False) -> int:
+        """Insert the rows appended to a fact file since its checkpoint; returns rows inserted.
+
+        The checkpoint advances in the same transaction as each batch. A file
+        that shrank or whose header changed is read again from the start;
+        rows already present are skipped by ``ON CONFLICT DO NOTHING``. A last
+        row without a trailing newline waits unless ``producer_closed``.
+        """
+        csv_path = os.path.abspath(os.path.join(self.data_dir, file_name))
+        stat = os.stat(csv_path)
+        with open(csv_path, 'rb') as file:
+            first_line = file.readline()
+        if not first_line.endswith(b"\n"):
+            print(f"   {file_name} has no complete rows yet, skipped")
+            return 0
+        header = first_line.decode("utf-8").rstrip("\r\n")
+        
+        checkpoint = self.db.get_checkpoint(csv_path)
+        if (checkpoint is None or checkpoint['header'] != header
+                or checkpoint['byte_offset'] > stat.st_size):
+            offset, high_water_id, loaded = len(first_line), None, 0
+        else:
+            offset = checkpoint['byte_offset']
+            high_water_id, loaded = checkpoint['high_water_id'], checkpoint['rows_loaded']
+        
+        rows = AppendedRows(csv_path, next(csv.reader([header])), offset, high_water_id, producer_closed)
+        save = lambda commit: self.db.save_checkpoint(
+            csv_path, header, rows.offset, stat.st_size, stat.st_mtime_ns,
+            rows.high_water_id, loaded + rows.rows, commit=commit)
+        
+        start = time.perf_counter()
+        count = self.db.bulk_insert(table, columns, map(convert, rows), self.batch_size,
+                                    on_conflict="ON CONFLICT(id) DO NOTHING",
+                                    before_commit=lambda: save(False))
+        save(True)
+        
+        elapsed = time.perf_counter() - start
+        rate = count / elapsed if elapsed > 0 else 0.0
+        print(f"   Inserted {count} new {table} rows ({rows.rows} read from byte {offset}) "
+              f"in {elapsed:.2f}s ({rate:,.0f} rows/sec, high-water id {rows.high_water_id})")
+        return count
+    
+    def incremental_load_all_data(self, producer_closed: bool = False) -> Dict[str, int]:
+        """Load only what changed since the previous incremental load; safe to re-run.
+
+        Source ids are kept for every table, so rows line up with the CSV files
+        no matter what the database loaded before. Pass ``producer_closed``
+        when the fact files are finished, so a last row without a trailing
+        newline is loaded too.
+        """
+        print("Incrementally loading data from CSV files...")
+        
+        counts = {}
+        start = time.perf_counter()
+        for step, (table, file_name, columns, convert, append_only) in enumerate(INCREMENTAL_TABLES, 1):
+            print(f"{step}. Loading {table}...")
+            with instrumentation.phase(f"incremental load {table}"):
+                if append_only:
+                    counts[table] = self.append_table(table, file_name, columns, convert, producer_closed)
+                else:
+                    counts[table] = self.upsert_table(table, file_name, columns, convert)
+        
+        elapsed = time.perf_counter() - start
+        print(f"Incremental load completed: {sum(counts.values())} rows read in {elapsed:.2f}s")
+        return counts
+
 if __name__ == "__main__":
     loader = CSVLoader("ecommerce_csv.db")
     loader.load_all_data()
\ No newline at end of file
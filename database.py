@@ -1,26 +1,211 @@
+import os
 import sqlite3
-from typing import List, Optional
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 from decimal import Decimal
-from datetime import datetime
-from models import Product, Category, Customer, Order, OrderItem, SalesData
+from datetime import date, datetime
+from columnar import INT, TEXT, cents_sql, read_columns
+from connection_pool import ConnectionPool, get_pool
+from models import Product, Category, Customer, Order, OrderItem, SalesData, ProductRow, SalesRow
+
+# Schema and migration scripts live next to this module, so the working
+# directory does not matter.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SCHEMA_PATH = os.path.join(BASE_DIR, "schema.sql")
+
+# Bump when schema.sql changes and add the upgrade script to MIGRATIONS,
+# keyed by the version it upgrades to.
+SCHEMA_VERSION = 8
+MIGRATIONS: Dict[int, str] = {
+    2: "migrations/002_product_sales.sql",
+    3: "migrations/003_sales_rollups.sql",
+    4: "migrations/004_load_checkpoints.sql",
+    5: "migrations/005_sketch_state.sql",
+    6: "migrations/006_product_sales_trigger_plan.sql",
+    7: "migrations/007_update_triggers.sql",
+    8: "migrations/008_change_counters.sql",
+}
+
+REBUILD_SALES_SUMMARY_SQL = """
+DELETE FROM product_sales;
+INSERT INTO product_sales (product_id, total_quantity_sold, total_revenue,
+                           unit_price_sum, line_count, number_of_orders)
+SELECT product_id, SUM(quantity), SUM(total_price), SUM(unit_price),
+       COUNT(*), COUNT(DISTINCT order_id)
+FROM order_items
+GROUP BY product_id;
+"""
+
+# Rollup table per report granularity, maintained by triggers in schema.sql
+ROLLUP_TABLES = {
+    "day": "sales_daily",
+    "week": "sales_weekly",
+    "month": "sales_monthly",
+}
+
+REBUILD_ROLLUPS_SQL = """
+DELETE FROM sales_daily;
+INSERT INTO sales_daily (period_start, total_orders, total_revenue)
+SELECT date(order_date), COUNT(*), SUM(total_amount)
+FROM orders
+WHERE order_date IS NOT NULL
+GROUP BY 1;
+INSERT INTO sales_daily (period_start, total_items_sold)
+SELECT date(o.order_date), SUM(oi.quantity)
+FROM order_items oi
+JOIN orders o ON oi.order_id = o.id
+WHERE o.order_date IS NOT NULL
+GROUP BY 1
+ON CONFLICT(period_start) DO UPDATE SET total_items_sold = excluded.total_items_sold;
+DELETE FROM sales_weekly;
+INSERT INTO sales_weekly (period_start, total_orders, total_revenue)
+SELECT date(order_date, 'weekday 0', '-6 days'), COUNT(*), SUM(total_amount)
+FROM orders
+WHERE order_date IS NOT NULL
+GROUP BY 1;
+INSERT INTO sales_weekly (period_start, total_items_sold)
+SELECT date(o.order_date, 'weekday 0', '-6 days'), SUM(oi.quantity)
+FROM order_items oi
+JOIN orders o ON oi.order_id = o.id
+WHERE o.order_date IS NOT NULL
+GROUP BY 1
+ON CONFLICT(period_start) DO UPDATE SET total_items_sold = excluded.total_items_sold;
+DELETE FROM sales_monthly;
+INSERT INTO sales_monthly (period_start, total_orders, total_revenue)
+SELECT date(order_date, 'start of month'), COUNT(*), SUM(total_amount)
+FROM orders
+WHERE order_date IS NOT NULL
+GROUP BY 1;
+INSERT INTO sales_monthly (period_start, total_items_sold)
+SELECT date(o.order_date, 'start of month'), SUM(oi.quantity)
+FROM order_items oi
+JOIN orders o ON oi.order_id = o.id
+WHERE o.order_date IS NOT NULL
+GROUP BY 1
+ON CONFLICT(period_start) DO UPDATE SET total_items_sold = excluded.total_items_sold;
+"""
+
+DateLike = Union[date, datetime, str]
+
+def _date_param(value: DateLike) -> str:
+    # order_date is stored as 'YYYY-MM-DD HH:MM:SS', which sorts as text
+    if isinstance(value, datetime):
+        return value.isoformat(" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+def _sales_filters(start_date: Optional[DateLike] = None, end_date: Optional[DateLike] = None,
+                   category: Optional[str] = None, status: Optional[str] = None) -> Tuple[str, list]:
+    """Build a WHERE clause over orders o / categories c; end_date is exclusive."""
+    conditions = []
+    params = []
+    if start_date is not None:
+        conditions.append("o.order_date >= ?")
+        params.append(_date_param(start_date))
+    if end_date is not None:
+        conditions.append("o.order_date < ?")
+        params.append(_date_param(end_date))
+    if status is not None:
+        conditions.append("o.status = ?")
+        params.append(status)
+    if category is not None:
+        conditions.append("c.name = ?")
+        params.append(category)
+    clause = "WHERE " + " AND ".join(conditions) if conditions else ""
+    return clause, params
+
+def _statements(script: str) -> Iterator[str]:
+    """Split an SQL script into statements, keeping trigger bodies whole."""
+    statement = ""
+    for piece in script.split(";"):
+        statement += piece + ";"
+        if sqlite3.complete_statement(statement):
+            if statement.strip(" \t\n;"):
+                yield statement
+            statement = ""
+    if statement.strip(" \t\n;"):
+        raise ValueError(f"Incomplete SQL statement at the end of the script: {statement[:60]!r}")
 
 class DatabaseManager:
-    def __init__(self, db_path: str = "ecommerce.db"):
+    def __init__(self, db_path: str = "ecommerce.db", pragmas: Optional[Dict[str, Any]] = None,
+                 pool: Optional[ConnectionPool] = None):
         self.db_path = db_path
+        # Pass a pool to keep this manager's connections apart from the shared one
+        self.pool = pool if pool is not None else get_pool(db_path, pragmas)
         self.init_database()
     
     def init_database(self):
-        with open('schema.sql', 'r') as f:
-            schema = f.read()
+        if self.pool.schema_ready:
+            return
         
-        conn = sqlite3.connect(self.db_path)
-        conn.executescript(schema)
-        conn.close()
+        with self.pool.lock:
+            if self.pool.schema_ready:
+                return
+            
+            conn = self.get_connection()
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < SCHEMA_VERSION:
+                if version == 0:
+                    exists = conn.execute(
+                        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'orders'"
+                    ).fetchone()
+                    if exists:
+                        # Created before schema versioning was introduced
+                        version = 1
+                    else:
+                        self._migrate(SCHEMA_PATH, SCHEMA_VERSION)
+                        version = SCHEMA_VERSION
+                
+                for target in range(version + 1, SCHEMA_VERSION + 1):
+                    self._migrate(os.path.join(BASE_DIR, MIGRATIONS[target]), target)
+            
+            self.pool.schema_ready = True
+    
+    def _migrate(self, script_path: str, target: int):
+        """Run a schema script and record ``target`` as user_version, all or nothing.
+
+        executescript commits before it starts, so the statements are run one
+        by one in an explicit transaction instead; a failed migration leaves
+        the database at the previous version.
+        """
+        with open(script_path, 'r') as f:
+            script = f.read()
+        conn = self.get_connection()
+        try:
+            conn.execute("BEGIN")
+            for statement in _statements(script):
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {target}")
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise e
+    
+    def get_connection(self) -> sqlite3.Connection:
+        """Return this thread's pooled connection. Callers must not close it."""
+        return self.pool.get()
     
-    def get_connection(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+    def close(self):
+        self.pool.close_all()
+    
+    @property
+    def data_version(self) -> tuple:
+        """Changes whenever this process or another connection commits a write.
+
+        Equal on every thread, so it can tag results shared between threads.
+        """
+        return (self.pool.write_version, self.pool.data_version())
+    
+    def change_counters(self) -> Dict[str, int]:
+        """Counters the catalog triggers bump: 'categories', 'products_inserted', 'products_changed'."""
+        rows = self.get_connection().execute("SELECT name, value FROM change_counters").fetchall()
+        return {name: value for name, value in rows}
+    
+    def bump_data_version(self):
+        with self.pool.lock:
+            self.pool.write_version += 1
     
     def add_category(self, category: Category) -> int:
         conn = self.get_connection()
@@ -31,7 +216,7 @@ class DatabaseManager:
         )
         category_id = cursor.lastrowid
         conn.commit()
-        conn.close()
+        self.bump_data_version()
         return category_id
     
     def add_product(self, product: Product) -> int:
@@ -46,7 +231,7 @@ class DatabaseManager:
         )
         product_id = cursor.lastrowid
         conn.commit()
-        conn.close()
+        self.bump_data_version()
         return product_id
     
     def add_customer(self, customer: Customer) -> int:
@@ -58,7 +243,7 @@ class DatabaseManager:
         )
         customer_id = cursor.lastrowid
         conn.commit()
-        conn.close()
+        self.bump_data_version()
         return customer_id
     
     def create_order(self, order: Order, items: List[OrderItem]) -> int:
@@ -83,22 +268,254 @@ class DatabaseManager:
                 )
             
             conn.commit()
+            self.bump_data_version()
             return order_id
         except Exception as e:
             conn.rollback()
             raise e
+    
+    def create_orders(self, orders: Sequence[Tuple[Order, List[OrderItem]]]) -> List[int]:
+        """Insert many orders and their items in one transaction; returns the order ids.
+        
+        Ids are assigned up front under BEGIN IMMEDIATE, which holds the write
+        lock, so the item rows can reference them and both tables go in with
+        one ``executemany`` each.
+        """
+        if not orders:
+            return []
+        conn = self.get_connection()
+        
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            # AUTOINCREMENT never reuses ids, including those of deleted rows
+            next_id = conn.execute("""
+                SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'orders'), 0),
+                           COALESCE((SELECT MAX(id) FROM orders), 0)) + 1
+            """).fetchone()[0]
+            order_ids = list(range(next_id, next_id + len(orders)))
+        
+            conn.executemany(
+                """INSERT INTO orders (id, customer_id, order_date, status, total_amount, shipping_cost, tax_amount)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                [(order_id, order.customer_id, order.order_date or datetime.now(), order.status,
+                  float(order.total_amount), float(order.shipping_cost), float(order.tax_amount))
+                 for order_id, (order, _) in zip(order_ids, orders)]
+            )
+            conn.executemany(
+                """INSERT INTO order_items (order_id, product_id, quantity, unit_price, total_price)
+                   VALUES (?, ?, ?, ?, ?)""",
+                [(order_id, item.product_id, item.quantity, float(item.unit_price), float(item.total_price))
+                 for order_id, (_, items) in zip(order_ids, orders) for item in items]
+            )
+        
+            conn.commit()
+            self.bump_data_version()
+            return order_ids
+        except Exception as e:
+            conn.rollback()
+            raise e
+    
+    def bulk_insert(self, table: str, columns: Sequence[str], rows: Iterable[tuple],
+                    batch_size: int = 10000, placeholders: Optional[Sequence[str]] = None,
+                    on_conflict: str = "",
+                    before_commit: Optional[Callable[[], None]] = None) -> int:
+        """Insert ``rows`` with batched ``executemany``, committing every ``batch_size`` rows.
+
+        ``rows`` is consumed lazily, so a generator over a large file is never
+        materialized. ``placeholders`` optionally replaces the plain ``?`` per
+        column with an SQL expression over it, e.g. ``"? / 100.0"``, and
+        ``on_conflict`` is appended as an upsert clause. ``before_commit`` runs
+        in each batch's transaction, e.g. to record how far the input got.
+        Returns the number of rows written; rows that ``on_conflict`` skips or
+        leaves unchanged are not counted.
+        """
+        conn = self.get_connection()
+        
+        query = "INSERT INTO {} ({}) VALUES ({}) {}".format(
+            table, ", ".join(columns), ", ".join(placeholders or ["?"] * len(columns)),
+            on_conflict
+        )
+        rows = iter(rows)
+        count = 0
+        
+        try:
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                cursor = conn.executemany(query, batch)
+                if before_commit is not None:
+                    before_commit()
+                conn.commit()
+                count += cursor.rowcount
+            return count
+        except Exception as e:
+            conn.rollback()
+            raise e
         finally:
-            conn.close()
+            self.bump_data_version()
     
-    def get_sales_summary(self) -> List[SalesData]:
+    def get_checkpoint(self, file_path: str) -> Optional[sqlite3.Row]:
         conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM sales_summary")
-        rows = cursor.fetchall()
-        conn.close()
+        return conn.execute(
+            "SELECT * FROM load_checkpoints WHERE file_path = ?", (file_path,)
+        ).fetchone()
+    
+    def save_checkpoint(self, file_path: str, header: str, byte_offset: int,
+                        file_size: Optional[int], mtime_ns: Optional[int],
+                        high_water_id: Optional[int], rows_loaded: int, commit: bool = True):
+        """Record incremental load progress; pass ``commit=False`` inside a load batch."""
+        conn = self.get_connection()
+        conn.execute("""
+            INSERT INTO load_checkpoints (file_path, header, byte_offset, file_size, mtime_ns,
+                                          high_water_id, rows_loaded, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(file_path) DO UPDATE SET
+                header = excluded.header,
+                byte_offset = excluded.byte_offset,
+                file_size = excluded.file_size,
+                mtime_ns = excluded.mtime_ns,
+                high_water_id = excluded.high_water_id,
+                rows_loaded = excluded.rows_loaded,
+                updated_at = excluded.updated_at
+        """, (file_path, header, byte_offset, file_size, mtime_ns, high_water_id, rows_loaded))
+        if commit:
+            conn.commit()
+    
+    def _execute_script(self, script: str):
+        """Run ``;``-separated statements (no triggers) in a single transaction."""
+        conn = self.get_connection()
+        try:
+            conn.execute("BEGIN")
+            for statement in script.split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise e
+        self.bump_data_version()
+    
+    def rebuild_sales_summary(self) -> int:
+        """Recompute product_sales from order_items, e.g. after manual edits."""
+        self._execute_script(REBUILD_SALES_SUMMARY_SQL)
+        return self.get_connection().execute("SELECT COUNT(*) FROM product_sales").fetchone()[0]
+    
+    def rebuild_rollups(self) -> int:
+        """Recompute the daily, weekly and monthly rollups from orders and order_items."""
+        self._execute_script(REBUILD_ROLLUPS_SQL)
+        return self.get_connection().execute("SELECT COUNT(*) FROM sales_daily").fetchone()[0]
+    
+    @contextmanager
+    def fresh_load(self) -> Iterator[None]:
+        """Bulk-load with index, trigger and foreign key maintenance deferred.
+
+        Meant for filling an empty database on this thread's connection;
+        raises ValueError if orders or order_items already have rows.
+        Secondary indexes and the aggregate triggers are dropped and journaling
+        and syncing lowered for the duration of the block. Afterwards the
+        indexes and triggers are recreated in one pass, the aggregates rebuilt,
+        foreign keys checked and statistics gathered with ANALYZE. A failed
+        load is cleaned up the same way, so its committed rows stay consistent.
+        """
+        conn = self.get_connection()
+        conn.commit()
+        for table in ("orders", "order_items"):
+            if conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone():
+                # Rebuilding indexes and aggregates afterwards would cost a full pass over them
+                raise ValueError(f"fresh_load needs an empty database, but {table} already has rows")
+        saved = conn.execute(
+            "SELECT type, name, sql FROM sqlite_master "
+            "WHERE type IN ('index', 'trigger') AND sql IS NOT NULL"
+        ).fetchall()
+        foreign_keys = conn.execute("PRAGMA foreign_keys").fetchone()[0]
+        
+        conn.execute("PRAGMA foreign_keys = OFF")
+        conn.execute("PRAGMA journal_mode = MEMORY")
+        conn.execute("PRAGMA synchronous = OFF")
+        for kind, name, _ in saved:
+            conn.execute(f"DROP {kind.upper()} {name}")
+        conn.commit()
+        
+        try:
+            yield
+        finally:
+            conn.commit()
+            try:
+                conn.execute("BEGIN")
+                for _, _, sql in saved:
+                    conn.execute(sql)
+                # The counter triggers were dropped too, so mark the whole catalog changed
+                conn.execute("UPDATE change_counters SET value = value + 1")
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                raise e
+            self.rebuild_sales_summary()
+            self.rebuild_rollups()
+            violations = conn.execute("PRAGMA foreign_key_check").fetchall()
+            conn.execute("ANALYZE")
+            conn.commit()
+            
+            conn.execute(f"PRAGMA journal_mode = {self.pool.pragmas.get('journal_mode', 'DELETE')}")
+            conn.execute(f"PRAGMA synchronous = {self.pool.pragmas.get('synchronous', 'FULL')}")
+            conn.execute(f"PRAGMA foreign_keys = {foreign_keys}")
+        
+        if violations:
+            tables = sorted({row[0] for row in violations})
+            raise sqlite3.IntegrityError(
+                f"{len(violations)} rows violate foreign keys after the load "
+                f"(tables: {', '.join(tables)})")
+    
+    def get_rollups(self, granularity: str = "day", start_date: Optional[DateLike] = None,
+                    end_date: Optional[DateLike] = None, descending: bool = False) -> List[sqlite3.Row]:
+        """Rollup rows whose period starts in [start_date, end_date).
+
+        Weeks start on Monday and months on the 1st; the range is a plain
+        predicate on the rollup table's primary key.
+        """
+        if granularity not in ROLLUP_TABLES:
+            raise ValueError(f"Unknown granularity {granularity!r}; expected one of {list(ROLLUP_TABLES)}")
         
-        return [
-            SalesData(
+        conditions = []
+        params = []
+        if start_date is not None:
+            conditions.append("period_start >= ?")
+            params.append(_date_param(start_date))
+        if end_date is not None:
+            conditions.append("period_start < ?")
+            params.append(_date_param(end_date))
+        clause = "WHERE " + " AND ".join(conditions) if conditions else ""
+        order = "DESC" if descending else "ASC"
+        
+        query = f"""
+        SELECT period_start, total_orders, total_revenue, total_items_sold
+        FROM {ROLLUP_TABLES[granularity]}
+        {clause}
+        ORDER BY period_start {order}
+        """
+        return self.get_connection().execute(query, params).fetchall()
+    
+    def get_sales_summary(self) -> List[SalesData]:
+        return list(self.iter_sales_summary())
+    
+    def iter_sales_summary(self, batch_size: int = 1000,
+                           compact: bool = False) -> Iterator[Union[SalesData, SalesRow]]:
+        """Yield sales_summary rows lazily, fetching ``batch_size`` at a time.
+
+        With ``compact`` the rows are SalesRow tuples with money in cents.
+        """
+        if compact:
+            query = f"""
+            SELECT product_name, sku, category, total_quantity_sold,
+                   {cents_sql('total_revenue')}, {cents_sql('avg_selling_price')}, number_of_orders
+            FROM sales_summary
+            """
+            yield from self._iter_rows(query, batch_size=batch_size, row_type=SalesRow)
+            return
+        
+        for row in self._iter_rows("SELECT * FROM sales_summary", batch_size=batch_size):
+            yield SalesData(
                 product_name=row['product_name'],
                 sku=row['sku'],
                 category=row['category'],
@@ -107,18 +524,142 @@ class DatabaseManager:
                 avg_selling_price=Decimal(str(row['avg_selling_price'])),
                 number_of_orders=row['number_of_orders']
             )
-            for row in rows
-        ]
     
-    def get_products(self) -> List[Product]:
+    def _iter_rows(self, query: str, params: Sequence[Any] = (),
+                   batch_size: int = 1000, row_type: Optional[type] = None) -> Iterator[Any]:
+        cursor = self.get_connection().cursor()
+        if row_type is not None:
+            cursor.row_factory = lambda _, row: row_type._make(row)
+        try:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+    
+    def get_top_products(self, limit: int = 10, start_date: Optional[DateLike] = None,
+                         end_date: Optional[DateLike] = None, category: Optional[str] = None,
+                         status: Optional[str] = None) -> List[sqlite3.Row]:
+        """Best sellers by quantity, computed and limited in SQL.
+
+        Without date or status filters this reads the materialized
+        sales_summary; otherwise it aggregates the matching order lines.
+        """
         conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM products WHERE is_active = 1")
-        rows = cursor.fetchall()
-        conn.close()
+        if start_date is None and end_date is None and status is None:
+            query = "SELECT * FROM sales_summary"
+            params = []
+            if category is not None:
+                query += " WHERE category = ?"
+                params.append(category)
+        else:
+            clause, params = _sales_filters(start_date, end_date, category, status)
+            query = f"""
+            SELECT
+                p.name as product_name,
+                p.sku,
+                c.name as category,
+                SUM(oi.quantity) as total_quantity_sold,
+                SUM(oi.total_price) as total_revenue,
+                AVG(oi.unit_price) as avg_selling_price,
+                COUNT(DISTINCT oi.order_id) as number_of_orders
+            FROM order_items oi
+            JOIN orders o ON oi.order_id = o.id
+            JOIN products p ON oi.product_id = p.id
+            JOIN categories c ON p.category_id = c.id
+            {clause}
+            GROUP BY p.id
+            """
+        query += " ORDER BY total_quantity_sold DESC, sku LIMIT ?"
+        return conn.execute(query, params + [limit]).fetchall()
+    
+    def get_product_partials(self, start_date: Optional[DateLike] = None,
+                             end_date: Optional[DateLike] = None, category: Optional[str] = None,
+                             status: Optional[str] = None) -> List[tuple]:
+        """Per-product sums and counts that can be added up across databases.
+
+        Rows are (sku, product_name, category, quantity, revenue,
+        unit_price_sum, line_count, number_of_orders); averages are left to
+        the caller so they can be rebuilt after merging.
+        """
+        if start_date is None and end_date is None and status is None:
+            query = """
+            SELECT p.sku, p.name, c.name, ps.total_quantity_sold, ps.total_revenue,
+                   ps.unit_price_sum, ps.line_count, ps.number_of_orders
+            FROM product_sales ps
+            JOIN products p ON ps.product_id = p.id
+            JOIN categories c ON p.category_id = c.id
+            """
+            params = []
+            if category is not None:
+                query += " WHERE c.name = ?"
+                params.append(category)
+        else:
+            clause, params = _sales_filters(start_date, end_date, category, status)
+            query = f"""
+            SELECT p.sku, p.name, c.name, SUM(oi.quantity), SUM(oi.total_price),
+                   SUM(oi.unit_price), COUNT(*), COUNT(DISTINCT oi.order_id)
+            FROM order_items oi
+            JOIN orders o ON oi.order_id = o.id
+            JOIN products p ON oi.product_id = p.id
+            JOIN categories c ON p.category_id = c.id
+            {clause}
+            GROUP BY p.id
+            """
+        cursor = self.get_connection().cursor()
+        cursor.row_factory = None
+        return cursor.execute(query, params).fetchall()
+    
+    def get_category_revenue(self, start_date: Optional[DateLike] = None,
+                             end_date: Optional[DateLike] = None,
+                             status: Optional[str] = None) -> List[sqlite3.Row]:
+        conn = self.get_connection()
+        if start_date is None and end_date is None and status is None:
+            query = """
+            SELECT category, SUM(total_revenue) as revenue
+            FROM sales_summary
+            GROUP BY category
+            ORDER BY revenue DESC
+            """
+            params = []
+        else:
+            clause, params = _sales_filters(start_date, end_date, None, status)
+            query = f"""
+            SELECT c.name as category, SUM(oi.total_price) as revenue
+            FROM order_items oi
+            JOIN orders o ON oi.order_id = o.id
+            JOIN products p ON oi.product_id = p.id
+            JOIN categories c ON p.category_id = c.id
+            {clause}
+            GROUP BY c.name
+            ORDER BY revenue DESC
+            """
+        return conn.execute(query, params).fetchall()
+    
+    def get_products(self) -> List[Product]:
+        return list(self.iter_products())
+    
+    def iter_products(self, batch_size: int = 1000,
+                      compact: bool = False) -> Iterator[Union[Product, ProductRow]]:
+        """Yield active products lazily, fetching ``batch_size`` at a time.
+
+        With ``compact`` the rows are ProductRow tuples with money in cents.
+        """
+        if compact:
+            query = f"""
+            SELECT id, name, sku, category_id, {cents_sql('price')}, {cents_sql('cost')},
+                   description, stock_quantity, is_active = 1, created_at, updated_at
+            FROM products WHERE is_active = 1
+            """
+            yield from self._iter_rows(query, batch_size=batch_size, row_type=ProductRow)
+            return
         
-        return [
-            Product(
+        query = "SELECT * FROM products WHERE is_active = 1"
+        for row in self._iter_rows(query, batch_size=batch_size):
+            yield Product(
                 id=row['id'],
                 name=row['name'],
                 sku=row['sku'],
@@ -131,5 +672,32 @@ class DatabaseManager:
                 created_at=datetime.fromisoformat(row['created_at']),
                 updated_at=datetime.fromisoformat(row['updated_at'])
             )
-            for row in rows
-        ]
\ No newline at end of file
+    
+    def get_sales_summary_columns(self) -> Dict[str, Any]:
+        """sales_summary as column arrays with money in integer cents."""
+        query = f"""
+        SELECT product_name, sku, category, total_quantity_sold,
+               {cents_sql('total_revenue')}, {cents_sql('avg_selling_price')}, number_of_orders
+        FROM sales_summary
+        """
+        schema = [
+            ("product_name", TEXT), ("sku", TEXT), ("category", TEXT),
+            ("total_quantity_sold", INT), ("total_revenue_cents", INT),
+            ("avg_selling_price_cents", INT), ("number_of_orders", INT),
+        ]
+        return read_columns(self.get_connection(), query, schema)
+    
+    def get_products_columns(self) -> Dict[str, Any]:
+        """Active products as column arrays; timestamps are Unix seconds."""
+        query = f"""
+        SELECT id, name, sku, category_id, {cents_sql('price')}, {cents_sql('cost')},
+               stock_quantity, CAST(strftime('%s', created_at) AS INTEGER),
+               CAST(strftime('%s', updated_at) AS INTEGER)
+        FROM products WHERE is_active = 1
+        """
+        schema = [
+            ("id", INT), ("name", TEXT), ("sku", TEXT), ("category_id", INT),
+            ("price_cents", INT), ("cost_cents", INT), ("stock_quantity", INT),
+            ("created_at", INT), ("updated_at", INT),
+        ]
+        return read_columns(self.get_connection(), query, schema)
\ No newline at end of file
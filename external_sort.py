@@ -0,0 +1,69 @@
+import csv
+import heapq
+import os
+import tempfile
+from itertools import groupby, islice
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+Row = List[str]
+
+def external_sort(rows: Iterable[Row], key: Callable[[Row], Any], max_rows: int = 100000,
+                  tmp_dir: Optional[str] = None) -> Iterator[Row]:
+    """Sort CSV rows holding at most ``max_rows`` of them in memory.
+
+    Input is cut into sorted runs of ``max_rows`` rows. If everything fits in
+    one run it is returned directly; otherwise each run is spilled to a
+    temporary CSV file and the runs are merged lazily with ``heapq.merge``.
+    """
+    rows = iter(rows)
+    run = sorted(islice(rows, max_rows), key=key)
+    if len(run) < max_rows:
+        yield from run
+        return
+
+    paths = []
+    files = []
+    try:
+        while run:
+            fd, path = tempfile.mkstemp(prefix="sort-run-", suffix=".csv", dir=tmp_dir)
+            paths.append(path)
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='') as file:
+                csv.writer(file).writerows(run)
+            run = sorted(islice(rows, max_rows), key=key)
+
+        for path in paths:
+            files.append(open(path, 'r', encoding='utf-8', newline=''))
+        yield from heapq.merge(*(csv.reader(file) for file in files), key=key)
+    finally:
+        for file in files:
+            file.close()
+        for path in paths:
+            os.remove(path)
+
+def check_sorted(rows: Iterable[Row], key: Callable[[Row], Any], source: str = "input") -> Iterator[Row]:
+    """Pass rows through unchanged, raising ValueError if ``key`` ever decreases."""
+    previous = None
+    for row in rows:
+        current = key(row)
+        if previous is not None and current < previous:
+            raise ValueError(f"{source} is not sorted: {current!r} follows {previous!r}")
+        previous = current
+        yield row
+
+def merge_join(left: Iterable[Row], right: Iterable[Row], left_key: Callable[[Row], Any],
+               right_key: Callable[[Row], Any]) -> Iterator[Tuple[Row, List[Row]]]:
+    """Pair each left row with its matching right rows; both inputs sorted by key.
+
+    Left keys are assumed unique. Right rows without a left match are dropped.
+    """
+    groups = groupby(right, key=right_key)
+    group = next(groups, None)
+    for row in left:
+        current = left_key(row)
+        while group is not None and group[0] < current:
+            group = next(groups, None)
+        if group is not None and group[0] == current:
+            yield row, list(group[1])
+            group = next(groups, None)
+        else:
+            yield row, []
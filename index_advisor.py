@@ -0,0 +1,260 @@
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from database import MIGRATIONS, DatabaseManager
+from instrumentation import instrumentation
+from sales_analyzer import SalesAnalyzer
+
+# (index name, CREATE INDEX statement) tried one at a time against the workload
+CANDIDATE_INDEXES = [
+    ("idx_order_items_product_covering",
+     "CREATE INDEX idx_order_items_product_covering "
+     "ON order_items(product_id, quantity, total_price, order_id)"),
+    ("idx_order_items_order_covering",
+     "CREATE INDEX idx_order_items_order_covering "
+     "ON order_items(order_id, product_id, quantity, unit_price, total_price)"),
+    ("idx_orders_date_covering",
+     "CREATE INDEX idx_orders_date_covering ON orders(order_date, id, total_amount)"),
+    ("idx_orders_status_date",
+     "CREATE INDEX idx_orders_status_date ON orders(status, order_date)"),
+    ("idx_orders_order_day",
+     "CREATE INDEX idx_orders_order_day ON orders(date(order_date))"),
+]
+
+# (label, call) pairs covering every SQL shape the analyzer issues. Calls get
+# the analyzer, a 30 day window ending at the newest order, and a category.
+WORKLOAD: List[Tuple[str, Callable[[SalesAnalyzer, date, date, Optional[str]], Any]]] = [
+    ("top products", lambda a, start, end, category: a.get_top_selling_products(10)),
+    ("top products in category",
+     lambda a, start, end, category: a.get_top_selling_products(10, category=category)),
+    ("top products, 30 days",
+     lambda a, start, end, category: a.get_top_selling_products(10, start, end)),
+    ("top completed products in category, 30 days",
+     lambda a, start, end, category: a.get_top_selling_products(10, start, end, category, "completed")),
+    ("revenue by category", lambda a, start, end, category: a.get_revenue_by_category()),
+    ("revenue by category, completed, 30 days",
+     lambda a, start, end, category: a.get_revenue_by_category(start, end, "completed")),
+    ("daily sales report", lambda a, start, end, category: a.get_daily_sales_report(7)),
+    ("weekly trend", lambda a, start, end, category: a.get_sales_trend(granularity="week")),
+    ("product partials, 30 days",
+     lambda a, start, end, category: a.db.get_product_partials(start, end)),
+    ("full sales summary", lambda a, start, end, category: list(a.iter_sales_summary())),
+]
+
+def plan_issues(plan: List[str]) -> List[str]:
+    """Plan steps worth an index: full table scans and temporary B-trees."""
+    return [step for step in plan
+            if (step.startswith("SCAN ") and step != "SCAN CONSTANT ROW") or "TEMP B-TREE" in step]
+
+@dataclass(slots=True)
+class AdvisorQuery:
+    label: str
+    sql: str
+    params: tuple
+    plan: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+@dataclass(slots=True)
+class IndexTrial:
+    name: str
+    sql: str
+    build_seconds: float = 0.0
+    before: float = 0.0
+    after: float = 0.0
+    # (label, seconds before, seconds after) for queries whose plan uses the index
+    used_by: List[Tuple[str, float, float]] = field(default_factory=list)
+    accepted: bool = False
+
+    @property
+    def gain(self) -> float:
+        before = sum(b for _, b, _ in self.used_by)
+        after = sum(a for _, _, a in self.used_by)
+        return (before - after) / before if before else 0.0
+
+class IndexAdvisor:
+    """Measure candidate indexes against the queries SalesAnalyzer actually runs.
+
+    Each candidate is created, the captured workload re-timed, and the index
+    dropped again, alternating with baseline runs. It is recommended only if
+    some query plan uses it, those queries get at least ``min_gain`` faster
+    and the workload as a whole does not get slower. Recommended indexes
+    are emitted as the next numbered migration for a developer to commit.
+    """
+
+    def __init__(self, db_path: str = "ecommerce_sample.db", repeat: int = 5, rounds: int = 3,
+                 min_gain: float = 0.1):
+        self.db = DatabaseManager(db_path)
+        self.analyzer = SalesAnalyzer(db_path, cache_size=0, db=self.db)
+        self.repeat = repeat
+        self.rounds = rounds
+        self.min_gain = min_gain
+
+    def workload_window(self) -> Tuple[date, date, Optional[str]]:
+        conn = self.db.get_connection()
+        newest = conn.execute("SELECT MAX(order_date) FROM orders").fetchone()[0]
+        end = (datetime.fromisoformat(newest).date() if newest else date.today()) + timedelta(days=1)
+        category = conn.execute("SELECT name FROM categories ORDER BY id LIMIT 1").fetchone()
+        return end - timedelta(days=30), end, category[0] if category else None
+
+    def capture_queries(self) -> List[AdvisorQuery]:
+        """Run the workload once and keep each distinct SELECT it issued."""
+        start, end, category = self.workload_window()
+        queries: List[AdvisorQuery] = []
+        seen: Set[Tuple[str, tuple]] = set()
+        for label, call in WORKLOAD:
+            with instrumentation.capture() as statements:
+                call(self.analyzer, start, end, category)
+            for sql, params in statements:
+                key = (sql, tuple(params))
+                if sql.lstrip().upper().startswith("SELECT") and key not in seen:
+                    seen.add(key)
+                    queries.append(AdvisorQuery(label, sql, tuple(params)))
+        return queries
+
+    def explain(self, query: AdvisorQuery) -> List[str]:
+        cursor = self.db.get_connection().cursor(sqlite3.Cursor)
+        return [row[3] for row in cursor.execute("EXPLAIN QUERY PLAN " + query.sql, query.params)]
+
+    def time_query(self, query: AdvisorQuery) -> float:
+        """Best wall time of executing and fetching ``query`` over ``repeat`` runs.
+
+        The minimum is the least noisy estimate for a deterministic query; one
+        warm-up run loads the pages first.
+        """
+        cursor = self.db.get_connection().cursor(sqlite3.Cursor)
+        timings = []
+        for run in range(self.repeat + 1):
+            started = time.perf_counter()
+            cursor.execute(query.sql, query.params).fetchall()
+            if run:
+                timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    def measure(self, queries: List[AdvisorQuery]) -> Dict[int, Tuple[List[str], float]]:
+        return {index: (self.explain(query), self.time_query(query))
+                for index, query in enumerate(queries)}
+
+    def existing_indexes(self) -> Set[str]:
+        rows = self.db.get_connection().execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'").fetchall()
+        return {row[0] for row in rows}
+
+    def try_index(self, name: str, ddl: str, queries: List[AdvisorQuery]) -> IndexTrial:
+        """Alternate timing the workload without and with the index, then drop it.
+
+        Interleaving ``rounds`` times keeps machine noise from favouring either
+        side; each query's best time per side is compared.
+        """
+        conn = self.db.get_connection()
+        trial = IndexTrial(name, ddl)
+        without: Dict[int, float] = {}
+        with_index: Dict[int, float] = {}
+        plans: Dict[int, List[str]] = {}
+        for _ in range(self.rounds):
+            for index, (_, seconds) in self.measure(queries).items():
+                without[index] = min(seconds, without.get(index, seconds))
+            started = time.perf_counter()
+            conn.execute(ddl)
+            conn.commit()
+            trial.build_seconds = time.perf_counter() - started
+            try:
+                for index, (plan, seconds) in self.measure(queries).items():
+                    with_index[index] = min(seconds, with_index.get(index, seconds))
+                    plans[index] = plan
+            finally:
+                conn.execute(f"DROP INDEX {name}")
+                conn.commit()
+
+        trial.before = sum(without.values())
+        trial.after = sum(with_index.values())
+        for index, plan in plans.items():
+            if any(name in step for step in plan):
+                trial.used_by.append((queries[index].label, without[index], with_index[index]))
+        trial.accepted = bool(trial.used_by) and trial.gain >= self.min_gain and trial.after <= trial.before
+        return trial
+
+    def write_migration(self, trials: List[IndexTrial], path: Optional[str] = None) -> Tuple[str, List[str]]:
+        """Write ``trials``' indexes as the next numbered migration to ``path``, or print it.
+
+        Returns the file name to commit it under in migrations/ and the
+        statements. They use IF NOT EXISTS, so the script is a no-op for the
+        database they were applied to once it is registered in MIGRATIONS.
+        """
+        version = max(MIGRATIONS, default=1) + 1
+        statements = [trial.sql.replace("CREATE INDEX ", "CREATE INDEX IF NOT EXISTS ", 1) for trial in trials]
+        script = (f"-- Schema version {version}: indexes recommended by the index advisor\n\n"
+                  + "".join(f"{statement};\n" for statement in statements))
+        if path is None:
+            print(script, end="")
+        else:
+            with open(path, "w") as f:
+                f.write(script)
+        return f"migrations/{version:03d}_advised_indexes.sql", statements
+
+    def advise(self, apply: bool = False, migration_path: Optional[str] = None) -> List[IndexTrial]:
+        """Time the candidates and emit a migration for the recommended ones.
+
+        The migration goes to ``migration_path``, or to stdout when it is
+        None; ``apply`` also creates the indexes in this database.
+        """
+        queries = self.capture_queries()
+        print(f"Captured {len(queries)} analyzer queries; timing each as the best of {self.repeat} runs\n")
+        for query, (plan, seconds) in zip(queries, self.measure(queries).values()):
+            query.plan, query.seconds = plan, seconds
+
+        print("QUERY PLANS:")
+        for query in queries:
+            issues = plan_issues(query.plan)
+            print(f"- {query.label}: {query.seconds * 1000:.2f} ms")
+            for step in issues:
+                print(f"    {step}")
+            if not issues:
+                print("    no full scans or temp B-trees")
+
+        print("\nCANDIDATE INDEXES:")
+        present = self.existing_indexes()
+        trials = []
+        for name, ddl in CANDIDATE_INDEXES:
+            if name in present:
+                print(f"- {name}: already present")
+                continue
+            trial = self.try_index(name, ddl, queries)
+            trials.append(trial)
+            verdict = "RECOMMENDED" if trial.accepted else "rejected"
+            print(f"- {name}: {verdict}, workload {trial.before * 1000:.2f} -> {trial.after * 1000:.2f} ms, "
+                  f"built in {trial.build_seconds:.2f}s")
+            for label, before, after in trial.used_by:
+                print(f"    {label}: {before * 1000:.2f} -> {after * 1000:.2f} ms")
+            if not trial.used_by:
+                print("    not used by any query plan")
+
+        accepted = [trial for trial in trials if trial.accepted]
+        if not accepted:
+            print("\nNo index earned its keep on this database.")
+            return trials
+
+        print("\nMigration SQL:" if migration_path is None else "")
+        name, statements = self.write_migration(accepted, migration_path)
+        if migration_path is not None:
+            print(f"Wrote the migration to {migration_path}")
+        # Committed as a migration so other databases and schema upgrades get the same indexes
+        print(f"Commit it as {name}, register it in database.MIGRATIONS, bump SCHEMA_VERSION "
+              f"and add the indexes to schema.sql")
+
+        if apply:
+            conn = self.db.get_connection()
+            before = sum(query.seconds for query in queries)
+            try:
+                conn.execute("BEGIN")
+                for statement in statements:
+                    conn.execute(statement)
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                raise e
+            after = sum(seconds for _, seconds in self.measure(queries).values())
+            print(f"\nApplied {len(accepted)} indexes to {self.db.db_path}; "
+                  f"workload {before * 1000:.2f} -> {after * 1000:.2f} ms")
+        return trials
@@ -0,0 +1,217 @@
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger("instrumentation")
+
+@dataclass(slots=True)
+class QueryStats:
+    calls: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    rows: int = 0
+    bytes: int = 0
+
+class Instrumentation:
+    """Opt-in, process-wide collector for query timings, counters and load phases.
+
+    While disabled every hook returns immediately. Enable it with
+    ``instrumentation.enable()``; queries whose execute-plus-fetch time crosses
+    ``slow_query_ms`` are logged once per cursor with their EXPLAIN QUERY PLAN.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.slow_query_ms = 100.0
+        self.queries: Dict[str, QueryStats] = {}
+        self.counters: Dict[str, int] = {}
+        self.phases: Dict[str, float] = {}
+        self.captured: Optional[List[Tuple[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    def enable(self, slow_query_ms: Optional[float] = None):
+        if slow_query_ms is not None:
+            self.slow_query_ms = slow_query_ms
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    @contextmanager
+    def capture(self) -> Iterator[List[Tuple[str, Any]]]:
+        """Collect ``(sql, params)`` for every statement executed inside the block."""
+        statements: List[Tuple[str, Any]] = []
+        was_enabled = self.enabled
+        self.captured = statements
+        self.enabled = True
+        try:
+            yield statements
+        finally:
+            self.captured = None
+            self.enabled = was_enabled
+
+    def reset(self):
+        with self._lock:
+            self.queries.clear()
+            self.counters.clear()
+            self.phases.clear()
+
+    def record_query(self, sql: str, seconds: float = 0.0, rows: int = 0, nbytes: int = 0,
+                     call: bool = False):
+        key = " ".join(sql.split())
+        with self._lock:
+            stats = self.queries.get(key)
+            if stats is None:
+                stats = self.queries[key] = QueryStats()
+            stats.calls += call
+            stats.seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.rows += rows
+            stats.bytes += nbytes
+
+    def count(self, name: str, amount: int = 1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            queries = sorted(self.queries.items(), key=lambda x: x[1].seconds, reverse=True)
+            return {
+                "queries": [
+                    {"sql": sql, "calls": s.calls, "seconds": s.seconds,
+                     "max_seconds": s.max_seconds, "rows": s.rows, "bytes": s.bytes}
+                    for sql, s in queries
+                ],
+                "counters": dict(self.counters),
+                "phases": dict(self.phases),
+            }
+
+    def format_report(self, limit: int = 15) -> str:
+        report = self.report()
+        lines = ["=== INSTRUMENTATION ==="]
+        if report["phases"]:
+            lines.append("Phases:")
+            lines.extend(f"  {name:30} {seconds:9.4f}s" for name, seconds in report["phases"].items())
+        if report["counters"]:
+            lines.append("Counters:")
+            lines.extend(f"  {name:30} {value:9d}" for name, value in sorted(report["counters"].items()))
+        lines.append(f"Queries (top {limit} by total time):")
+        lines.append(f"  {'calls':>7} {'total s':>9} {'max s':>8} {'rows':>9} {'bytes':>11}  sql")
+        for query in report["queries"][:limit]:
+            sql = query["sql"] if len(query["sql"]) <= 80 else query["sql"][:77] + "..."
+            lines.append(f"  {query['calls']:7d} {query['seconds']:9.4f} {query['max_seconds']:8.4f} "
+                         f"{query['rows']:9d} {query['bytes']:11d}  {sql}")
+        return "\n".join(lines)
+
+instrumentation = Instrumentation()
+
+def _row_bytes(rows: List[Any]) -> int:
+    """Approximate payload converted from SQLite into Python objects."""
+    total = 0
+    for row in rows:
+        for value in row:
+            total += len(value) if isinstance(value, (str, bytes)) else 8
+    return total
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that reports timings and fetched rows to ``instrumentation``."""
+
+    _sql = ""
+    _params: Any = ()
+    _elapsed = 0.0
+    _logged = False
+
+    def _track(self, started: float, rows: Optional[List[Any]] = None, call: bool = False):
+        elapsed = time.perf_counter() - started
+        self._elapsed += elapsed
+        count = len(rows) if rows is not None else 0
+        nbytes = _row_bytes(rows) if rows else 0
+        instrumentation.record_query(self._sql, elapsed, count, nbytes, call)
+        if not self._logged and self._elapsed * 1000 >= instrumentation.slow_query_ms:
+            self._logged = True
+            self._log_slow()
+
+    def _log_slow(self):
+        plan = []
+        try:
+            explain = self.connection.cursor(sqlite3.Cursor).execute(
+                "EXPLAIN QUERY PLAN " + self._sql, self._params)
+            plan = [row[3] for row in explain.fetchall()]
+        except sqlite3.Error:
+            pass
+        logger.warning("Slow query (%.1f ms): %s\n  plan: %s", self._elapsed * 1000,
+                       " ".join(self._sql.split()), "; ".join(plan) or "n/a")
+
+    def execute(self, sql, parameters=()):
+        self._sql, self._params, self._elapsed, self._logged = sql, parameters, 0.0, False
+        captured = instrumentation.captured
+        if captured is not None:
+            captured.append((sql, parameters))
+        started = time.perf_counter()
+        super().execute(sql, parameters)
+        self._track(started, call=True)
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self._sql, self._params, self._elapsed, self._logged = sql, (), 0.0, True
+        started = time.perf_counter()
+        super().executemany(sql, seq_of_parameters)
+        self._track(started, call=True)
+        return self
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._track(started, [row] if row is not None else [])
+        return row
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._track(started, rows)
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._track(started, rows)
+        return rows
+
+    def __next__(self):
+        started = time.perf_counter()
+        row = super().__next__()
+        self._track(started, [row])
+        return row
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors are instrumented while instrumentation is enabled."""
+
+    def cursor(self, factory=None):
+        if factory is None:
+            factory = InstrumentedCursor if instrumentation.enabled else sqlite3.Cursor
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
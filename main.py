@@ -1,40 +1,183 @@
 #!/usr/bin/env python3
 
 import sys
-from sample_data import generate_sample_data
-from sales_analyzer import SalesAnalyzer
-from csv_loader import CSVLoader
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python main.py [generate|load-csv|analyze]")
-        print("  generate - Generate sample e-commerce data")
-        print("  load-csv - Load data from CSV files")
-        print("  analyze  - Analyze sales data and show report")
-        return
-    
-    command = sys.argv[1].lower()
+# Commands import what they need when they run, so printing usage or a
+# cheap command does not pay for loading the analyzers and loaders. For the
+# same reason this module uses built-in generics rather than importing typing.
+
+def profile(args: list[str], output: str = "profile.prof"):
+    """Run another command under cProfile with query instrumentation enabled."""
+    import cProfile
+    import io
+    import logging
+    import pstats
+    import time
+    from instrumentation import instrumentation
     
-    if command == "generate":
-        print("Generating sample e-commerce data...")
-        generate_sample_data()
-        print("Sample data generation completed!")
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+    instrumentation.enable()
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        run(args)
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - start
+        instrumentation.disable()
     
-    elif command == "load-csv":
-        print("Loading data from CSV files...")
-        loader = CSVLoader("ecommerce_csv.db")
-        loader.load_all_data()
+    profiler.dump_stats(output)
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(25)
+    print(f"\n=== PROFILE ({elapsed:.3f}s wall) ===")
+    print(stream.getvalue())
+    print(instrumentation.format_report())
+    print(f"\nFull profile written to {output} (open with snakeviz, or flameprof for a flame graph)")
+
+def print_usage():
+    print("Usage: python main.py [generate|load-csv|analyze|rebuild|export|snapshot|restore|advise-indexes|serve|profile]")
+    print("  generate - Generate sample e-commerce data (--fresh for an empty database)")
+    print("  load-csv - Load data from CSV files (--bulk for batched inserts,")
+    print("             --parallel to parse files in a process pool,")
+    print("             --sorted when orders and items are ordered by order id,")
+    print("             --incremental to load only new or changed rows; safe to re-run,")
+    print("             --incremental --closed once the files are finished, so a last")
+    print("             row without a trailing newline is loaded too,")
+    print("             --bulk --fresh to fill an empty database with index builds deferred)")
+    print("  analyze  - Analyze sales data and show report (--full lists every product,")
+    print("             --shards a.db b.db ... merges several databases, --processes")
+    print("             queries them in worker processes, --approximate adds sketch-based")
+    print("             estimates with error bounds, --in-memory answers from column arrays")
+    print("             loaded into memory)")
+    print("  rebuild  - Recompute the materialized sales summary and rollups")
+    print("  export   - Export sales summary and products to CSV files")
+    print("  snapshot - Write a columnar snapshot to ./snapshot (--format parquet|npy|raw)")
+    print("  restore  - Restore ./snapshot into an empty database")
+    print("             (default ecommerce_restored.db, or pass a file name)")
+    print("  advise-indexes - Time candidate indexes against the analyzer queries")
+    print("             and print a migration for the ones that measurably help")
+    print("             (--migration FILE writes it to FILE, --apply also creates them)")
+    print("  serve    - Serve the precomputed sales report as JSON on http://127.0.0.1:8765/reports")
+    print("             (--port N, --interval seconds between scheduled refreshes, --in-memory)")
+    print("  profile  - Run another command under cProfile and report query timings")
+    print("             e.g. python main.py profile analyze --csv")
+
+def db_file_for(options: list[str]) -> str:
+    return "ecommerce_csv.db" if "--csv" in options else "ecommerce_sample.db"
+
+def generate_command(options: list[str]):
+    from sample_data import generate_sample_data
+    print("Generating sample e-commerce data...")
+    generate_sample_data(fresh="--fresh" in options)
+    print("Sample data generation completed!")
+
+def load_csv_command(options: list[str]):
+    print("Loading data from CSV files...")
+    if "--parallel" in options:
+        from parallel_loader import ParallelCSVLoader
+        ParallelCSVLoader("ecommerce_csv.db").parallel_load_all_data()
         print("CSV data loading completed!")
+        return
     
-    elif command == "analyze":
-        print("Analyzing sales data...\n")
-        db_file = "ecommerce_csv.db" if len(sys.argv) > 2 and sys.argv[2] == "--csv" else "ecommerce_sample.db"
-        analyzer = SalesAnalyzer(db_file)
-        analyzer.print_sales_report()
+    from csv_loader import CSVLoader
+    loader = CSVLoader("ecommerce_csv.db")
+    if "--incremental" in options:
+        loader.incremental_load_all_data(producer_closed="--closed" in options)
+    elif "--bulk" in options:
+        loader.bulk_load_all_data(fresh="--fresh" in options)
+    else:
+        loader.load_all_data(sorted_input="--sorted" in options)
+    print("CSV data loading completed!")
+
+def analyze_command(options: list[str]):
+    print("Analyzing sales data...\n")
+    full_summary = "--full" in options
+    if "--shards" in options:
+        from sharded_analyzer import ShardedSalesAnalyzer
+        shards = [arg for arg in options[options.index("--shards") + 1:] if not arg.startswith("--")]
+        with ShardedSalesAnalyzer(shards, use_processes="--processes" in options) as analyzer:
+            analyzer.print_sales_report(full_summary=full_summary)
+        return
     
+    if "--in-memory" in options:
+        from memory_engine import InMemorySalesAnalyzer
+        analyzer = InMemorySalesAnalyzer(db_file_for(options))
+    elif "--approximate" in options:
+        from approximate_analyzer import ApproximateSalesAnalyzer
+        analyzer = ApproximateSalesAnalyzer(db_file_for(options))
     else:
+        from sales_analyzer import SalesAnalyzer
+        analyzer = SalesAnalyzer(db_file_for(options))
+    analyzer.print_sales_report(full_summary=full_summary)
+
+def rebuild_command(options: list[str]):
+    from database import DatabaseManager
+    db_file = db_file_for(options)
+    db = DatabaseManager(db_file)
+    products = db.rebuild_sales_summary()
+    days = db.rebuild_rollups()
+    print(f"Rebuilt sales summary for {products} products and rollups for {days} days in {db_file}")
+
+def export_command(options: list[str]):
+    from csv_exporter import CSVExporter
+    CSVExporter(db_file_for(options)).export_all_data()
+
+def snapshot_command(options: list[str]):
+    from snapshot import export_snapshot
+    fmt = options[options.index("--format") + 1] if "--format" in options else None
+    export_snapshot(db_file_for(options), "snapshot", fmt)
+    print("Snapshot completed!")
+
+def restore_command(options: list[str]):
+    from snapshot import restore_snapshot
+    targets = [arg for arg in options if not arg.startswith("--")]
+    restore_snapshot("snapshot", targets[0] if targets else "ecommerce_restored.db")
+    print("Restore completed!")
+
+def serve_command(options: list[str]):
+    from report_server import serve
+    port = int(options[options.index("--port") + 1]) if "--port" in options else 8765
+    interval = float(options[options.index("--interval") + 1]) if "--interval" in options else 300.0
+    analyzer = None
+    if "--in-memory" in options:
+        from memory_engine import InMemorySalesAnalyzer
+        analyzer = InMemorySalesAnalyzer(db_file_for(options), cache_size=0)
+    serve(db_file_for(options), port=port, interval=interval, analyzer=analyzer)
+
+def advise_indexes_command(options: list[str]):
+    from index_advisor import IndexAdvisor
+    migration_path = options[options.index("--migration") + 1] if "--migration" in options else None
+    IndexAdvisor(db_file_for(options)).advise(apply="--apply" in options, migration_path=migration_path)
+
+COMMANDS = {
+    "generate": generate_command,
+    "load-csv": load_csv_command,
+    "analyze": analyze_command,
+    "rebuild": rebuild_command,
+    "export": export_command,
+    "snapshot": snapshot_command,
+    "restore": restore_command,
+    "advise-indexes": advise_indexes_command,
+    "serve": serve_command,
+    "profile": profile,
+}
+
+def main():
+    run(sys.argv[1:])
+
+def run(args: list[str]):
+    if not args or args[0] in ("-h", "--help", "help"):
+        print_usage()
+        return
+    
+    command = args[0].lower()
+    handler = COMMANDS.get(command)
+    if handler is None:
         print(f"Unknown command: {command}")
-        print("Available commands: generate, load-csv, analyze")
+        print(f"Available commands: {', '.join(COMMANDS)}")
+        return
+    handler(args[1:])
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,726 @@
+import copy
+import functools
+import threading
+from array import array
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from columnar import INT, MISSING, TEXT, cents_sql, np, read_columns
+from database import DatabaseManager, DateLike
+from sales_analyzer import SalesAnalyzer
+
+EPOCH = date(1970, 1, 1)
+SECONDS_PER_DAY = 86400
+
+# Keys group_by accepts; day, week (starting Monday) and month come from order_date
+GROUP_KEYS = ("product", "category", "status", "day", "week", "month")
+MEASURES = ("quantity", "revenue", "avg_price", "lines", "orders")
+
+ORDER_COLUMNS_SQL = f"""
+SELECT id, CAST(strftime('%s', order_date) AS INTEGER), status, {cents_sql('total_amount')}
+FROM orders WHERE id > ? ORDER BY id
+"""
+ORDER_SCHEMA = [("id", INT), ("ts", INT), ("status", TEXT), ("total_cents", INT)]
+
+ITEM_COLUMNS_SQL = f"""
+SELECT id, order_id, product_id, quantity, {cents_sql('unit_price')}, {cents_sql('total_price')}
+FROM order_items WHERE id > ? ORDER BY id
+"""
+ITEM_SCHEMA = [
+    ("id", INT), ("order_id", INT), ("product_id", INT), ("quantity", INT),
+    ("unit_cents", INT), ("total_cents", INT),
+]
+
+def _int_column(values=()):
+    if np is not None:
+        return np.asarray(values, dtype=np.int64)
+    return array("q", values)
+
+class _Column:
+    """An int64 column with spare capacity, so appending k values costs O(k).
+
+    ``extend`` returns the filled part: a view of the buffer with NumPy, the
+    ``array`` itself without. Views handed out earlier stay valid.
+    """
+
+    def __init__(self):
+        self.data = _int_column()
+        self.size = 0
+
+    def extend(self, values):
+        if np is None:
+            self.data.extend(values)
+            self.size = len(self.data)
+            return self.data
+        count = len(values)
+        if self.size + count > len(self.data):
+            grown = np.empty(max(2 * len(self.data), self.size + count, 1024), dtype=np.int64)
+            grown[:self.size] = self.data[:self.size]
+            self.data = grown
+        self.data[self.size:self.size + count] = values
+        self.size += count
+        return self.data[:self.size]
+
+    def patch(self, positions, values):
+        if np is not None:
+            self.data[positions] = values
+            return
+        for position, value in zip(positions, values):
+            self.data[position] = value
+
+# Columns refresh appends to: orders and items as read, then per-item columns
+# joined in from orders and products
+ORDER_COLUMNS = ("order_ids", "order_ts", "order_status", "order_total_cents")
+ITEM_COLUMNS = ("item_ids", "item_order_ids", "item_product_ids", "item_quantity",
+                "item_unit_cents", "item_total_cents")
+DERIVED_COLUMNS = ("item_order_pos", "item_ts", "item_status", "item_products", "item_categories")
+# Code -> category code per product, appended to as products arrive
+PRODUCT_COLUMNS = ("product_categories",)
+COLUMNS = ORDER_COLUMNS + ITEM_COLUMNS + DERIVED_COLUMNS + PRODUCT_COLUMNS
+
+PRODUCTS_SQL = "SELECT id, name, sku, category_id FROM products WHERE id > ? ORDER BY id"
+
+def _take(table, index):
+    """``table[index]``, with MISSING wherever the index is MISSING."""
+    if np is not None:
+        if not len(table):
+            return np.full(len(index), MISSING, dtype=np.int64)
+        return np.where(index >= 0, table[np.maximum(index, 0)], MISSING)
+    return array("q", (table[i] if i >= 0 else MISSING for i in index))
+
+def _unique(keys, size: int):
+    """np.unique(keys, return_inverse=True) for non-negative keys below ``size``."""
+    if size > 4 * len(keys) + 65536:
+        return np.unique(keys, return_inverse=True)
+    # Few possible keys: count into a dense table instead of sorting
+    groups = np.flatnonzero(np.bincount(keys, minlength=size))
+    slots = np.full(size, MISSING, dtype=np.int64)
+    slots[groups] = np.arange(len(groups))
+    return groups, slots[keys]
+
+def _ranks(labels: Sequence[Any]):
+    """Position of each label in sorted order, for deterministic tie-breaks."""
+    order = sorted(range(len(labels)), key=lambda i: (labels[i] is None, str(labels[i])))
+    ranks = [0] * len(labels)
+    for rank, i in enumerate(order):
+        ranks[i] = rank
+    return _int_column(ranks)
+
+def _on_snapshot(method: Callable) -> Callable:
+    """Run an InMemorySalesEngine query on a snapshot, so a concurrent refresh cannot tear it."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        return method(self._snapshot(), *args, **kwargs)
+
+    return wrapper
+
+def _periods(ts, granularity: str):
+    """Day number, Monday of the week or month number for each Unix timestamp."""
+    if np is not None:
+        days = ts // SECONDS_PER_DAY
+        if granularity == "day":
+            return days
+        if granularity == "week":
+            return days - (days + 3) % 7  # 1970-01-01 was a Thursday
+        return days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+
+    days = [t // SECONDS_PER_DAY for t in ts]
+    if granularity == "day":
+        return days
+    if granularity == "week":
+        return [d - (d + 3) % 7 for d in days]
+    months = []
+    for d in days:
+        day = EPOCH + timedelta(days=d)
+        months.append((day.year - 1970) * 12 + day.month - 1)
+    return months
+
+def _period_label(granularity: str, value: int) -> str:
+    if granularity == "month":
+        return date(1970 + value // 12, value % 12 + 1, 1).isoformat()
+    return (EPOCH + timedelta(days=value)).isoformat()
+
+def _epoch_seconds(value: DateLike) -> int:
+    # Compares like the text order_date: a bare date means midnight, naive means UTC
+    if isinstance(value, datetime):
+        moment = value
+    elif isinstance(value, date):
+        moment = datetime(value.year, value.month, value.day)
+    else:
+        moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+def _date_text(value: DateLike) -> str:
+    return value.isoformat() if isinstance(value, date) else value
+
+class InMemorySalesEngine:
+    """orders and order_items held in memory as compact column arrays.
+
+    Money is in integer cents, order dates are Unix seconds, and products,
+    categories and statuses are dictionary-encoded to small integer codes.
+    Aggregations run as NumPy kernels over the arrays, or as plain loops
+    without NumPy. ``refresh`` appends rows whose id is above the last one
+    loaded, at a cost that follows the new rows rather than the history;
+    deleted or edited orders need ``reload``. Queries run on a snapshot of
+    the arrays taken under ``lock``, so they may overlap a refresh.
+    """
+
+    def __init__(self, db: DatabaseManager, batch_size: int = 10000):
+        self.db = db
+        self.batch_size = batch_size
+        self.lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.loaded_version: Optional[tuple] = None
+        self._columns: Dict[str, _Column] = {}
+        self.loaded_counters: Optional[Dict[str, int]] = None
+        for name in COLUMNS:
+            self._columns[name] = _Column()
+            setattr(self, name, self._columns[name].extend(()))
+        self._order_positions: Dict[int, int] = {}  # only used without NumPy
+        # Positions of items whose order or product was not loaded yet
+        self._orphan_items: List[int] = []
+        self._unknown_product_items: List[int] = []
+
+        # Dictionaries: code -> value lists and value -> code maps. Lists only
+        # grow in place; renames swap in new lists, so snapshots keep theirs
+        self.product_codes: Dict[int, int] = {}
+        self.product_ids: List[int] = []
+        self.product_names: List[str] = []
+        self.product_skus: List[str] = []
+        self.category_codes: Dict[str, int] = {}
+        self.category_names: List[str] = []
+        self.status_codes: Dict[Optional[str], int] = {}
+        self.statuses: List[Optional[str]] = []
+        # Category names by id as of the last full read, and the highest product id read
+        self._category_names_by_id: Dict[int, str] = {}
+        self._last_product_id = 0
+        self._product_lookup = _int_column()  # product id -> code, only used with NumPy
+
+    @property
+    def order_watermark(self) -> int:
+        return int(self.order_ids[-1]) if len(self.order_ids) else 0
+
+    @property
+    def item_watermark(self) -> int:
+        return int(self.item_ids[-1]) if len(self.item_ids) else 0
+
+    def _encode(self, codes: dict, values: list, value) -> int:
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(values)
+            values.append(value)
+        return code
+
+    def _category_code(self, category_id) -> int:
+        if category_id not in self._category_names_by_id:
+            return MISSING
+        return self._encode(self.category_codes, self.category_names,
+                            self._category_names_by_id[category_id])
+
+    def _index_products(self, first: int):
+        """Add products from code ``first`` on to the id -> code lookup."""
+        if np is None or first == len(self.product_ids):
+            return
+        ids = np.asarray(self.product_ids[first:], dtype=np.int64)
+        size = int(ids.max()) + 1
+        if size > len(self._product_lookup):
+            grown = np.full(max(2 * len(self._product_lookup), size), MISSING, dtype=np.int64)
+            grown[:len(self._product_lookup)] = self._product_lookup
+            self._product_lookup = grown
+        self._product_lookup[ids] = np.arange(first, len(self.product_ids))
+
+    def _load_dimensions(self, conn) -> bool:
+        """Re-read categories and products whole; True if a known product changed category.
+
+        Only needed after a rename, move or delete; ``_load_new_products``
+        covers inserts.
+        """
+        self._category_names_by_id = dict(conn.execute("SELECT id, name FROM categories").fetchall())
+        rows = conn.execute(PRODUCTS_SQL, (0,)).fetchall()
+        previous = self.product_categories
+        first = len(self.product_ids)
+        names = list(self.product_names)
+        skus = list(self.product_skus)
+        product_categories = [MISSING] * first
+        for product_id, name, sku, category_id in rows:
+            code = self._encode(self.product_codes, self.product_ids, product_id)
+            if code == len(names):
+                names.append(name)
+                skus.append(sku)
+                product_categories.append(MISSING)
+            else:
+                names[code] = name
+                skus[code] = sku
+            product_categories[code] = self._category_code(category_id)
+        self.product_names = names
+        self.product_skus = skus
+        self._replace("product_categories", product_categories)
+        self._index_products(first)
+        self._last_product_id = rows[-1][0] if rows else 0
+        return list(previous) != product_categories[:len(previous)]
+
+    def _load_new_products(self, conn) -> int:
+        """Append products with ids above the last one read; returns how many."""
+        rows = conn.execute(PRODUCTS_SQL, (self._last_product_id,)).fetchall()
+        first = len(self.product_ids)
+        for product_id, name, sku, category_id in rows:
+            self._encode(self.product_codes, self.product_ids, product_id)
+            self.product_names.append(name)
+            self.product_skus.append(sku)
+        self._append("product_categories", _int_column([self._category_code(row[3]) for row in rows]))
+        self._index_products(first)
+        if rows:
+            self._last_product_id = rows[-1][0]
+        return len(rows)
+
+    def _refresh_dimensions(self, conn) -> bool:
+        """Bring products and categories up to date; True if a known product changed category.
+
+        The catalog's change counters say whether anything but inserts
+        happened, so an orders-only refresh does not touch the catalog.
+        """
+        counters = self.db.change_counters()
+        previous, self.loaded_counters = self.loaded_counters, counters
+        if previous is None or any(counters[name] != previous[name]
+                                   for name in ("categories", "products_changed")):
+            return self._load_dimensions(conn)
+        inserted = counters["products_inserted"] - previous["products_inserted"]
+        if inserted and self._load_new_products(conn) != inserted:
+            # Some went in below the last id read, or were deleted again
+            return self._load_dimensions(conn)
+        return False
+
+    def _product_codes(self, product_ids):
+        if np is not None:
+            inside = (product_ids >= 0) & (product_ids < len(self._product_lookup))
+            return _take(self._product_lookup, np.where(inside, product_ids, MISSING))
+        return array("q", (self.product_codes.get(v, MISSING) for v in product_ids))
+
+    def _order_positions_of(self, order_ids):
+        if np is not None:
+            if not len(self.order_ids):
+                return np.full(len(order_ids), MISSING, dtype=np.int64)
+            positions = np.minimum(np.searchsorted(self.order_ids, order_ids), len(self.order_ids) - 1)
+            return np.where(self.order_ids[positions] == order_ids, positions, MISSING)
+        return array("q", (self._order_positions.get(v, MISSING) for v in order_ids))
+
+    def _append(self, name: str, values):
+        setattr(self, name, self._columns[name].extend(values))
+
+    def _replace(self, name: str, values):
+        column = self._columns[name] = _Column()
+        setattr(self, name, column.extend(values))
+
+    def _missing(self, first: int, values) -> List[int]:
+        """Positions, counted from ``first``, of the MISSING entries in ``values``."""
+        if np is not None:
+            return (np.flatnonzero(values == MISSING) + first).tolist()
+        return [first + i for i, value in enumerate(values) if value == MISSING]
+
+    def _resolve_orphans(self):
+        """Join items loaded before their order to the orders that have since arrived."""
+        if not self._orphan_items:
+            return
+        items = _int_column(self._orphan_items)
+        positions = self._order_positions_of(_take(self.item_order_ids, items))
+        # Order columns first: readers skip an item until its order position is set
+        self._columns["item_ts"].patch(items, _take(self.order_ts, positions))
+        self._columns["item_status"].patch(items, _take(self.order_status, positions))
+        self._columns["item_order_pos"].patch(items, positions)
+        self._orphan_items = [item for item, position in zip(self._orphan_items, positions)
+                              if position == MISSING]
+
+    def _resolve_products(self, categories_changed: bool):
+        """Re-join items to products after the products table changed."""
+        if self._unknown_product_items:
+            items = _int_column(self._unknown_product_items)
+            codes = self._product_codes(_take(self.item_product_ids, items))
+            self._columns["item_products"].patch(items, codes)
+            if not categories_changed:
+                self._columns["item_categories"].patch(items, _take(self.product_categories, codes))
+            self._unknown_product_items = [item for item, code in zip(self._unknown_product_items, codes)
+                                           if code == MISSING]
+        if categories_changed:
+            # A product moved category: every one of its items moves too
+            self._replace("item_categories", _take(self.product_categories, self.item_products))
+
+    def refresh(self) -> int:
+        """Append orders and items added since the last call; returns rows read.
+
+        Does nothing while the database's data_version is unchanged. Only the
+        new rows are joined to orders and products, plus any earlier items
+        whose order or product had not been loaded yet.
+        """
+        with self.lock:
+            version = self.db.data_version
+            if version == self.loaded_version:
+                return 0
+            conn = self.db.get_connection()
+            product_count = len(self.product_ids)
+            categories_changed = self._refresh_dimensions(conn)
+            orders = read_columns(conn, ORDER_COLUMNS_SQL, ORDER_SCHEMA,
+                                  (self.order_watermark,), self.batch_size)
+            items = read_columns(conn, ITEM_COLUMNS_SQL, ITEM_SCHEMA,
+                                 (self.item_watermark,), self.batch_size)
+
+            if np is None:
+                for offset, order_id in enumerate(orders["id"], len(self.order_ids)):
+                    self._order_positions[order_id] = offset
+            statuses = [self._encode(self.status_codes, self.statuses, s) for s in orders["status"]]
+            self._append("order_ids", orders["id"])
+            self._append("order_ts", orders["ts"])
+            self._append("order_status", _int_column(statuses))
+            self._append("order_total_cents", orders["total_cents"])
+            if len(orders["id"]):
+                self._resolve_orphans()
+            if categories_changed or len(self.product_ids) != product_count:
+                self._resolve_products(categories_changed)
+
+            first = len(self.item_ids)
+            positions = self._order_positions_of(items["order_id"])
+            products = self._product_codes(items["product_id"])
+            self._append("item_ts", _take(self.order_ts, positions))
+            self._append("item_status", _take(self.order_status, positions))
+            self._append("item_products", products)
+            self._append("item_categories", _take(self.product_categories, products))
+            self._append("item_order_pos", positions)
+            for name, values in zip(ITEM_COLUMNS, (items["id"], items["order_id"], items["product_id"],
+                                                   items["quantity"], items["unit_cents"],
+                                                   items["total_cents"])):
+                self._append(name, values)
+            self._orphan_items += self._missing(first, positions)
+            self._unknown_product_items += self._missing(first, products)
+
+            self.loaded_version = version
+            return len(orders["id"]) + len(items["id"])
+
+    def reload(self) -> int:
+        """Drop everything and load again, e.g. after orders were deleted or edited."""
+        with self.lock:
+            self._reset()
+        return self.refresh()
+
+    def _snapshot(self) -> "InMemorySalesEngine":
+        """A shallow copy whose column arrays stay as they are while refresh appends.
+
+        Slicing is a view with NumPy and a copy without. Later patches only
+        fill MISSING entries, which the queries skip either way.
+        """
+        with self.lock:
+            snapshot = copy.copy(self)
+            for name in COLUMNS:
+                setattr(snapshot, name, getattr(self, name)[:])
+        return snapshot
+
+    def _select(self, start_date: Optional[DateLike] = None, end_date: Optional[DateLike] = None,
+                category: Optional[str] = None, status: Optional[str] = None):
+        """Items that join to an order, product and category and pass the filters.
+
+        Returns a boolean mask with NumPy and a list of row numbers without;
+        end_date is exclusive.
+        """
+        start = _epoch_seconds(start_date) if start_date is not None else None
+        end = _epoch_seconds(end_date) if end_date is not None else None
+        category_code = self.category_codes.get(category, MISSING) if category is not None else None
+        status_code = self.status_codes.get(status, MISSING) if status is not None else None
+
+        if np is not None:
+            mask = (self.item_order_pos >= 0) & (self.item_categories >= 0)
+            if start is not None or end is not None:
+                mask &= self.item_ts != MISSING
+            if start is not None:
+                mask &= self.item_ts >= start
+            if end is not None:
+                mask &= self.item_ts < end
+            if category_code is not None:
+                mask &= self.item_categories == category_code
+            if status_code is not None:
+                mask &= self.item_status == status_code
+            return mask
+
+        dated = start is not None or end is not None
+        return [
+            i for i in range(len(self.item_ids))
+            if self.item_order_pos[i] >= 0 and self.item_categories[i] >= 0
+            and not (dated and self.item_ts[i] == MISSING)
+            and (start is None or self.item_ts[i] >= start)
+            and (end is None or self.item_ts[i] < end)
+            and (category_code is None or self.item_categories[i] == category_code)
+            and (status_code is None or self.item_status[i] == status_code)
+        ]
+
+    def _key_column(self, key: str):
+        if key == "product":
+            return self.item_products
+        if key == "category":
+            return self.item_categories
+        if key == "status":
+            return self.item_status
+        return _periods(self.item_ts, key)
+
+    def _key_ranks(self, key: str, codes):
+        if key in ("product", "category", "status"):
+            # Ranked among the groups only, so the cost follows the result size
+            return _ranks([self._label(key, int(code)) for code in codes])
+        return codes
+
+    def _label(self, key: str, code: int):
+        if key == "product":
+            return self.product_skus[code]
+        if key == "category":
+            return self.category_names[code]
+        if key == "status":
+            return self.statuses[code]
+        return _period_label(key, code)
+
+    def _aggregate(self, keys: Sequence[str], selection,
+                   distinct_orders: bool) -> Tuple[List[Any], Dict[str, Any]]:
+        """Group the selected items by ``keys``.
+
+        Returns one code column per key and the per-group sums of quantity,
+        revenue_cents, unit_cents and lines, plus orders when asked for.
+        """
+        if np is not None:
+            columns = [self._key_column(key)[selection] for key in keys]
+            composite = np.zeros(int(selection.sum()), dtype=np.int64)
+            spans = []
+            for column in columns:
+                low = int(column.min()) if len(column) else 0
+                span = int(column.max()) - low + 1 if len(column) else 1
+                composite = composite * span + (column - low)
+                spans.append((low, span))
+            size = 1
+            for _, span in spans:
+                size *= span
+            groups, inverse = _unique(composite, size)
+            codes = []
+            rest = groups
+            for low, span in reversed(spans):
+                codes.append(rest % span + low)
+                rest = rest // span
+            codes.reverse()
+
+            def total(values):
+                sums = np.bincount(inverse, weights=values[selection], minlength=len(groups))
+                return np.rint(sums).astype(np.int64)
+
+            sums = {
+                "quantity": total(self.item_quantity),
+                "revenue_cents": total(self.item_total_cents),
+                "unit_cents": total(self.item_unit_cents),
+                "lines": np.bincount(inverse, minlength=len(groups)),
+            }
+            if distinct_orders:
+                order_ids = self.item_order_ids[selection]
+                stride = int(order_ids.max()) + 1 if len(order_ids) else 1
+                pairs = np.unique(inverse * stride + order_ids)
+                sums["orders"] = np.bincount(pairs // stride, minlength=len(groups))
+            return codes, sums
+
+        columns = [self._key_column(key) for key in keys]
+        totals: Dict[tuple, list] = {}
+        for i in selection:
+            group = tuple(column[i] for column in columns)
+            entry = totals.get(group)
+            if entry is None:
+                entry = totals[group] = [0, 0, 0, 0, set()]
+            entry[0] += self.item_quantity[i]
+            entry[1] += self.item_total_cents[i]
+            entry[2] += self.item_unit_cents[i]
+            entry[3] += 1
+            if distinct_orders:
+                entry[4].add(self.item_order_ids[i])
+        groups = list(totals)
+        codes = [[group[k] for group in groups] for k in range(len(keys))]
+        entries = list(totals.values())
+        sums = {
+            "quantity": [entry[0] for entry in entries],
+            "revenue_cents": [entry[1] for entry in entries],
+            "unit_cents": [entry[2] for entry in entries],
+            "lines": [entry[3] for entry in entries],
+        }
+        if distinct_orders:
+            sums["orders"] = [len(entry[4]) for entry in entries]
+        return codes, sums
+
+    def _order(self, keys: Sequence[str], codes, values, limit: Optional[int]) -> List[int]:
+        """Group positions by descending ``values``, ties broken by the key labels."""
+        ranks = [self._key_ranks(key, column) for key, column in zip(keys, codes)]
+        if np is not None:
+            order = np.lexsort(tuple(reversed(ranks)) + (-np.asarray(values),))
+            return order[:limit].tolist()
+        order = sorted(range(len(values)), key=lambda g: (-values[g], *(r[g] for r in ranks)))
+        return order[:limit]
+
+    @_on_snapshot
+    def group_by(self, keys: Sequence[str], start_date: Optional[DateLike] = None,
+                 end_date: Optional[DateLike] = None, category: Optional[str] = None,
+                 status: Optional[str] = None, order_by: str = "revenue",
+                 limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Aggregate order lines by any combination of GROUP_KEYS.
+
+        Each row has the key values (product as its SKU, periods as their
+        first day) and every measure in MEASURES; rows are sorted by
+        ``order_by``, largest first.
+        """
+        unknown = [key for key in keys if key not in GROUP_KEYS]
+        if unknown or not keys:
+            raise ValueError(f"Unknown group keys {unknown}; expected some of {list(GROUP_KEYS)}")
+        if order_by not in MEASURES:
+            raise ValueError(f"Unknown measure {order_by!r}; expected one of {list(MEASURES)}")
+
+        selection = self._select(start_date, end_date, category, status)
+        codes, sums = self._aggregate(keys, selection, distinct_orders=True)
+        sums["revenue"] = sums["revenue_cents"]
+        if np is not None:
+            sums["avg_price"] = sums["unit_cents"] / sums["lines"]
+        else:
+            sums["avg_price"] = [unit / lines for unit, lines in zip(sums["unit_cents"], sums["lines"])]
+
+        rows = []
+        for g in self._order(keys, codes, sums[order_by], limit):
+            row = {key: self._label(key, int(column[g])) for key, column in zip(keys, codes)}
+            row["quantity"] = int(sums["quantity"][g])
+            row["revenue"] = int(sums["revenue_cents"][g]) / 100
+            row["avg_price"] = float(sums["avg_price"][g]) / 100
+            row["lines"] = int(sums["lines"][g])
+            row["orders"] = int(sums["orders"][g])
+            rows.append(row)
+        return rows
+
+    @_on_snapshot
+    def top_products(self, limit: int = 10, start_date: Optional[DateLike] = None,
+                     end_date: Optional[DateLike] = None, category: Optional[str] = None,
+                     status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Same rows and order as SalesAnalyzer.get_top_selling_products."""
+        selection = self._select(start_date, end_date, category, status)
+        (codes,), sums = self._aggregate(["product"], selection, distinct_orders=False)
+        results = []
+        for g in self._order(["product"], [codes], sums["quantity"], limit):
+            code = int(codes[g])
+            results.append({
+                "product_name": self.product_names[code],
+                "sku": self.product_skus[code],
+                "category": self.category_names[self.product_categories[code]],
+                "quantity_sold": int(sums["quantity"][g]),
+                "revenue": int(sums["revenue_cents"][g]) / 100,
+                "avg_price": int(sums["unit_cents"][g]) / int(sums["lines"][g]) / 100
+            })
+        return results
+
+    @_on_snapshot
+    def revenue_by_category(self, start_date: Optional[DateLike] = None,
+                            end_date: Optional[DateLike] = None,
+                            status: Optional[str] = None) -> Dict[str, float]:
+        selection = self._select(start_date, end_date, None, status)
+        (codes,), sums = self._aggregate(["category"], selection, distinct_orders=False)
+        return {self.category_names[int(codes[g])]: int(sums["revenue_cents"][g]) / 100
+                for g in self._order(["category"], [codes], sums["revenue_cents"], None)}
+
+    @_on_snapshot
+    def sales_trend(self, start_date: Optional[DateLike] = None, end_date: Optional[DateLike] = None,
+                    granularity: str = "day", descending: bool = False) -> List[Dict[str, Any]]:
+        """Orders, revenue and items per period, as the rollup tables count them.
+
+        Periods are kept when their first day is in [start_date, end_date).
+        """
+        if granularity not in ("day", "week", "month"):
+            raise ValueError(f"Unknown granularity {granularity!r}; expected one of ['day', 'week', 'month']")
+
+        if np is not None:
+            dated = self.order_ts != MISSING
+            order_periods = _periods(self.order_ts[dated], granularity)
+            low = int(order_periods.min()) if len(order_periods) else 0
+            span = int(order_periods.max()) - low + 1 if len(order_periods) else 1
+            periods, inverse = _unique(order_periods - low, span)
+            periods += low
+            orders = np.bincount(inverse, minlength=len(periods))
+            revenue = np.rint(np.bincount(inverse, weights=self.order_total_cents[dated],
+                                          minlength=len(periods))).astype(np.int64)
+            items = (self.item_order_pos >= 0) & (self.item_ts != MISSING)
+            slots = np.searchsorted(periods, _periods(self.item_ts[items], granularity))
+            sold = np.rint(np.bincount(slots, weights=self.item_quantity[items],
+                                       minlength=len(periods))).astype(np.int64)
+            totals = zip(periods.tolist(), orders.tolist(), revenue.tolist(), sold.tolist())
+        else:
+            by_period: Dict[int, list] = {}
+            order_periods = _periods(self.order_ts, granularity)
+            for i, ts in enumerate(self.order_ts):
+                if ts != MISSING:
+                    entry = by_period.setdefault(order_periods[i], [0, 0, 0])
+                    entry[0] += 1
+                    entry[1] += self.order_total_cents[i]
+            item_periods = _periods(self.item_ts, granularity)
+            for i, ts in enumerate(self.item_ts):
+                if self.item_order_pos[i] >= 0 and ts != MISSING:
+                    by_period[item_periods[i]][2] += self.item_quantity[i]
+            totals = ((period, *entry) for period, entry in sorted(by_period.items()))
+
+        start = _date_text(start_date) if start_date is not None else None
+        end = _date_text(end_date) if end_date is not None else None
+        results = []
+        for period, orders_count, revenue_cents, items_sold in totals:
+            label = _period_label(granularity, period)
+            if (start is not None and label < start) or (end is not None and label >= end):
+                continue
+            results.append({
+                "period_start": label,
+                "total_orders": orders_count,
+                "total_revenue": revenue_cents / 100,
+                "avg_order_value": revenue_cents / 100 / orders_count if orders_count else 0.0,
+                "total_items_sold": items_sold
+            })
+        if descending:
+            results.reverse()
+        return results
+
+class InMemorySalesAnalyzer(SalesAnalyzer):
+    """SalesAnalyzer answering from an InMemorySalesEngine instead of SQL.
+
+    Each call first folds in rows committed since the previous one, so
+    results stay current without going back to SQLite per report.
+    """
+
+    def __init__(self, db_path: str = "ecommerce_sample.db", cache_size: int = 128,
+                 cache_ttl: Optional[float] = 60.0, db: Optional[DatabaseManager] = None,
+                 engine: Optional[InMemorySalesEngine] = None):
+        super().__init__(db_path, cache_size, cache_ttl, db)
+        self.engine = engine if engine is not None else InMemorySalesEngine(self.db)
+
+    def get_top_selling_products(self, limit: int = 10, start_date: Optional[DateLike] = None,
+                                 end_date: Optional[DateLike] = None, category: Optional[str] = None,
+                                 status: Optional[str] = None) -> List[Dict[str, Any]]:
+        self.engine.refresh()
+        return self.engine.top_products(limit, start_date, end_date, category, status)
+
+    def get_revenue_by_category(self, start_date: Optional[DateLike] = None,
+                                end_date: Optional[DateLike] = None,
+                                status: Optional[str] = None) -> Dict[str, float]:
+        self.engine.refresh()
+        return self.engine.revenue_by_category(start_date, end_date, status)
+
+    def get_daily_sales_report(self, days: int = 7) -> List[Dict[str, Any]]:
+        self.engine.refresh()
+        start_date = datetime.now(timezone.utc).date() - timedelta(days=days)
+        return [
+            {
+                "date": period["period_start"],
+                "total_orders": period["total_orders"],
+                "total_revenue": period["total_revenue"],
+                "avg_order_value": period["avg_order_value"],
+                "total_items_sold": period["total_items_sold"]
+            }
+            for period in self.engine.sales_trend(start_date, descending=True)
+        ]
+
+    def get_sales_trend(self, start_date: Optional[DateLike] = None, end_date: Optional[DateLike] = None,
+                        granularity: str = "day") -> List[Dict[str, Any]]:
+        self.engine.refresh()
+        return self.engine.sales_trend(start_date, end_date, granularity)
+
+    def group_by(self, keys: Sequence[str], **options) -> List[Dict[str, Any]]:
+        self.engine.refresh()
+        return self.engine.group_by(keys, **options)
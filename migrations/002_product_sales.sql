@@ -0,0 +1,66 @@
+-- Schema version 2: materialize the sales_summary aggregates in product_sales
+
+DROP VIEW IF EXISTS sales_summary;
+
+-- Materialized per-product sales aggregates, kept current by the triggers below
+CREATE TABLE product_sales (
+    product_id INTEGER PRIMARY KEY,
+    total_quantity_sold INTEGER NOT NULL DEFAULT 0,
+    total_revenue DECIMAL(12,2) NOT NULL DEFAULT 0,
+    unit_price_sum DECIMAL(12,2) NOT NULL DEFAULT 0,
+    line_count INTEGER NOT NULL DEFAULT 0,
+    number_of_orders INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (product_id) REFERENCES products(id)
+);
+
+CREATE TRIGGER trg_order_items_insert_product_sales AFTER INSERT ON order_items
+BEGIN
+    INSERT INTO product_sales (product_id, total_quantity_sold, total_revenue,
+                               unit_price_sum, line_count, number_of_orders)
+    VALUES (
+        NEW.product_id, NEW.quantity, NEW.total_price, NEW.unit_price, 1,
+        NOT EXISTS (SELECT 1 FROM order_items
+                    WHERE order_id = NEW.order_id AND product_id = NEW.product_id AND id <> NEW.id)
+    )
+    ON CONFLICT(product_id) DO UPDATE SET
+        total_quantity_sold = total_quantity_sold + excluded.total_quantity_sold,
+        total_revenue = total_revenue + excluded.total_revenue,
+        unit_price_sum = unit_price_sum + excluded.unit_price_sum,
+        line_count = line_count + 1,
+        number_of_orders = number_of_orders + excluded.number_of_orders;
+END;
+
+CREATE TRIGGER trg_order_items_delete_product_sales AFTER DELETE ON order_items
+BEGIN
+    UPDATE product_sales SET
+        total_quantity_sold = total_quantity_sold - OLD.quantity,
+        total_revenue = total_revenue - OLD.total_price,
+        unit_price_sum = unit_price_sum - OLD.unit_price,
+        line_count = line_count - 1,
+        number_of_orders = number_of_orders -
+            NOT EXISTS (SELECT 1 FROM order_items
+                        WHERE order_id = OLD.order_id AND product_id = OLD.product_id)
+    WHERE product_id = OLD.product_id;
+    DELETE FROM product_sales WHERE product_id = OLD.product_id AND line_count <= 0;
+END;
+
+-- Sales summary view (reads the pre-aggregated rows, not order_items)
+CREATE VIEW sales_summary AS
+SELECT 
+    p.name as product_name,
+    p.sku,
+    c.name as category,
+    ps.total_quantity_sold,
+    ps.total_revenue,
+    ps.unit_price_sum * 1.0 / ps.line_count as avg_selling_price,
+    ps.number_of_orders
+FROM product_sales ps
+JOIN products p ON ps.product_id = p.id
+JOIN categories c ON p.category_id = c.id;
+
+INSERT INTO product_sales (product_id, total_quantity_sold, total_revenue,
+                           unit_price_sum, line_count, number_of_orders)
+SELECT product_id, SUM(quantity), SUM(total_price), SUM(unit_price),
+       COUNT(*), COUNT(DISTINCT order_id)
+FROM order_items
+GROUP BY product_id;
@@ -0,0 +1,125 @@
+-- Schema version 3: daily, weekly and monthly order rollups
+
+CREATE TABLE sales_daily (
+    period_start DATE PRIMARY KEY,
+    total_orders INTEGER NOT NULL DEFAULT 0,
+    total_revenue DECIMAL(14,2) NOT NULL DEFAULT 0,
+    total_items_sold INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE sales_weekly (
+    period_start DATE PRIMARY KEY,
+    total_orders INTEGER NOT NULL DEFAULT 0,
+    total_revenue DECIMAL(14,2) NOT NULL DEFAULT 0,
+    total_items_sold INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE sales_monthly (
+    period_start DATE PRIMARY KEY,
+    total_orders INTEGER NOT NULL DEFAULT 0,
+    total_revenue DECIMAL(14,2) NOT NULL DEFAULT 0,
+    total_items_sold INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER trg_orders_insert_rollups AFTER INSERT ON orders
+WHEN NEW.order_date IS NOT NULL
+BEGIN
+    INSERT INTO sales_daily (period_start, total_orders, total_revenue)
+    VALUES (date(NEW.order_date), 1, NEW.total_amount)
+    ON CONFLICT(period_start) DO UPDATE SET
+        total_orders = total_orders + 1,
+        total_revenue = total_revenue + excluded.total_revenue;
+    INSERT INTO sales_weekly (period_start, total_orders, total_revenue)
+    VALUES (date(NEW.order_date, 'weekday 0', '-6 days'), 1, NEW.total_amount)
+    ON CONFLICT(period_start) DO UPDATE SET
+        total_orders = total_orders + 1,
+        total_revenue = total_revenue + excluded.total_revenue;
+    INSERT INTO sales_monthly (period_start, total_orders, total_revenue)
+    VALUES (date(NEW.order_date, 'start of month'), 1, NEW.total_amount)
+    ON CONFLICT(period_start) DO UPDATE SET
+        total_orders = total_orders + 1,
+        total_revenue = total_revenue + excluded.total_revenue;
+END;
+
+CREATE TRIGGER trg_orders_delete_rollups AFTER DELETE ON orders
+WHEN OLD.order_date IS NOT NULL
+BEGIN
+    UPDATE sales_daily SET
+        total_orders = total_orders - 1,
+        total_revenue = total_revenue - OLD.total_amount
+    WHERE period_start = date(OLD.order_date);
+    UPDATE sales_weekly SET
+        total_orders = total_orders - 1,
+        total_revenue = total_revenue - OLD.total_amount
+    WHERE period_start = date(OLD.order_date, 'weekday 0', '-6 days');
+    UPDATE sales_monthly SET
+        total_orders = total_orders - 1,
+        total_revenue = total_revenue - OLD.total_amount
+    WHERE period_start = date(OLD.order_date, 'start of month');
+END;
+
+CREATE TRIGGER trg_order_items_insert_rollups AFTER INSERT ON order_items
+BEGIN
+    INSERT INTO sales_daily (period_start, total_items_sold)
+    SELECT date(o.order_date), NEW.quantity
+    FROM orders o WHERE o.id = NEW.order_id AND o.order_date IS NOT NULL
+    ON CONFLICT(period_start) DO UPDATE SET
+        total_items_sold = total_items_sold + excluded.total_items_sold;
+    INSERT INTO sales_weekly (period_start, total_items_sold)
+    SELECT date(o.order_date, 'weekday 0', '-6 days'), NEW.quantity
+    FROM orders o WHERE o.id = NEW.order_id AND o.order_date IS NOT NULL
+    ON CONFLICT(period_start) DO UPDATE SET
+        total_items_sold = total_items_sold + excluded.total_items_sold;
+    INSERT INTO sales_monthly (period_start, total_items_sold)
+    SELECT date(o.order_date, 'start of month'), NEW.quantity
+    FROM orders o WHERE o.id = NEW.order_id AND o.order_date IS NOT NULL
+    ON CONFLICT(period_start) DO UPDATE SET
+        total_items_sold = total_items_sold + excluded.total_items_sold;
+END;
+
+CREATE TRIGGER trg_order_items_delete_rollups AFTER DELETE ON order_items
+BEGIN
+    UPDATE sales_daily SET total_items_sold = total_items_sold - OLD.quantity
+    WHERE period_start = (SELECT date(o.order_date) FROM orders o WHERE o.id = OLD.order_id);
+    UPDATE sales_weekly SET total_items_sold = total_items_sold - OLD.quantity
+    WHERE period_start = (SELECT date(o.order_date, 'weekday 0', '-6 days') FROM orders o WHERE o.id = OLD.order_id);
+    UPDATE sales_monthly SET total_items_sold = total_items_sold - OLD.quantity
+    WHERE period_start = (SELECT date(o.order_date, 'start of month') FROM orders o WHERE o.id = OLD.order_id);
+END;
+
+INSERT INTO sales_daily (period_start, total_orders, total_revenue)
+SELECT date(order_date), COUNT(*), SUM(total_amount)
+FROM orders
+WHERE order_date IS NOT NULL
+GROUP BY 1;
+INSERT INTO sales_daily (period_start, total_items_sold)
+SELECT date(o.order_date), SUM(oi.quantity)
+FROM order_items oi
+JOIN orders o ON oi.order_id = o.id
+WHERE o.order_date IS NOT NULL
+GROUP BY 1
+ON CONFLICT(period_start) DO UPDATE SET total_items_sold = excluded.total_items_sold;
+INSERT INTO sales_weekly (period_start, total_orders, total_revenue)
+SELECT date(order_date, 'weekday 0', '-6 days'), COUNT(*), SUM(total_amount)
+FROM orders
+WHERE order_date IS NOT NULL
+GROUP BY 1;
+INSERT INTO sales_weekly (period_start, total_items_sold)
+SELECT date(o.order_date, 'weekday 0', '-6 days'), SUM(oi.quantity)
+FROM order_items oi
+JOIN orders o ON oi.order_id = o.id
+WHERE o.order_date IS NOT NULL
+GROUP BY 1
+ON CONFLICT(period_start) DO UPDATE SET total_items_sold = excluded.total_items_sold;
+INSERT INTO sales_monthly (period_start, total_orders, total_revenue)
+SELECT date(order_date, 'start of month'), COUNT(*), SUM(total_amount)
+FROM orders
+WHERE order_date IS NOT NULL
+GROUP BY 1;
+INSERT INTO sales_monthly (period_start, total_items_sold)
+SELECT date(o.order_date, 'start of month'), SUM(oi.quantity)
+FROM order_items oi
+JOIN orders o ON oi.order_id = o.id
+WHERE o.order_date IS NOT NULL
+GROUP BY 1
+ON CONFLICT(period_start) DO UPDATE SET total_items_sold = excluded.total_items_sold;
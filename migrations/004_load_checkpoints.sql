@@ -0,0 +1,41 @@
+-- Schema version 4: per-file progress of incremental CSV loads, and rollups
+-- that count order items inserted before their order
+
+CREATE TABLE load_checkpoints (
+    file_path TEXT PRIMARY KEY,
+    header TEXT,
+    byte_offset INTEGER NOT NULL DEFAULT 0,
+    file_size INTEGER,
+    mtime_ns INTEGER,
+    high_water_id INTEGER,
+    rows_loaded INTEGER NOT NULL DEFAULT 0,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+DROP TRIGGER trg_orders_insert_rollups;
+
+CREATE TRIGGER trg_orders_insert_rollups AFTER INSERT ON orders
+WHEN NEW.order_date IS NOT NULL
+BEGIN
+    INSERT INTO sales_daily (period_start, total_orders, total_revenue, total_items_sold)
+    VALUES (date(NEW.order_date), 1, NEW.total_amount,
+            (SELECT COALESCE(SUM(quantity), 0) FROM order_items WHERE order_id = NEW.id))
+    ON CONFLICT(period_start) DO UPDATE SET
+        total_orders = total_orders + 1,
+        total_revenue = total_revenue + excluded.total_revenue,
+        total_items_sold = total_items_sold + excluded.total_items_sold;
+    INSERT INTO sales_weekly (period_start, total_orders, total_revenue, total_items_sold)
+    VALUES (date(NEW.order_date, 'weekday 0', '-6 days'), 1, NEW.total_amount,
+            (SELECT COALESCE(SUM(quantity), 0) FROM order_items WHERE order_id = NEW.id))
+    ON CONFLICT(period_start) DO UPDATE SET
+        total_orders = total_orders + 1,
+        total_revenue = total_revenue + excluded.total_revenue,
+        total_items_sold = total_items_sold + excluded.total_items_sold;
+    INSERT INTO sales_monthly (period_start, total_orders, total_revenue, total_items_sold)
+    VALUES (date(NEW.order_date, 'start of month'), 1, NEW.total_amount,
+            (SELECT COALESCE(SUM(quantity), 0) FROM order_items WHERE order_id = NEW.id))
+    ON CONFLICT(period_start) DO UPDATE SET
+        total_orders = total_orders + 1,
+        total_revenue = total_revenue + excluded.total_revenue,
+        total_items_sold = total_items_sold + excluded.total_items_sold;
+END;
@@ -0,0 +1,8 @@
+-- Schema version 5: persisted approximate-analytics sketches
+
+CREATE TABLE sketch_state (
+    name TEXT PRIMARY KEY,
+    state BLOB NOT NULL,
+    watermark INTEGER NOT NULL DEFAULT 0,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,38 @@
+-- Schema version 6: keep the product_sales triggers' distinct-order checks on
+-- idx_order_items_order. The unary + on product_id stops the planner from
+-- picking idx_order_items_product; an order has few lines while a popular
+-- product can have millions.
+
+DROP TRIGGER trg_order_items_insert_product_sales;
+DROP TRIGGER trg_order_items_delete_product_sales;
+
+CREATE TRIGGER trg_order_items_insert_product_sales AFTER INSERT ON order_items
+BEGIN
+    INSERT INTO product_sales (product_id, total_quantity_sold, total_revenue,
+                               unit_price_sum, line_count, number_of_orders)
+    VALUES (
+        NEW.product_id, NEW.quantity, NEW.total_price, NEW.unit_price, 1,
+        NOT EXISTS (SELECT 1 FROM order_items
+                    WHERE order_id = NEW.order_id AND +product_id = NEW.product_id AND id <> NEW.id)
+    )
+    ON CONFLICT(product_id) DO UPDATE SET
+        total_quantity_sold = total_quantity_sold + excluded.total_quantity_sold,
+        total_revenue = total_revenue + excluded.total_revenue,
+        unit_price_sum = unit_price_sum + excluded.unit_price_sum,
+        line_count = line_count + 1,
+        number_of_orders = number_of_orders + excluded.number_of_orders;
+END;
+
+CREATE TRIGGER trg_order_items_delete_product_sales AFTER DELETE ON order_items
+BEGIN
+    UPDATE product_sales SET
+        total_quantity_sold = total_quantity_sold - OLD.quantity,
+        total_revenue = total_revenue - OLD.total_price,
+        unit_price_sum = unit_price_sum - OLD.unit_price,
+        line_count = line_count - 1,
+        number_of_orders = number_of_orders -
+            NOT EXISTS (SELECT 1 FROM order_items
+                        WHERE order_id = OLD.order_id AND +product_id = OLD.product_id)
+    WHERE product_id = OLD.product_id;
+    DELETE FROM product_sales WHERE product_id = OLD.product_id AND line_count <= 0;
+END;
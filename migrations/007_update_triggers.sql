@@ -0,0 +1,138 @@
+-- Schema version 7: keep product_sales and the rollups current when orders
+-- and order lines are updated, not only inserted or deleted
+
+CREATE TRIGGER trg_order_items_update_product_sales
+AFTER UPDATE OF order_id, product_id, quantity, unit_price, total_price ON order_items
+BEGIN
+    -- Take the old line out as the delete trigger does, but without counting
+    -- the updated row itself, which may still match the old order and product
+    UPDATE product_sales SET
+        total_quantity_sold = total_quantity_sold - OLD.quantity,
+        total_revenue = total_revenue - OLD.total_price,
+        unit_price_sum = unit_price_sum - OLD.unit_price,
+        line_count = line_count - 1,
+        number_of_orders = number_of_orders -
+            NOT EXISTS (SELECT 1 FROM order_items
+                        WHERE order_id = OLD.order_id AND +product_id = OLD.product_id AND id <> OLD.id)
+    WHERE product_id = OLD.product_id;
+    DELETE FROM product_sales WHERE product_id = OLD.product_id AND line_count <= 0;
+    INSERT INTO product_sales (product_id, total_quantity_sold, total_revenue,
+                               unit_price_sum, line_count, number_of_orders)
+    VALUES (
+        NEW.product_id, NEW.quantity, NEW.total_price, NEW.unit_price, 1,
+        NOT EXISTS (SELECT 1 FROM order_items
+                    WHERE order_id = NEW.order_id AND +product_id = NEW.product_id AND id <> NEW.id)
+    )
+    ON CONFLICT(product_id) DO UPDATE SET
+        total_quantity_sold = total_quantity_sold + excluded.total_quantity_sold,
+        total_revenue = total_revenue + excluded.total_revenue,
+        unit_price_sum = unit_price_sum + excluded.unit_price_sum,
+        line_count = line_count + 1,
+        number_of_orders = number_of_orders + excluded.number_of_orders;
+END;
+
+-- An order's date or total changing moves it, and its items, between periods.
+-- A period left without orders is removed, as a rebuild would not have it.
+CREATE TRIGGER trg_orders_update_rollups AFTER UPDATE OF order_date, total_amount ON orders
+BEGIN
+    UPDATE sales_daily SET
+        total_orders = total_orders - 1,
+        total_revenue = total_revenue - OLD.total_amount,
+        total_items_sold = total_items_sold -
+            (SELECT COALESCE(SUM(quantity), 0) FROM order_items WHERE order_id = OLD.id)
+    WHERE period_start = date(OLD.order_date);
+    DELETE FROM sales_daily WHERE period_start = date(OLD.order_date) AND total_orders <= 0;
+    INSERT INTO sales_daily (period_start, total_orders, total_revenue, total_items_sold)
+    SELECT date(NEW.order_date), 1, NEW.total_amount,
+           (SELECT COALESCE(SUM(quantity), 0) FROM order_items WHERE order_id = NEW.id)
+    WHERE NEW.order_date IS NOT NULL
+    ON CONFLICT(period_start) DO UPDATE SET
+        total_orders = total_orders + 1,
+        total_revenue = total_revenue + excluded.total_revenue,
+        total_items_sold = total_items_sold + excluded.total_items_sold;
+    UPDATE sales_weekly SET
+        total_orders = total_orders - 1,
+        total_revenue = total_revenue - OLD.total_amount,
+        total_items_sold = total_items_sold -
+            (SELECT COALESCE(SUM(quantity), 0) FROM order_items WHERE order_id = OLD.id)
+    WHERE period_start = date(OLD.order_date, 'weekday 0', '-6 days');
+    DELETE FROM sales_weekly WHERE period_start = date(OLD.order_date, 'weekday 0', '-6 days') AND total_orders <= 0;
+    INSERT INTO sales_weekly (period_start, total_orders, total_revenue, total_items_sold)
+    SELECT date(NEW.order_date, 'weekday 0', '-6 days'), 1, NEW.total_amount,
+           (SELECT COALESCE(SUM(quantity), 0) FROM order_items WHERE order_id = NEW.id)
+    WHERE NEW.order_date IS NOT NULL
+    ON CONFLICT(period_start) DO UPDATE SET
+        total_orders = total_orders + 1,
+        total_revenue = total_revenue + excluded.total_revenue,
+        total_items_sold = total_items_sold + excluded.total_items_sold;
+    UPDATE sales_monthly SET
+        total_orders = total_orders - 1,
+        total_revenue = total_revenue - OLD.total_amount,
+        total_items_sold = total_items_sold -
+            (SELECT COALESCE(SUM(quantity), 0) FROM order_items WHERE order_id = OLD.id)
+    WHERE period_start = date(OLD.order_date, 'start of month');
+    DELETE FROM sales_monthly WHERE period_start = date(OLD.order_date, 'start of month') AND total_orders <= 0;
+    INSERT INTO sales_monthly (period_start, total_orders, total_revenue, total_items_sold)
+    SELECT date(NEW.order_date, 'start of month'), 1, NEW.total_amount,
+           (SELECT COALESCE(SUM(quantity), 0) FROM order_items WHERE order_id = NEW.id)
+    WHERE NEW.order_date IS NOT NULL
+    ON CONFLICT(period_start) DO UPDATE SET
+        total_orders = total_orders + 1,
+        total_revenue = total_revenue + excluded.total_revenue,
+        total_items_sold = total_items_sold + excluded.total_items_sold;
+END;
+
+-- Deleting an order before its items takes the items out with it; their own
+-- delete trigger then finds no order and changes nothing
+DROP TRIGGER trg_orders_delete_rollups;
+
+CREATE TRIGGER trg_orders_delete_rollups AFTER DELETE ON orders
+WHEN OLD.order_date IS NOT NULL
+BEGIN
+    UPDATE sales_daily SET
+        total_orders = total_orders - 1,
+        total_revenue = total_revenue - OLD.total_amount,
+        total_items_sold = total_items_sold -
+            (SELECT COALESCE(SUM(quantity), 0) FROM order_items WHERE order_id = OLD.id)
+    WHERE period_start = date(OLD.order_date);
+    DELETE FROM sales_daily WHERE period_start = date(OLD.order_date) AND total_orders <= 0;
+    UPDATE sales_weekly SET
+        total_orders = total_orders - 1,
+        total_revenue = total_revenue - OLD.total_amount,
+        total_items_sold = total_items_sold -
+            (SELECT COALESCE(SUM(quantity), 0) FROM order_items WHERE order_id = OLD.id)
+    WHERE period_start = date(OLD.order_date, 'weekday 0', '-6 days');
+    DELETE FROM sales_weekly WHERE period_start = date(OLD.order_date, 'weekday 0', '-6 days') AND total_orders <= 0;
+    UPDATE sales_monthly SET
+        total_orders = total_orders - 1,
+        total_revenue = total_revenue - OLD.total_amount,
+        total_items_sold = total_items_sold -
+            (SELECT COALESCE(SUM(quantity), 0) FROM order_items WHERE order_id = OLD.id)
+    WHERE period_start = date(OLD.order_date, 'start of month');
+    DELETE FROM sales_monthly WHERE period_start = date(OLD.order_date, 'start of month') AND total_orders <= 0;
+END;
+
+CREATE TRIGGER trg_order_items_update_rollups AFTER UPDATE OF order_id, quantity ON order_items
+BEGIN
+    UPDATE sales_daily SET total_items_sold = total_items_sold - OLD.quantity
+    WHERE period_start = (SELECT date(o.order_date) FROM orders o WHERE o.id = OLD.order_id);
+    INSERT INTO sales_daily (period_start, total_items_sold)
+    SELECT date(o.order_date), NEW.quantity
+    FROM orders o WHERE o.id = NEW.order_id AND o.order_date IS NOT NULL
+    ON CONFLICT(period_start) DO UPDATE SET
+        total_items_sold = total_items_sold + excluded.total_items_sold;
+    UPDATE sales_weekly SET total_items_sold = total_items_sold - OLD.quantity
+    WHERE period_start = (SELECT date(o.order_date, 'weekday 0', '-6 days') FROM orders o WHERE o.id = OLD.order_id);
+    INSERT INTO sales_weekly (period_start, total_items_sold)
+    SELECT date(o.order_date, 'weekday 0', '-6 days'), NEW.quantity
+    FROM orders o WHERE o.id = NEW.order_id AND o.order_date IS NOT NULL
+    ON CONFLICT(period_start) DO UPDATE SET
+        total_items_sold = total_items_sold + excluded.total_items_sold;
+    UPDATE sales_monthly SET total_items_sold = total_items_sold - OLD.quantity
+    WHERE period_start = (SELECT date(o.order_date, 'start of month') FROM orders o WHERE o.id = OLD.order_id);
+    INSERT INTO sales_monthly (period_start, total_items_sold)
+    SELECT date(o.order_date, 'start of month'), NEW.quantity
+    FROM orders o WHERE o.id = NEW.order_id AND o.order_date IS NOT NULL
+    ON CONFLICT(period_start) DO UPDATE SET
+        total_items_sold = total_items_sold + excluded.total_items_sold;
+END;
@@ -0,0 +1,39 @@
+-- Schema version 8: per-table change counters, so readers that cache the
+-- catalog can tell cheaply whether it changed
+
+CREATE TABLE change_counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL DEFAULT 0
+);
+INSERT INTO change_counters (name) VALUES ('categories'), ('products_inserted'), ('products_changed');
+
+CREATE TRIGGER trg_categories_insert_counter AFTER INSERT ON categories
+BEGIN
+    UPDATE change_counters SET value = value + 1 WHERE name = 'categories';
+END;
+
+CREATE TRIGGER trg_categories_update_counter AFTER UPDATE ON categories
+BEGIN
+    UPDATE change_counters SET value = value + 1 WHERE name = 'categories';
+END;
+
+CREATE TRIGGER trg_categories_delete_counter AFTER DELETE ON categories
+BEGIN
+    UPDATE change_counters SET value = value + 1 WHERE name = 'categories';
+END;
+
+CREATE TRIGGER trg_products_insert_counter AFTER INSERT ON products
+BEGIN
+    UPDATE change_counters SET value = value + 1 WHERE name = 'products_inserted';
+END;
+
+-- Stock and price updates are frequent and do not change the catalog's shape
+CREATE TRIGGER trg_products_update_counter AFTER UPDATE OF id, name, sku, category_id ON products
+BEGIN
+    UPDATE change_counters SET value = value + 1 WHERE name = 'products_changed';
+END;
+
+CREATE TRIGGER trg_products_delete_counter AFTER DELETE ON products
+BEGIN
+    UPDATE change_counters SET value = value + 1 WHERE name = 'products_changed';
+END;
@@ -1,16 +1,16 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, List
+from typing import NamedTuple, Optional
 from decimal import Decimal
 
-@dataclass
+@dataclass(slots=True)
 class Category:
     id: Optional[int] = None
     name: str = ""
     description: Optional[str] = None
     created_at: Optional[datetime] = None
 
-@dataclass
+@dataclass(slots=True)
 class Product:
     id: Optional[int] = None
     name: str = ""
@@ -24,7 +24,7 @@ class Product:
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
-@dataclass
+@dataclass(slots=True)
 class Customer:
     id: Optional[int] = None
     email: str = ""
@@ -33,7 +33,7 @@ class Customer:
     phone: Optional[str] = None
     created_at: Optional[datetime] = None
 
-@dataclass
+@dataclass(slots=True)
 class Order:
     id: Optional[int] = None
     customer_id: int = 0
@@ -43,7 +43,7 @@ class Order:
     shipping_cost: Decimal = Decimal('0.00')
     tax_amount: Decimal = Decimal('0.00')
 
-@dataclass
+@dataclass(slots=True)
 class OrderItem:
     id: Optional[int] = None
     order_id: int = 0
@@ -52,7 +52,7 @@ class OrderItem:
     unit_price: Decimal = Decimal('0.00')
     total_price: Decimal = Decimal('0.00')
 
-@dataclass
+@dataclass(slots=True)
 class SalesData:
     product_name: str = ""
     sku: str = ""
@@ -60,4 +60,113 @@ class SalesData:
     total_quantity_sold: int = 0
     total_revenue: Decimal = Decimal('0.00')
     avg_selling_price: Decimal = Decimal('0.00')
-    number_of_orders: int = 0
\ No newline at end of file
+    number_of_orders: int = 0
+
+# Compact, immutable row types for bulk reads. They are plain tuples with money
+# held as integer cents; properties expose the same attribute names and types
+# as the dataclasses above.
+
+def from_cents(cents: int) -> Decimal:
+    return Decimal(cents).scaleb(-2)
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+class ProductRow(NamedTuple):
+    id: Optional[int] = None
+    name: str = ""
+    sku: str = ""
+    category_id: Optional[int] = None
+    price_cents: int = 0
+    cost_cents: Optional[int] = None
+    description: Optional[str] = None
+    stock_quantity: int = 0
+    is_active: bool = True
+    created_at_text: Optional[str] = None
+    updated_at_text: Optional[str] = None
+
+    @property
+    def price(self) -> Decimal:
+        return from_cents(self.price_cents)
+
+    @property
+    def cost(self) -> Optional[Decimal]:
+        return from_cents(self.cost_cents) if self.cost_cents is not None else None
+
+    @property
+    def created_at(self) -> Optional[datetime]:
+        return _parse_datetime(self.created_at_text)
+
+    @property
+    def updated_at(self) -> Optional[datetime]:
+        return _parse_datetime(self.updated_at_text)
+
+class CustomerRow(NamedTuple):
+    id: Optional[int] = None
+    email: str = ""
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    phone: Optional[str] = None
+    created_at_text: Optional[str] = None
+
+    @property
+    def created_at(self) -> Optional[datetime]:
+        return _parse_datetime(self.created_at_text)
+
+class OrderRow(NamedTuple):
+    id: Optional[int] = None
+    customer_id: int = 0
+    order_date_text: Optional[str] = None
+    status: str = "pending"
+    total_amount_cents: int = 0
+    shipping_cost_cents: int = 0
+    tax_amount_cents: int = 0
+
+    @property
+    def order_date(self) -> Optional[datetime]:
+        return _parse_datetime(self.order_date_text)
+
+    @property
+    def total_amount(self) -> Decimal:
+        return from_cents(self.total_amount_cents)
+
+    @property
+    def shipping_cost(self) -> Decimal:
+        return from_cents(self.shipping_cost_cents)
+
+    @property
+    def tax_amount(self) -> Decimal:
+        return from_cents(self.tax_amount_cents)
+
+class OrderItemRow(NamedTuple):
+    id: Optional[int] = None
+    order_id: int = 0
+    product_id: int = 0
+    quantity: int = 0
+    unit_price_cents: int = 0
+    total_price_cents: int = 0
+
+    @property
+    def unit_price(self) -> Decimal:
+        return from_cents(self.unit_price_cents)
+
+    @property
+    def total_price(self) -> Decimal:
+        return from_cents(self.total_price_cents)
+
+class SalesRow(NamedTuple):
+    product_name: str = ""
+    sku: str = ""
+    category: str = ""
+    total_quantity_sold: int = 0
+    total_revenue_cents: int = 0
+    avg_selling_price_cents: int = 0
+    number_of_orders: int = 0
+
+    @property
+    def total_revenue(self) -> Decimal:
+        return from_cents(self.total_revenue_cents)
+
+    @property
+    def avg_selling_price(self) -> Decimal:
+        return from_cents(self.avg_selling_price_cents)
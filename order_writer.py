@@ -0,0 +1,133 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional, Tuple
+from database import DatabaseManager
+from models import Order, OrderItem
+
+logger = logging.getLogger("order_writer")
+
+class BatchedOrderWriter:
+    """Buffer orders from any number of threads and commit them in batches.
+
+    A writer thread collects submitted orders until ``max_batch`` are waiting
+    or the oldest has waited ``max_delay`` seconds, then writes them all with
+    DatabaseManager.create_orders in one transaction. ``submit`` returns a
+    Future that resolves to the order id once that transaction has
+    committed, or raises its error. At most ``max_pending`` orders are
+    buffered; beyond that ``submit`` blocks, so producers slow down to the
+    rate the database sustains.
+
+    A committed batch is as durable as the connection's ``synchronous``
+    pragma makes it; with FULL there is one fsync per batch, not per order.
+    """
+
+    def __init__(self, db: DatabaseManager, max_batch: int = 500, max_delay: float = 0.05,
+                 max_pending: int = 10000):
+        self.db = db
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.batches = 0
+        self.orders_written = 0
+        # Entries are (order, items, future), or (None, None, future) for a flush marker
+        self._queue: "queue.Queue[Tuple[Optional[Order], Optional[List[OrderItem]], Future]]" = \
+            queue.Queue(maxsize=max_pending)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="order-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, order: Order, items: List[OrderItem], timeout: Optional[float] = None) -> Future:
+        """Queue one order; raises queue.Full if the buffer stays full for ``timeout`` seconds."""
+        if self._closed:
+            raise RuntimeError("BatchedOrderWriter is closed")
+        future: Future = Future()
+        self._queue.put((order, items, future), timeout=timeout)
+        return future
+
+    def create_order(self, order: Order, items: List[OrderItem]) -> int:
+        """Drop-in for DatabaseManager.create_order; blocks until the batch commits."""
+        return self.submit(order, items).result()
+
+    def flush(self, timeout: Optional[float] = None):
+        """Return once every order submitted before this call is committed."""
+        marker: Future = Future()
+        self._queue.put((None, None, marker), timeout=timeout)
+        marker.result(timeout)
+
+    def close(self):
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._queue.put((None, None, None))
+        self._thread.join()
+
+    def __enter__(self) -> "BatchedOrderWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _run(self):
+        while True:
+            batch = []
+            markers = []
+            try:
+                entry = self._queue.get()
+                deadline = time.monotonic() + self.max_delay
+                while True:
+                    order, items, future = entry
+                    if future is None:
+                        self._write(batch)
+                        self._release(markers)
+                        return
+                    if order is None:
+                        # Flush marker: write what is buffered now rather than waiting
+                        markers.append(future)
+                        break
+                    # A future cancelled while queued is dropped; a running one can no longer be cancelled
+                    if future.set_running_or_notify_cancel():
+                        batch.append((order, items, future))
+                    if len(batch) >= self.max_batch:
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        entry = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                self._write(batch)
+            except Exception as e:
+                # Keep the writer alive: fail this batch and carry on with the next
+                logger.exception("Order writer batch failed")
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            self._release(markers)
+
+    def _release(self, markers):
+        for marker in markers:
+            if not marker.done():
+                marker.set_result(None)
+
+    def _write(self, batch):
+        if not batch:
+            return
+        try:
+            order_ids = self.db.create_orders([(order, items) for order, items, _ in batch])
+        except Exception as e:
+            if len(batch) > 1:
+                # One bad order should not fail the others: write each on its own
+                for entry in batch:
+                    self._write([entry])
+                return
+            logger.warning("Writing order failed: %s", e)
+            batch[0][2].set_exception(e)
+            return
+        self.batches += 1
+        self.orders_written += len(batch)
+        for (_, _, future), order_id in zip(batch, order_ids):
+            future.set_result(order_id)
@@ -0,0 +1,118 @@
+import csv
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from queue import Queue
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from csv_loader import BULK_TABLES, CSVLoader
+
+CONVERTERS = {table: convert for table, _, _, convert in BULK_TABLES}
+
+def parse_chunk(table: str, header: Sequence[str], rows: List[List[str]], first_line: int) -> List[tuple]:
+    """Validate and convert raw CSV rows for ``table``. Runs in a worker process."""
+    convert = CONVERTERS[table]
+    parsed = []
+    for offset, values in enumerate(rows):
+        try:
+            parsed.append(convert(dict(zip(header, values))))
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"{table}: invalid row at line {first_line + offset}: {e}") from e
+    return parsed
+
+class ParallelCSVLoader(CSVLoader):
+    """Parse CSV files in a process pool and write them through a single connection.
+
+    Files are read in chunks of ``chunk_size`` rows and parsed by worker
+    processes. Parsed chunks reach the writer thread in submission order
+    through a bounded queue, so foreign-key order (categories before products,
+    orders before items) holds while later files are already being parsed.
+    """
+
+    def __init__(self, db_path: str = "ecommerce.db", data_dir: str = "data",
+                 batch_size: int = 10000, chunk_size: int = 50000,
+                 workers: Optional[int] = None, max_pending: Optional[int] = None):
+        super().__init__(db_path, data_dir, batch_size)
+        self.chunk_size = chunk_size
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 2 * self.workers
+
+    def read_chunks(self, file_name: str) -> Iterator[Tuple[List[str], List[List[str]], int]]:
+        csv_path = os.path.join(self.data_dir, file_name)
+        with open(csv_path, 'r', encoding='utf-8', newline='') as file:
+            reader = csv.reader(file)
+            header = next(reader, None)
+            if header is None:
+                return
+            line = 2
+            while True:
+                rows = list(islice(reader, self.chunk_size))
+                if not rows:
+                    break
+                yield header, rows, line
+                line += len(rows)
+
+    def _write_batches(self, queue: Queue, counts: Dict[str, int], errors: List[BaseException]):
+        while True:
+            item = queue.get()
+            if item is None:
+                break
+            if errors:
+                # Keep draining so the producer never blocks on a dead writer
+                continue
+            table, columns, rows = item
+            try:
+                counts[table] += self.db.bulk_insert(table, columns, rows, self.batch_size)
+            except BaseException as e:
+                errors.append(e)
+
+    def parallel_load_all_data(self) -> Dict[str, int]:
+        print(f"Parallel loading data from CSV files ({self.workers} workers)...")
+        start = time.perf_counter()
+
+        counts = {table: 0 for table, _, _, _ in BULK_TABLES}
+        errors: List[BaseException] = []
+        queue: Queue = Queue(maxsize=self.max_pending)
+        writer = threading.Thread(target=self._write_batches, args=(queue, counts, errors),
+                                  name="csv-writer", daemon=True)
+        writer.start()
+
+        pending: "deque[Tuple[str, Sequence[str], Future]]" = deque()
+
+        def hand_off():
+            table, columns, future = pending.popleft()
+            queue.put((table, columns, future.result()))
+
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                for table, file_name, columns, _ in BULK_TABLES:
+                    for header, rows, line in self.read_chunks(file_name):
+                        pending.append((table, columns, pool.submit(parse_chunk, table, header, rows, line)))
+                        if len(pending) >= self.max_pending:
+                            hand_off()
+                        if errors:
+                            raise errors[0]
+                while pending:
+                    hand_off()
+        finally:
+            for _, _, future in pending:
+                future.cancel()
+            queue.put(None)
+            writer.join()
+
+        if errors:
+            raise errors[0]
+
+        elapsed = time.perf_counter() - start
+        total = sum(counts.values())
+        rate = total / elapsed if elapsed > 0 else 0.0
+        for table, count in counts.items():
+            print(f"   Loaded {count} {table}")
+        print(f"Parallel load completed: {total} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec)")
+        return counts
+
+if __name__ == "__main__":
+    loader = ParallelCSVLoader("ecommerce_csv.db")
+    loader.parallel_load_all_data()
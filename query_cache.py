@@ -0,0 +1,86 @@
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from instrumentation import instrumentation
+
+class QueryCache:
+    """Thread-safe LRU cache with TTL whose entries are tagged with a data version.
+
+    An entry is only returned while the database reports the same data version
+    it was computed under, so any write invalidates it. Cached values are
+    shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 128, ttl: Optional[float] = 60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Hashable, float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version: Hashable) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_version, stored_at, value = entry
+                fresh = self.ttl is None or time.monotonic() - stored_at < self.ttl
+                if entry_version == version and fresh:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    instrumentation.count("cache_hits")
+                    return True, value
+                del self._entries[key]
+            self.misses += 1
+            instrumentation.count("cache_misses")
+            return False, None
+
+    def put(self, key: Hashable, version: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = (version, time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+            }
+
+def cached(method: Callable) -> Callable:
+    """Cache a SalesAnalyzer method in ``self.cache``, keyed by name and bound arguments."""
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = self.cache
+        if cache is None:
+            return method(self, *args, **kwargs)
+
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (method.__name__,) + tuple(bound.arguments.items())[1:]
+        version = self.db.data_version
+
+        hit, value = cache.get(key, version)
+        if hit:
+            return value
+        value = method(self, *args, **kwargs)
+        cache.put(key, version, value)
+        return value
+
+    return wrapper
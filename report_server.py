@@ -0,0 +1,202 @@
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from sales_analyzer import SalesAnalyzer
+
+logger = logging.getLogger("report_server")
+
+# (name, call) for each section of the standard sales report
+REPORT_SECTIONS: List[Tuple[str, Callable[[SalesAnalyzer], Any]]] = [
+    ("top_products", lambda analyzer: analyzer.get_top_selling_products(10)),
+    ("revenue_by_category", lambda analyzer: analyzer.get_revenue_by_category()),
+    ("daily_sales", lambda analyzer: analyzer.get_daily_sales_report(7)),
+    ("weekly_trend", lambda analyzer: analyzer.get_sales_trend(granularity="week")),
+]
+
+class ReportSnapshot:
+    """One computation of every section, with each section pre-encoded as JSON."""
+
+    def __init__(self, data_version: tuple, computed_at: float, seconds: Dict[str, float],
+                 sections: Dict[str, bytes], errors: Dict[str, str]):
+        self.data_version = data_version
+        self.computed_at = computed_at
+        self.seconds = seconds
+        self.sections = sections
+        self.errors = errors
+
+class ReportService:
+    """Recompute the report sections in a background thread and hand out the latest results.
+
+    The worker polls the database's data_version every ``poll`` seconds and
+    recomputes once it changes, at most every ``min_interval`` seconds so a
+    burst of writes costs one computation, and at least every ``interval``
+    seconds so date-relative sections move on. Readers never touch the
+    database; they all share the last snapshot.
+    """
+
+    def __init__(self, analyzer: SalesAnalyzer, interval: float = 300.0, poll: float = 1.0,
+                 min_interval: float = 5.0):
+        self.analyzer = analyzer
+        self.interval = interval
+        self.poll = poll
+        self.min_interval = min_interval
+        self.snapshot: Optional[ReportSnapshot] = None
+        self.latest_version: Optional[tuple] = None
+        self.computations = 0
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def compute(self) -> ReportSnapshot:
+        version = self.analyzer.db.data_version
+        seconds: Dict[str, float] = {}
+        sections: Dict[str, bytes] = {}
+        errors: Dict[str, str] = {}
+        previous = self.snapshot
+        for name, call in REPORT_SECTIONS:
+            started = time.perf_counter()
+            try:
+                sections[name] = json.dumps(call(self.analyzer), default=str).encode("utf-8")
+            except Exception as e:
+                logger.exception("Computing report section %s failed", name)
+                errors[name] = str(e)
+                if previous is not None and name in previous.sections:
+                    sections[name] = previous.sections[name]
+            seconds[name] = time.perf_counter() - started
+
+        snapshot = ReportSnapshot(version, time.time(), seconds, sections, errors)
+        self.snapshot = snapshot  # readers pick up the new snapshot in one assignment
+        self.latest_version = version
+        self.computations += 1
+        self._ready.set()
+        return snapshot
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.latest_version = self.analyzer.db.data_version
+                snapshot = self.snapshot
+                age = time.time() - snapshot.computed_at if snapshot is not None else None
+                if (age is None or age >= self.interval
+                        or (self.latest_version != snapshot.data_version and age >= self.min_interval)):
+                    self.compute()
+            except Exception:
+                logger.exception("Report refresh failed")
+            self._stop.wait(self.poll)
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="report-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def status(self) -> Dict[str, Any]:
+        snapshot = self.snapshot
+        if snapshot is None:
+            return {"ready": False, "computations": self.computations}
+        return {
+            "ready": True,
+            "computed_at": datetime.fromtimestamp(snapshot.computed_at, timezone.utc).isoformat(),
+            "age_seconds": round(time.time() - snapshot.computed_at, 3),
+            "stale": self.latest_version != snapshot.data_version,
+            "computations": self.computations,
+            "compute_seconds": {name: round(s, 6) for name, s in snapshot.seconds.items()},
+            "errors": snapshot.errors,
+        }
+
+    def section_body(self, name: str) -> Optional[bytes]:
+        """``{"section", "status", "data"}`` as JSON, or None for an unknown section."""
+        snapshot = self.snapshot
+        if snapshot is None or name not in snapshot.sections:
+            return None
+        status = json.dumps(self.status()).encode("utf-8")
+        return (b'{"section": ' + json.dumps(name).encode("utf-8") + b', "status": ' + status
+                + b', "data": ' + snapshot.sections[name] + b'}')
+
+    def report_body(self) -> Optional[bytes]:
+        snapshot = self.snapshot
+        if snapshot is None:
+            return None
+        sections = b", ".join(json.dumps(name).encode("utf-8") + b": " + body
+                              for name, body in snapshot.sections.items())
+        status = json.dumps(self.status()).encode("utf-8")
+        return b'{"status": ' + status + b', "sections": {' + sections + b'}}'
+
+class ReportRequestHandler(BaseHTTPRequestHandler):
+    """GET /reports, /reports/<section> and /health from the server's ReportService."""
+
+    server_version = "SalesReports/1.0"
+
+    def do_GET(self):
+        service: ReportService = self.server.service
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path == "/health":
+            self.send_json(200, json.dumps(service.status()).encode("utf-8"))
+        elif path == "/reports":
+            body = service.report_body()
+            if body is not None:
+                self.send_json(200, body)
+            else:
+                self.send_not_ready()
+        elif path.startswith("/reports/"):
+            body = service.section_body(path[len("/reports/"):])
+            if body is not None:
+                self.send_json(200, body)
+            elif service.snapshot is None:
+                self.send_not_ready()
+            else:
+                self.send_json(404, json.dumps({"error": "unknown section",
+                                                "sections": [name for name, _ in REPORT_SECTIONS]}).encode("utf-8"))
+        else:
+            self.send_json(404, b'{"error": "not found"}')
+
+    def send_not_ready(self):
+        self.send_json(503, b'{"error": "reports not computed yet"}')
+
+    def send_json(self, code: int, body: bytes):
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+def make_server(service: ReportService, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), ReportRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+def serve(db_path: str = "ecommerce_sample.db", host: str = "127.0.0.1", port: int = 8765,
+          interval: float = 300.0, analyzer: Optional[SalesAnalyzer] = None):
+    """Compute the reports once, then serve them until interrupted."""
+    # The service is the cache, so the analyzer's own result cache is off
+    analyzer = analyzer if analyzer is not None else SalesAnalyzer(db_path, cache_size=0)
+    service = ReportService(analyzer, interval=interval)
+    service.start()
+    service.wait_ready()
+    server = make_server(service, host, port)
+    print(f"Serving sales reports for {db_path} on http://{host}:{server.server_address[1]}/reports "
+          f"(refresh every {interval:.0f}s or after writes)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping report server")
+    finally:
+        server.server_close()
+        service.stop()
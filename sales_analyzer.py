@@ -1,81 +1,104 @@
-from typing import List, Dict, Any
-from decimal import Decimal
-from datetime import datetime, timedelta
-from database import DatabaseManager
+from typing import List, Dict, Any, Iterator, Optional
+from datetime import datetime, timedelta, timezone
+from columnar import group_sum
+from database import DatabaseManager, DateLike
 from models import SalesData
+from query_cache import QueryCache, cached
+
+def _rollup_period(row) -> Dict[str, Any]:
+    orders = row['total_orders']
+    revenue = float(row['total_revenue'])
+    return {
+        "period_start": row['period_start'],
+        "total_orders": orders,
+        "total_revenue": revenue,
+        "avg_order_value": revenue / orders if orders else 0.0,
+        "total_items_sold": row['total_items_sold']
+    }
 
 class SalesAnalyzer:
-    def __init__(self, db_path: str = "ecommerce_sample.db"):
-        self.db = DatabaseManager(db_path)
+    def __init__(self, db_path: str = "ecommerce_sample.db", cache_size: int = 128,
+                 cache_ttl: Optional[float] = 60.0, db: Optional[DatabaseManager] = None):
+        self.db = db if db is not None else DatabaseManager(db_path)
+        # cache_size=0 disables result caching
+        self.cache = QueryCache(cache_size, cache_ttl) if cache_size > 0 else None
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        return self.cache.stats() if self.cache is not None else {}
+    
+    def clear_cache(self):
+        if self.cache is not None:
+            self.cache.clear()
     
     def get_sales_summary(self) -> List[SalesData]:
         return self.db.get_sales_summary()
     
-    def get_top_selling_products(self, limit: int = 10) -> List[Dict[str, Any]]:
-        sales_data = self.get_sales_summary()
-        sorted_products = sorted(sales_data, key=lambda x: x.total_quantity_sold, reverse=True)
+    def iter_sales_summary(self, batch_size: int = 1000) -> Iterator[SalesData]:
+        return self.db.iter_sales_summary(batch_size)
+    
+    @cached
+    def get_top_selling_products(self, limit: int = 10, start_date: Optional[DateLike] = None,
+                                 end_date: Optional[DateLike] = None, category: Optional[str] = None,
+                                 status: Optional[str] = None) -> List[Dict[str, Any]]:
+        rows = self.db.get_top_products(limit, start_date, end_date, category, status)
         
         return [
             {
-                "product_name": product.product_name,
-                "sku": product.sku,
-                "category": product.category,
-                "quantity_sold": product.total_quantity_sold,
-                "revenue": float(product.total_revenue),
-                "avg_price": float(product.avg_selling_price)
+                "product_name": row['product_name'],
+                "sku": row['sku'],
+                "category": row['category'],
+                "quantity_sold": row['total_quantity_sold'],
+                "revenue": float(row['total_revenue']),
+                "avg_price": float(row['avg_selling_price'])
             }
-            for product in sorted_products[:limit]
+            for row in rows
         ]
     
-    def get_revenue_by_category(self) -> Dict[str, float]:
-        sales_data = self.get_sales_summary()
-        category_revenue = {}
-        
-        for product in sales_data:
-            category = product.category
-            revenue = float(product.total_revenue)
-            
-            if category in category_revenue:
-                category_revenue[category] += revenue
-            else:
-                category_revenue[category] = revenue
-        
-        return dict(sorted(category_revenue.items(), key=lambda x: x[1], reverse=True))
+    @cached
+    def get_revenue_by_category(self, start_date: Optional[DateLike] = None,
+                                end_date: Optional[DateLike] = None,
+                                status: Optional[str] = None) -> Dict[str, float]:
+        rows = self.db.get_category_revenue(start_date, end_date, status)
+        return {row['category']: float(row['revenue']) for row in rows}
+    
+    def get_sales_summary_columns(self) -> Dict[str, Any]:
+        return self.db.get_sales_summary_columns()
     
+    @cached
+    def get_category_revenue_cents(self) -> Dict[str, int]:
+        """Revenue per category in integer cents, aggregated over column arrays."""
+        columns = self.get_sales_summary_columns()
+        totals = group_sum(columns['category'], columns['total_revenue_cents'])
+        return dict(sorted(totals.items(), key=lambda x: x[1], reverse=True))
+    
+    @cached
     def get_daily_sales_report(self, days: int = 7) -> List[Dict[str, Any]]:
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-        
-        query = """
-        SELECT 
-            DATE(o.order_date) as sale_date,
-            COUNT(DISTINCT o.id) as total_orders,
-            SUM(o.total_amount) as total_revenue,
-            AVG(o.total_amount) as avg_order_value,
-            SUM(oi.quantity) as total_items_sold
-        FROM orders o
-        JOIN order_items oi ON o.id = oi.order_id
-        WHERE o.order_date >= date('now', '-{} days')
-        GROUP BY DATE(o.order_date)
-        ORDER BY sale_date DESC
-        """.format(days)
-        
-        cursor.execute(query)
-        rows = cursor.fetchall()
-        conn.close()
+        # Same cutoff as SQLite's date('now', '-N days'), which is in UTC
+        start_date = datetime.now(timezone.utc).date() - timedelta(days=days)
+        rows = self.db.get_rollups("day", start_date=start_date, descending=True)
         
         return [
             {
-                "date": row['sale_date'],
-                "total_orders": row['total_orders'],
-                "total_revenue": float(row['total_revenue']),
-                "avg_order_value": float(row['avg_order_value']),
-                "total_items_sold": row['total_items_sold']
+                "date": period["period_start"],
+                "total_orders": period["total_orders"],
+                "total_revenue": period["total_revenue"],
+                "avg_order_value": period["avg_order_value"],
+                "total_items_sold": period["total_items_sold"]
             }
-            for row in rows
+            for period in map(_rollup_period, rows)
         ]
     
-    def print_sales_report(self):
+    @cached
+    def get_sales_trend(self, start_date: Optional[DateLike] = None, end_date: Optional[DateLike] = None,
+                        granularity: str = "day") -> List[Dict[str, Any]]:
+        """Orders, revenue and items per day, week or month, read from the rollup tables.
+
+        Periods are returned oldest first; ``end_date`` is exclusive.
+        """
+        rows = self.db.get_rollups(granularity, start_date, end_date)
+        return [_rollup_period(row) for row in rows]
+    
+    def print_sales_report(self, full_summary: bool = False):
         print("=== E-COMMERCE SALES REPORT ===\n")
         
         # Top selling products
@@ -100,6 +123,13 @@ class SalesAnalyzer:
         daily_sales = self.get_daily_sales_report(7)
         for day in daily_sales:
             print(f"{day['date']}: {day['total_orders']} orders, ${day['total_revenue']:.2f} revenue")
+        
+        if full_summary:
+            # Streamed row by row so the full product list is never held in memory
+            print("\nALL PRODUCTS:")
+            for product in self.iter_sales_summary():
+                print(f"- {product.product_name} ({product.sku}): "
+                      f"{product.total_quantity_sold} sold, ${product.total_revenue:.2f} revenue")
 
 if __name__ == "__main__":
     analyzer = SalesAnalyzer()
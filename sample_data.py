@@ -1,12 +1,17 @@
 from decimal import Decimal
 from datetime import datetime, timedelta
 import random
+from contextlib import nullcontext
 from database import DatabaseManager
 from models import Category, Product, Customer, Order, OrderItem
 
-def generate_sample_data():
+def generate_sample_data(fresh: bool = False):
+    """Fill ecommerce_sample.db; ``fresh`` defers index upkeep for an empty database."""
     db = DatabaseManager("ecommerce_sample.db")
-    
+    with db.fresh_load() if fresh else nullcontext():
+        insert_sample_data(db)
+
+def insert_sample_data(db: DatabaseManager):
     # Categories
     categories = [
         Category(name="Electronics", description="Electronic devices and accessories"),
@@ -36,6 +41,7 @@ def generate_sample_data():
     ]
     
     product_ids = []
+    product_prices = {}
     for name, sku, cat_idx, price, cost, stock in products_data:
         product = Product(
             name=name,
@@ -48,6 +54,7 @@ def generate_sample_data():
         )
         product_id = db.add_product(product)
         product_ids.append(product_id)
+        product_prices[product_id] = price
     
     # Customers
     customers_data = [
@@ -90,9 +97,7 @@ def generate_sample_data():
             selected_products = random.sample(product_ids, min(num_items, len(product_ids)))
             
             for product_id in selected_products:
-                # Get product price (simplified - in real app would query DB)
-                product_idx = product_ids.index(product_id)
-                unit_price = products_data[product_idx][3]  # price from products_data
+                unit_price = product_prices[product_id]
                 quantity = random.randint(1, 3)
                 total_price = unit_price * quantity
                 
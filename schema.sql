@@ -58,20 +58,333 @@ CREATE TABLE order_items (
     FOREIGN KEY (product_id) REFERENCES products(id)
 );
 
--- Sales summary view
+-- Materialized per-product sales aggregates, kept current by the triggers below
+CREATE TABLE product_sales (
+    product_id INTEGER PRIMARY KEY,
+    total_quantity_sold INTEGER NOT NULL DEFAULT 0,
+    total_revenue DECIMAL(12,2) NOT NULL DEFAULT 0,
+    unit_price_sum DECIMAL(12,2) NOT NULL DEFAULT 0,
+    line_count INTEGER NOT NULL DEFAULT 0,
+    number_of_orders INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (product_id) REFERENCES products(id)
+);
+
+-- The unary + on product_id keeps the lookups on idx_order_items_order; an
+-- order has few lines while a popular product can have millions.
+CREATE TRIGGER trg_order_items_insert_product_sales AFTER INSERT ON order_items
+BEGIN
+    INSERT INTO product_sales (product_id, total_quantity_sold, total_revenue,
+                               unit_price_sum, line_count, number_of_orders)
+    VALUES (
+        NEW.product_id, NEW.quantity, NEW.total_price, NEW.unit_price, 1,
+        NOT EXISTS (SELECT 1 FROM order_items
+                    WHERE order_id = NEW.order_id AND +product_id = NEW.product_id AND id <> NEW.id)
+    )
+    ON CONFLICT(product_id) DO UPDATE SET
+        total_quantity_sold = total_quantity_sold + excluded.total_quantity_sold,
+        total_revenue = total_revenue + excluded.total_revenue,
+        unit_price_sum = unit_price_sum + excluded.unit_price_sum,
+        line_count = line_count + 1,
+        number_of_orders = number_of_orders + excluded.number_of_orders;
+END;
+
+CREATE TRIGGER trg_order_items_delete_product_sales AFTER DELETE ON order_items
+BEGIN
+    UPDATE product_sales SET
+        total_quantity_sold = total_quantity_sold - OLD.quantity,
+        total_revenue = total_revenue - OLD.total_price,
+        unit_price_sum = unit_price_sum - OLD.unit_price,
+        line_count = line_count - 1,
+        number_of_orders = number_of_orders -
+            NOT EXISTS (SELECT 1 FROM order_items
+                        WHERE order_id = OLD.order_id AND +product_id = OLD.product_id)
+    WHERE product_id = OLD.product_id;
+    DELETE FROM product_sales WHERE product_id = OLD.product_id AND line_count <= 0;
+END;
+
+CREATE TRIGGER trg_order_items_update_product_sales
+AFTER UPDATE OF order_id, product_id, quantity, unit_price, total_price ON order_items
+BEGIN
+    -- Take the old line out as the delete trigger does, but without counting
+    -- the updated row itself, which may still match the old order and product
+    UPDATE product_sales SET
+        total_quantity_sold = total_quantity_sold - OLD.quantity,
+        total_revenue = total_revenue - OLD.total_price,
+        unit_price_sum = unit_price_sum - OLD.unit_price,
+        line_count = line_count - 1,
+        number_of_orders = number_of_orders -
+            NOT EXISTS (SELECT 1 FROM order_items
+                        WHERE order_id = OLD.order_id AND +product_id = OLD.product_id AND id <> OLD.id)
+    WHERE product_id = OLD.product_id;
+    DELETE FROM product_sales WHERE product_id = OLD.product_id AND line_count <= 0;
+    INSERT INTO product_sales (product_id, total_quantity_sold, total_revenue,
+                               unit_price_sum, line_count, number_of_orders)
+    VALUES (
+        NEW.product_id, NEW.quantity, NEW.total_price, NEW.unit_price, 1,
+        NOT EXISTS (SELECT 1 FROM order_items
+                    WHERE order_id = NEW.order_id AND +product_id = NEW.product_id AND id <> NEW.id)
+    )
+    ON CONFLICT(product_id) DO UPDATE SET
+        total_quantity_sold = total_quantity_sold + excluded.total_quantity_sold,
+        total_revenue = total_revenue + excluded.total_revenue,
+        unit_price_sum = unit_price_sum + excluded.unit_price_sum,
+        line_count = line_count + 1,
+        number_of_orders = number_of_orders + excluded.number_of_orders;
+END;
+
+-- Sales summary view (reads the pre-aggregated rows, not order_items)
 CREATE VIEW sales_summary AS
 SELECT 
     p.name as product_name,
     p.sku,
     c.name as category,
-    SUM(oi.quantity) as total_quantity_sold,
-    SUM(oi.total_price) as total_revenue,
-    AVG(oi.unit_price) as avg_selling_price,
-    COUNT(DISTINCT oi.order_id) as number_of_orders
-FROM order_items oi
-JOIN products p ON oi.product_id = p.id
-JOIN categories c ON p.category_id = c.id
-GROUP BY p.id, p.name, p.sku, c.name;
+    ps.total_quantity_sold,
+    ps.total_revenue,
+    ps.unit_price_sum * 1.0 / ps.line_count as avg_selling_price,
+    ps.number_of_orders
+FROM product_sales ps
+JOIN products p ON ps.product_id = p.id
+JOIN categories c ON p.category_id = c.id;
+
+-- Per-day, per-week (starting Monday) and per-month order rollups for trend
+-- reports, kept current by the triggers below. Revenue is counted once per
+-- order; items sold come from order_items. Items that arrive before their
+-- order (e.g. from a partially appended CSV) are counted when the order does.
+CREATE TABLE sales_daily (
+    period_start DATE PRIMARY KEY,
+    total_orders INTEGER NOT NULL DEFAULT 0,
+    total_revenue DECIMAL(14,2) NOT NULL DEFAULT 0,
+    total_items_sold INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE sales_weekly (
+    period_start DATE PRIMARY KEY,
+    total_orders INTEGER NOT NULL DEFAULT 0,
+    total_revenue DECIMAL(14,2) NOT NULL DEFAULT 0,
+    total_items_sold INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE sales_monthly (
+    period_start DATE PRIMARY KEY,
+    total_orders INTEGER NOT NULL DEFAULT 0,
+    total_revenue DECIMAL(14,2) NOT NULL DEFAULT 0,
+    total_items_sold INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER trg_orders_insert_rollups AFTER INSERT ON orders
+WHEN NEW.order_date IS NOT NULL
+BEGIN
+    INSERT INTO sales_daily (period_start, total_orders, total_revenue, total_items_sold)
+    VALUES (date(NEW.order_date), 1, NEW.total_amount,
+            (SELECT COALESCE(SUM(quantity), 0) FROM order_items WHERE order_id = NEW.id))
+    ON CONFLICT(period_start) DO UPDATE SET
+        total_orders = total_orders + 1,
+        total_revenue = total_revenue + excluded.total_revenue,
+        total_items_sold = total_items_sold + excluded.total_items_sold;
+    INSERT INTO sales_weekly (period_start, total_orders, total_revenue, total_items_sold)
+    VALUES (date(NEW.order_date, 'weekday 0', '-6 days'), 1, NEW.total_amount,
+            (SELECT COALESCE(SUM(quantity), 0) FROM order_items WHERE order_id = NEW.id))
+    ON CONFLICT(period_start) DO UPDATE SET
+        total_orders = total_orders + 1,
+        total_revenue = total_revenue + excluded.total_revenue,
+        total_items_sold = total_items_sold + excluded.total_items_sold;
+    INSERT INTO sales_monthly (period_start, total_orders, total_revenue, total_items_sold)
+    VALUES (date(NEW.order_date, 'start of month'), 1, NEW.total_amount,
+            (SELECT COALESCE(SUM(quantity), 0) FROM order_items WHERE order_id = NEW.id))
+    ON CONFLICT(period_start) DO UPDATE SET
+        total_orders = total_orders + 1,
+        total_revenue = total_revenue + excluded.total_revenue,
+        total_items_sold = total_items_sold + excluded.total_items_sold;
+END;
+
+CREATE TRIGGER trg_orders_delete_rollups AFTER DELETE ON orders
+WHEN OLD.order_date IS NOT NULL
+BEGIN
+    UPDATE sales_daily SET
+        total_orders = total_orders - 1,
+        total_revenue = total_revenue - OLD.total_amount,
+        total_items_sold = total_items_sold -
+            (SELECT COALESCE(SUM(quantity), 0) FROM order_items WHERE order_id = OLD.id)
+    WHERE period_start = date(OLD.order_date);
+    DELETE FROM sales_daily WHERE period_start = date(OLD.order_date) AND total_orders <= 0;
+    UPDATE sales_weekly SET
+        total_orders = total_orders - 1,
+        total_revenue = total_revenue - OLD.total_amount,
+        total_items_sold = total_items_sold -
+            (SELECT COALESCE(SUM(quantity), 0) FROM order_items WHERE order_id = OLD.id)
+    WHERE period_start = date(OLD.order_date, 'weekday 0', '-6 days');
+    DELETE FROM sales_weekly WHERE period_start = date(OLD.order_date, 'weekday 0', '-6 days') AND total_orders <= 0;
+    UPDATE sales_monthly SET
+        total_orders = total_orders - 1,
+        total_revenue = total_revenue - OLD.total_amount,
+        total_items_sold = total_items_sold -
+            (SELECT COALESCE(SUM(quantity), 0) FROM order_items WHERE order_id = OLD.id)
+    WHERE period_start = date(OLD.order_date, 'start of month');
+    DELETE FROM sales_monthly WHERE period_start = date(OLD.order_date, 'start of month') AND total_orders <= 0;
+END;
+
+CREATE TRIGGER trg_orders_update_rollups AFTER UPDATE OF order_date, total_amount ON orders
+BEGIN
+    UPDATE sales_daily SET
+        total_orders = total_orders - 1,
+        total_revenue = total_revenue - OLD.total_amount,
+        total_items_sold = total_items_sold -
+            (SELECT COALESCE(SUM(quantity), 0) FROM order_items WHERE order_id = OLD.id)
+    WHERE period_start = date(OLD.order_date);
+    DELETE FROM sales_daily WHERE period_start = date(OLD.order_date) AND total_orders <= 0;
+    INSERT INTO sales_daily (period_start, total_orders, total_revenue, total_items_sold)
+    SELECT date(NEW.order_date), 1, NEW.total_amount,
+           (SELECT COALESCE(SUM(quantity), 0) FROM order_items WHERE order_id = NEW.id)
+    WHERE NEW.order_date IS NOT NULL
+    ON CONFLICT(period_start) DO UPDATE SET
+        total_orders = total_orders + 1,
+        total_revenue = total_revenue + excluded.total_revenue,
+        total_items_sold = total_items_sold + excluded.total_items_sold;
+    UPDATE sales_weekly SET
+        total_orders = total_orders - 1,
+        total_revenue = total_revenue - OLD.total_amount,
+        total_items_sold = total_items_sold -
+            (SELECT COALESCE(SUM(quantity), 0) FROM order_items WHERE order_id = OLD.id)
+    WHERE period_start = date(OLD.order_date, 'weekday 0', '-6 days');
+    DELETE FROM sales_weekly WHERE period_start = date(OLD.order_date, 'weekday 0', '-6 days') AND total_orders <= 0;
+    INSERT INTO sales_weekly (period_start, total_orders, total_revenue, total_items_sold)
+    SELECT date(NEW.order_date, 'weekday 0', '-6 days'), 1, NEW.total_amount,
+           (SELECT COALESCE(SUM(quantity), 0) FROM order_items WHERE order_id = NEW.id)
+    WHERE NEW.order_date IS NOT NULL
+    ON CONFLICT(period_start) DO UPDATE SET
+        total_orders = total_orders + 1,
+        total_revenue = total_revenue + excluded.total_revenue,
+        total_items_sold = total_items_sold + excluded.total_items_sold;
+    UPDATE sales_monthly SET
+        total_orders = total_orders - 1,
+        total_revenue = total_revenue - OLD.total_amount,
+        total_items_sold = total_items_sold -
+            (SELECT COALESCE(SUM(quantity), 0) FROM order_items WHERE order_id = OLD.id)
+    WHERE period_start = date(OLD.order_date, 'start of month');
+    DELETE FROM sales_monthly WHERE period_start = date(OLD.order_date, 'start of month') AND total_orders <= 0;
+    INSERT INTO sales_monthly (period_start, total_orders, total_revenue, total_items_sold)
+    SELECT date(NEW.order_date, 'start of month'), 1, NEW.total_amount,
+           (SELECT COALESCE(SUM(quantity), 0) FROM order_items WHERE order_id = NEW.id)
+    WHERE NEW.order_date IS NOT NULL
+    ON CONFLICT(period_start) DO UPDATE SET
+        total_orders = total_orders + 1,
+        total_revenue = total_revenue + excluded.total_revenue,
+        total_items_sold = total_items_sold + excluded.total_items_sold;
+END;
+CREATE TRIGGER trg_order_items_insert_rollups AFTER INSERT ON order_items
+BEGIN
+    INSERT INTO sales_daily (period_start, total_items_sold)
+    SELECT date(o.order_date), NEW.quantity
+    FROM orders o WHERE o.id = NEW.order_id AND o.order_date IS NOT NULL
+    ON CONFLICT(period_start) DO UPDATE SET
+        total_items_sold = total_items_sold + excluded.total_items_sold;
+    INSERT INTO sales_weekly (period_start, total_items_sold)
+    SELECT date(o.order_date, 'weekday 0', '-6 days'), NEW.quantity
+    FROM orders o WHERE o.id = NEW.order_id AND o.order_date IS NOT NULL
+    ON CONFLICT(period_start) DO UPDATE SET
+        total_items_sold = total_items_sold + excluded.total_items_sold;
+    INSERT INTO sales_monthly (period_start, total_items_sold)
+    SELECT date(o.order_date, 'start of month'), NEW.quantity
+    FROM orders o WHERE o.id = NEW.order_id AND o.order_date IS NOT NULL
+    ON CONFLICT(period_start) DO UPDATE SET
+        total_items_sold = total_items_sold + excluded.total_items_sold;
+END;
+
+CREATE TRIGGER trg_order_items_delete_rollups AFTER DELETE ON order_items
+BEGIN
+    UPDATE sales_daily SET total_items_sold = total_items_sold - OLD.quantity
+    WHERE period_start = (SELECT date(o.order_date) FROM orders o WHERE o.id = OLD.order_id);
+    UPDATE sales_weekly SET total_items_sold = total_items_sold - OLD.quantity
+    WHERE period_start = (SELECT date(o.order_date, 'weekday 0', '-6 days') FROM orders o WHERE o.id = OLD.order_id);
+    UPDATE sales_monthly SET total_items_sold = total_items_sold - OLD.quantity
+    WHERE period_start = (SELECT date(o.order_date, 'start of month') FROM orders o WHERE o.id = OLD.order_id);
+END;
+
+CREATE TRIGGER trg_order_items_update_rollups AFTER UPDATE OF order_id, quantity ON order_items
+BEGIN
+    UPDATE sales_daily SET total_items_sold = total_items_sold - OLD.quantity
+    WHERE period_start = (SELECT date(o.order_date) FROM orders o WHERE o.id = OLD.order_id);
+    INSERT INTO sales_daily (period_start, total_items_sold)
+    SELECT date(o.order_date), NEW.quantity
+    FROM orders o WHERE o.id = NEW.order_id AND o.order_date IS NOT NULL
+    ON CONFLICT(period_start) DO UPDATE SET
+        total_items_sold = total_items_sold + excluded.total_items_sold;
+    UPDATE sales_weekly SET total_items_sold = total_items_sold - OLD.quantity
+    WHERE period_start = (SELECT date(o.order_date, 'weekday 0', '-6 days') FROM orders o WHERE o.id = OLD.order_id);
+    INSERT INTO sales_weekly (period_start, total_items_sold)
+    SELECT date(o.order_date, 'weekday 0', '-6 days'), NEW.quantity
+    FROM orders o WHERE o.id = NEW.order_id AND o.order_date IS NOT NULL
+    ON CONFLICT(period_start) DO UPDATE SET
+        total_items_sold = total_items_sold + excluded.total_items_sold;
+    UPDATE sales_monthly SET total_items_sold = total_items_sold - OLD.quantity
+    WHERE period_start = (SELECT date(o.order_date, 'start of month') FROM orders o WHERE o.id = OLD.order_id);
+    INSERT INTO sales_monthly (period_start, total_items_sold)
+    SELECT date(o.order_date, 'start of month'), NEW.quantity
+    FROM orders o WHERE o.id = NEW.order_id AND o.order_date IS NOT NULL
+    ON CONFLICT(period_start) DO UPDATE SET
+        total_items_sold = total_items_sold + excluded.total_items_sold;
+END;
+
+-- Per-file progress of incremental CSV loads: append-only files resume at
+-- byte_offset, other files are skipped while file_size and mtime_ns match
+CREATE TABLE load_checkpoints (
+    file_path TEXT PRIMARY KEY,
+    header TEXT,
+    byte_offset INTEGER NOT NULL DEFAULT 0,
+    file_size INTEGER,
+    mtime_ns INTEGER,
+    high_water_id INTEGER,
+    rows_loaded INTEGER NOT NULL DEFAULT 0,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Serialized sketches for the approximate analyzer; watermark is the highest
+-- orders or order_items id folded into each one
+CREATE TABLE sketch_state (
+    name TEXT PRIMARY KEY,
+    state BLOB NOT NULL,
+    watermark INTEGER NOT NULL DEFAULT 0,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Per-table change counters, so readers that cache the catalog can tell
+-- cheaply whether it changed
+CREATE TABLE change_counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL DEFAULT 0
+);
+INSERT INTO change_counters (name) VALUES ('categories'), ('products_inserted'), ('products_changed');
+
+CREATE TRIGGER trg_categories_insert_counter AFTER INSERT ON categories
+BEGIN
+    UPDATE change_counters SET value = value + 1 WHERE name = 'categories';
+END;
+
+CREATE TRIGGER trg_categories_update_counter AFTER UPDATE ON categories
+BEGIN
+    UPDATE change_counters SET value = value + 1 WHERE name = 'categories';
+END;
+
+CREATE TRIGGER trg_categories_delete_counter AFTER DELETE ON categories
+BEGIN
+    UPDATE change_counters SET value = value + 1 WHERE name = 'categories';
+END;
+
+CREATE TRIGGER trg_products_insert_counter AFTER INSERT ON products
+BEGIN
+    UPDATE change_counters SET value = value + 1 WHERE name = 'products_inserted';
+END;
+
+-- Stock and price updates are frequent and do not change the catalog's shape
+CREATE TRIGGER trg_products_update_counter AFTER UPDATE OF id, name, sku, category_id ON products
+BEGIN
+    UPDATE change_counters SET value = value + 1 WHERE name = 'products_changed';
+END;
+
+CREATE TRIGGER trg_products_delete_counter AFTER DELETE ON products
+BEGIN
+    UPDATE change_counters SET value = value + 1 WHERE name = 'products_changed';
+END;
 
 -- Indexes for performance
 CREATE INDEX idx_products_category ON products(category_id);
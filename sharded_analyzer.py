@@ -0,0 +1,137 @@
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+from database import DatabaseManager, DateLike
+from models import SalesData
+from sales_analyzer import SalesAnalyzer
+
+# Per-shard work, kept at module level so it can run in worker processes.
+# Results are plain tuples because sqlite3.Row does not pickle.
+
+def shard_product_partials(db_path: str, start_date: Optional[DateLike], end_date: Optional[DateLike],
+                           category: Optional[str], status: Optional[str]) -> List[tuple]:
+    return DatabaseManager(db_path).get_product_partials(start_date, end_date, category, status)
+
+def shard_category_revenue(db_path: str, start_date: Optional[DateLike], end_date: Optional[DateLike],
+                           status: Optional[str]) -> List[tuple]:
+    rows = DatabaseManager(db_path).get_category_revenue(start_date, end_date, status)
+    return [(row['category'], row['revenue']) for row in rows]
+
+def shard_daily_rollups(db_path: str, start_date: DateLike) -> List[tuple]:
+    rows = DatabaseManager(db_path).get_rollups("day", start_date=start_date)
+    return [tuple(row) for row in rows]
+
+def merge_product_partials(shards: Sequence[List[tuple]]) -> Dict[str, list]:
+    """Add up per-product partials by SKU: [name, category, quantity, revenue, price_sum, lines, orders]."""
+    merged: Dict[str, list] = {}
+    for rows in shards:
+        for sku, name, category, quantity, revenue, price_sum, lines, orders in rows:
+            totals = merged.get(sku)
+            if totals is None:
+                merged[sku] = [name, category, quantity, revenue, price_sum, lines, orders]
+            else:
+                totals[2] += quantity
+                totals[3] += revenue
+                totals[4] += price_sum
+                totals[5] += lines
+                totals[6] += orders
+    return merged
+
+class ShardedSalesAnalyzer:
+    """Run the SalesAnalyzer reports over several database files and merge the results.
+
+    Each shard returns sums and counts, never averages or truncated top-N
+    lists. Merging therefore gives the same answer as one combined database,
+    provided an order lives in exactly one shard. Shards are queried in
+    parallel on a thread pool, or a process pool with ``use_processes``.
+    """
+
+    def __init__(self, db_paths: Sequence[str], max_workers: Optional[int] = None,
+                 use_processes: bool = False):
+        missing = [path for path in db_paths if not os.path.exists(path)]
+        if missing:
+            raise FileNotFoundError(f"Shard databases not found: {', '.join(missing)}")
+        self.db_paths = list(db_paths)
+        workers = max_workers or min(len(self.db_paths), os.cpu_count() or 1) or 1
+        executor_type = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self.executor: Executor = executor_type(max_workers=workers)
+
+    def _map(self, func: Callable, *args) -> List[Any]:
+        futures = [self.executor.submit(func, path, *args) for path in self.db_paths]
+        return [future.result() for future in futures]
+
+    def get_top_selling_products(self, limit: int = 10, start_date: Optional[DateLike] = None,
+                                 end_date: Optional[DateLike] = None, category: Optional[str] = None,
+                                 status: Optional[str] = None) -> List[Dict[str, Any]]:
+        merged = merge_product_partials(
+            self._map(shard_product_partials, start_date, end_date, category, status))
+        ranked = sorted(merged.items(), key=lambda x: (-x[1][2], x[0]))[:limit]
+
+        return [
+            {
+                "product_name": name,
+                "sku": sku,
+                "category": product_category,
+                "quantity_sold": quantity,
+                "revenue": float(revenue),
+                "avg_price": float(price_sum) / lines if lines else 0.0
+            }
+            for sku, (name, product_category, quantity, revenue, price_sum, lines, _) in ranked
+        ]
+
+    def get_revenue_by_category(self, start_date: Optional[DateLike] = None,
+                                end_date: Optional[DateLike] = None,
+                                status: Optional[str] = None) -> Dict[str, float]:
+        category_revenue: Dict[str, float] = {}
+        for rows in self._map(shard_category_revenue, start_date, end_date, status):
+            for category, revenue in rows:
+                category_revenue[category] = category_revenue.get(category, 0.0) + float(revenue)
+        return dict(sorted(category_revenue.items(), key=lambda x: x[1], reverse=True))
+
+    def get_daily_sales_report(self, days: int = 7) -> List[Dict[str, Any]]:
+        start_date = datetime.now(timezone.utc).date() - timedelta(days=days)
+        merged: Dict[str, list] = {}
+        for rows in self._map(shard_daily_rollups, start_date):
+            for period_start, orders, revenue, items in rows:
+                totals = merged.setdefault(period_start, [0, 0.0, 0])
+                totals[0] += orders
+                totals[1] += float(revenue)
+                totals[2] += items
+
+        return [
+            {
+                "date": period_start,
+                "total_orders": orders,
+                "total_revenue": revenue,
+                "avg_order_value": revenue / orders if orders else 0.0,
+                "total_items_sold": items
+            }
+            for period_start, (orders, revenue, items) in sorted(merged.items(), reverse=True)
+        ]
+
+    def iter_sales_summary(self, batch_size: int = 1000) -> Iterator[SalesData]:
+        merged = merge_product_partials(self._map(shard_product_partials, None, None, None, None))
+        for sku, (name, category, quantity, revenue, price_sum, lines, orders) in merged.items():
+            yield SalesData(
+                product_name=name,
+                sku=sku,
+                category=category,
+                total_quantity_sold=quantity,
+                total_revenue=Decimal(str(revenue)),
+                avg_selling_price=Decimal(str(price_sum / lines)) if lines else Decimal('0.00'),
+                number_of_orders=orders
+            )
+
+    # The report only uses the methods above, so the single-database layout is reused as is
+    print_sales_report = SalesAnalyzer.print_sales_report
+
+    def close(self):
+        self.executor.shutdown()
+
+    def __enter__(self) -> "ShardedSalesAnalyzer":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
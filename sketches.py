@@ -0,0 +1,223 @@
+import hashlib
+import heapq
+import math
+import random
+import struct
+from array import array
+from typing import Dict, Hashable, List, Optional, Tuple
+
+# Probabilistic summaries with fixed memory and stated error bounds. Each one
+# only ever grows (inserts, no deletes) and serializes to bytes for storage.
+
+def _key_bytes(value: Hashable) -> bytes:
+    if isinstance(value, int):
+        return value.to_bytes(8, "little", signed=True)
+    return str(value).encode("utf-8")
+
+def hash64(value: Hashable) -> int:
+    return int.from_bytes(hashlib.blake2b(_key_bytes(value), digest_size=8).digest(), "little")
+
+class HyperLogLog:
+    """Distinct-count estimator using 2**precision one-byte registers.
+
+    The relative standard error is 1.04 / sqrt(2**precision): 1.6% at the
+    default precision of 12, in 4 KB.
+    """
+
+    def __init__(self, precision: int = 12):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def add(self, value: Hashable):
+        x = hash64(value)
+        bits = 64 - self.precision
+        index = x >> bits
+        rank = bits - (x & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Small cardinalities: linear counting is more accurate
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+    def merge(self, other: "HyperLogLog"):
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLogs of different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def to_bytes(self) -> bytes:
+        return bytes([self.precision]) + bytes(self.registers)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HyperLogLog":
+        sketch = cls(data[0])
+        sketch.registers = bytearray(data[1:])
+        return sketch
+
+class CountMinSketch:
+    """Frequency estimates for arbitrary keys in ``depth`` x ``width`` counters.
+
+    Estimates never undercount; with probability 1 - delta they overcount by
+    at most epsilon * total, where epsilon = e / width and delta = e ** -depth.
+    """
+
+    def __init__(self, width: int = 2719, depth: int = 5):
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self.table = array("q", bytes(8 * width * depth))
+
+    @classmethod
+    def for_error(cls, epsilon: float, delta: float) -> "CountMinSketch":
+        return cls(math.ceil(math.e / epsilon), math.ceil(math.log(1 / delta)))
+
+    @property
+    def epsilon(self) -> float:
+        return math.e / self.width
+
+    @property
+    def delta(self) -> float:
+        return math.exp(-self.depth)
+
+    def _cells(self, key: Hashable) -> List[int]:
+        digest = hashlib.blake2b(_key_bytes(key), digest_size=8 * self.depth).digest()
+        return [row * self.width + int.from_bytes(digest[8 * row:8 * row + 8], "little") % self.width
+                for row in range(self.depth)]
+
+    def add(self, key: Hashable, count: int = 1):
+        for cell in self._cells(key):
+            self.table[cell] += count
+        self.total += count
+
+    def estimate(self, key: Hashable) -> int:
+        return min(self.table[cell] for cell in self._cells(key))
+
+    @property
+    def error_bound(self) -> float:
+        return self.epsilon * self.total
+
+    def to_bytes(self) -> bytes:
+        return struct.pack("<qqq", self.width, self.depth, self.total) + self.table.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CountMinSketch":
+        width, depth, total = struct.unpack_from("<qqq", data)
+        sketch = cls(width, depth)
+        sketch.total = total
+        sketch.table = array("q")
+        sketch.table.frombytes(data[24:])
+        return sketch
+
+class SpaceSaving:
+    """Heavy hitters by weighted count, tracking at most ``capacity`` keys.
+
+    Each reported count overestimates the true one by at most its ``error``,
+    itself at most total / capacity, and every key heavier than that is kept.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self.total = 0
+        self.counters: Dict[int, List[int]] = {}  # key -> [count, error]
+        # (count, key) per key; counts only grow, so a stale entry is too low
+        self._heap: List[Tuple[int, int]] = []
+
+    def add(self, key: int, count: int = 1):
+        self.total += count
+        counter = self.counters.get(key)
+        if counter is not None:
+            counter[0] += count
+            return
+        if len(self.counters) < self.capacity:
+            self.counters[key] = [count, 0]
+            heapq.heappush(self._heap, (count, key))
+            return
+        while True:
+            smallest, victim = heapq.heappop(self._heap)
+            current = self.counters[victim][0]
+            if current == smallest:
+                break
+            heapq.heappush(self._heap, (current, victim))
+        del self.counters[victim]
+        self.counters[key] = [smallest + count, smallest]
+        heapq.heappush(self._heap, (smallest + count, key))
+
+    @property
+    def error_bound(self) -> float:
+        return self.total / self.capacity
+
+    def top(self, n: int) -> List[Tuple[int, int, int]]:
+        """The ``n`` heaviest ``(key, count, error)`` triples, heaviest first."""
+        ranked = sorted(self.counters.items(), key=lambda x: (-x[1][0], x[0]))[:n]
+        return [(key, count, error) for key, (count, error) in ranked]
+
+    def to_bytes(self) -> bytes:
+        values = array("q", [self.capacity, self.total])
+        for key, (count, error) in self.counters.items():
+            values.extend((key, count, error))
+        return values.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "SpaceSaving":
+        values = array("q")
+        values.frombytes(data)
+        sketch = cls(values[0])
+        sketch.total = values[1]
+        for i in range(2, len(values), 3):
+            sketch.counters[values[i]] = [values[i + 1], values[i + 2]]
+        sketch._heap = [(count, key) for key, (count, _) in sketch.counters.items()]
+        heapq.heapify(sketch._heap)
+        return sketch
+
+class ReservoirSample:
+    """Uniform sample of up to ``size`` integer values from a stream (Algorithm R)."""
+
+    def __init__(self, size: int = 10000, seed: Optional[int] = None):
+        self.size = size
+        self.seen = 0
+        self.values = array("q")
+        self._rng = random.Random(seed)
+
+    def add(self, value: int):
+        self.seen += 1
+        if len(self.values) < self.size:
+            self.values.append(value)
+            return
+        slot = self._rng.randrange(self.seen)
+        if slot < self.size:
+            self.values[slot] = value
+
+    def mean(self) -> float:
+        return sum(self.values) / len(self.values) if self.values else 0.0
+
+    def standard_error(self) -> float:
+        """Standard error of ``mean()``, with the finite population correction."""
+        n = len(self.values)
+        if n < 2:
+            return 0.0
+        mean = self.mean()
+        variance = sum((v - mean) ** 2 for v in self.values) / (n - 1)
+        return math.sqrt(variance / n * (1 - n / self.seen))
+
+    def to_bytes(self) -> bytes:
+        return struct.pack("<qq", self.size, self.seen) + self.values.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes, seed: Optional[int] = None) -> "ReservoirSample":
+        size, seen = struct.unpack_from("<qq", data)
+        sketch = cls(size, seed)
+        sketch.seen = seen
+        sketch.values.frombytes(data[16:])
+        return sketch
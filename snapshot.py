@@ -0,0 +1,330 @@
+import gzip
+import json
+import mmap
+import os
+import sys
+import time
+from array import array
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from columnar import INT, MISSING, TEXT, cents_sql, np, read_columns
+from database import SCHEMA_VERSION, DatabaseManager
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+SNAPSHOT_VERSION = 2
+# Version 1 snapshots have no null masks and read NULL back from MISSING
+READABLE_SNAPSHOT_VERSIONS = (1, 2)
+MANIFEST = "manifest.json"
+
+# Snapshot column kind for money: stored as integer cents in "<column>_cents"
+MONEY = "money"
+
+# (column, kind, nullable) per table. Nullable numeric columns read NULL as
+# MISSING and also get a "<name>_null" mask column (1 where NULL), since any
+# sentinel is a value the column could hold. Base tables are listed in
+# restore (foreign key) order.
+SNAPSHOT_TABLES: Dict[str, List[Tuple[str, str, bool]]] = {
+    "categories": [
+        ("id", INT, False), ("name", TEXT, False), ("description", TEXT, True),
+        ("created_at", TEXT, True),
+    ],
+    "products": [
+        ("id", INT, False), ("name", TEXT, False), ("sku", TEXT, False),
+        ("category_id", INT, True), ("price", MONEY, False), ("cost", MONEY, True),
+        ("description", TEXT, True), ("stock_quantity", INT, True), ("is_active", INT, True),
+        ("created_at", TEXT, True), ("updated_at", TEXT, True),
+    ],
+    "customers": [
+        ("id", INT, False), ("email", TEXT, False), ("first_name", TEXT, True),
+        ("last_name", TEXT, True), ("phone", TEXT, True), ("created_at", TEXT, True),
+    ],
+    "orders": [
+        ("id", INT, False), ("customer_id", INT, False), ("order_date", TEXT, True),
+        ("status", TEXT, True), ("total_amount", MONEY, False), ("shipping_cost", MONEY, True),
+        ("tax_amount", MONEY, True),
+    ],
+    "order_items": [
+        ("id", INT, False), ("order_id", INT, False), ("product_id", INT, False),
+        ("quantity", INT, False), ("unit_price", MONEY, False), ("total_price", MONEY, False),
+    ],
+    # Derived from the tables above; exported for offline analysis, never restored
+    "sales_summary": [
+        ("product_name", TEXT, False), ("sku", TEXT, False), ("category", TEXT, True),
+        ("total_quantity_sold", INT, False), ("total_revenue", MONEY, False),
+        ("avg_selling_price", MONEY, False), ("number_of_orders", INT, False),
+    ],
+}
+RESTORE_TABLES = ["categories", "products", "customers", "orders", "order_items"]
+
+FORMATS = ("parquet", "npy", "raw")
+
+def default_format() -> str:
+    """Best format the installed libraries support: parquet, then npy, then raw."""
+    if pq is not None:
+        return "parquet"
+    if np is not None:
+        return "npy"
+    return "raw"
+
+def _snapshot_name(column: str, kind: str) -> str:
+    return f"{column}_cents" if kind == MONEY else column
+
+def _null_mask_name(column: str, kind: str, nullable: bool) -> Optional[str]:
+    return f"{_snapshot_name(column, kind)}_null" if nullable and kind != TEXT else None
+
+def _table_query(table: str) -> str:
+    expressions = []
+    for column, kind, nullable in SNAPSHOT_TABLES[table]:
+        expressions.append(cents_sql(column) if kind == MONEY else column)
+        if _null_mask_name(column, kind, nullable):
+            expressions.append(f"{column} IS NULL")
+    select = ", ".join(expressions)
+    order = "" if table == "sales_summary" else " ORDER BY id"
+    return f"SELECT {select} FROM {table}{order}"
+
+def _as_list(values) -> list:
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+def _int64(values):
+    """Wrap an int64 buffer as a NumPy array when NumPy is installed."""
+    if np is None:
+        return values
+    return np.frombuffer(values, dtype=np.int64) if len(values) else np.zeros(0, dtype=np.int64)
+
+def _write_numeric(path: str, values, fmt: str):
+    if fmt == "npy":
+        np.save(path, np.asarray(values, dtype=np.int64))
+    else:
+        with open(path, "wb") as file:
+            values.tofile(file)
+
+def _write_text(path: str, values):
+    # Level 1: text is the bulky part and the snapshot should stay I/O bound
+    with gzip.open(path, "wt", encoding="utf-8", compresslevel=1) as file:
+        json.dump(_as_list(values), file, separators=(",", ":"))
+
+def _read_numeric(path: str, fmt: str, byteorder: str, use_mmap: bool):
+    if fmt == "npy":
+        if np is None:
+            raise ImportError("NumPy is required to read an npy snapshot")
+        return np.load(path, mmap_mode="r" if use_mmap else None)
+
+    if use_mmap and byteorder == sys.byteorder and os.path.getsize(path):
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return _int64(memoryview(mapped).cast("q"))
+
+    values = array("q")
+    with open(path, "rb") as file:
+        values.frombytes(file.read())
+    if byteorder != sys.byteorder:
+        values.byteswap()
+    return _int64(values)
+
+def _read_text(path: str) -> List[Optional[str]]:
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        return json.load(file)
+
+def export_snapshot(db_path: str, snapshot_dir: str = "snapshot", fmt: Optional[str] = None,
+                    tables: Optional[Sequence[str]] = None, batch_size: int = 10000) -> Dict[str, Any]:
+    """Write tables as columnar files plus a manifest and return the manifest.
+
+    parquet keeps one zstd-compressed file per table and needs pyarrow. npy
+    (NumPy) and raw (stdlib ``array`` dumps) write one file per numeric
+    column so it can be memory-mapped on load; their text columns are
+    gzip-compressed JSON lists. Money is stored as integer cents.
+    """
+    fmt = fmt or default_format()
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown snapshot format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    if fmt == "parquet" and pq is None:
+        raise ImportError("pyarrow is required for parquet snapshots")
+    if fmt == "npy" and np is None:
+        raise ImportError("NumPy is required for npy snapshots")
+
+    db = DatabaseManager(db_path)
+    conn = db.get_connection()
+    os.makedirs(snapshot_dir, exist_ok=True)
+    manifest: Dict[str, Any] = {
+        "snapshot_version": SNAPSHOT_VERSION,
+        "schema_version": SCHEMA_VERSION,
+        "format": fmt,
+        "byteorder": sys.byteorder,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "tables": {},
+    }
+
+    print(f"Writing {fmt} snapshot of {db_path} to {snapshot_dir}...")
+    for table in tables or SNAPSHOT_TABLES:
+        start = time.perf_counter()
+        spec = SNAPSHOT_TABLES[table]
+        schema = []
+        for column, kind, nullable in spec:
+            schema.append((_snapshot_name(column, kind), TEXT if kind == TEXT else INT))
+            mask = _null_mask_name(column, kind, nullable)
+            if mask:
+                schema.append((mask, INT))
+        data = read_columns(conn, _table_query(table), schema, batch_size=batch_size)
+        rows = len(data[schema[0][0]])
+
+        columns = []
+        if fmt == "parquet":
+            arrays = {
+                name: pa.array(_as_list(data[name]),
+                               type=pa.string() if kind == TEXT else pa.int64())
+                for name, kind in schema
+            }
+            file_name = f"{table}.parquet"
+            pq.write_table(pa.table(arrays), os.path.join(snapshot_dir, file_name),
+                           compression="zstd")
+        else:
+            os.makedirs(os.path.join(snapshot_dir, table), exist_ok=True)
+
+        for column, kind, nullable in spec:
+            name = _snapshot_name(column, kind)
+            mask = _null_mask_name(column, kind, nullable)
+            entry = {"name": name, "source": column, "kind": kind, "nullable": nullable}
+            if fmt != "parquet":
+                suffix = ".json.gz" if kind == TEXT else f".{'npy' if fmt == 'npy' else 'i64'}"
+                file_name = f"{table}/{name}{suffix}"
+                path = os.path.join(snapshot_dir, file_name)
+                if kind == TEXT:
+                    _write_text(path, data[name])
+                else:
+                    _write_numeric(path, data[name], fmt)
+                if mask:
+                    entry["null_mask_file"] = f"{table}/{mask}{suffix}"
+                    _write_numeric(os.path.join(snapshot_dir, entry["null_mask_file"]), data[mask], fmt)
+            entry["file"] = file_name
+            if mask:
+                entry["null_mask"] = mask
+            columns.append(entry)
+
+        manifest["tables"][table] = {"rows": rows, "columns": columns}
+        elapsed = time.perf_counter() - start
+        rate = rows / elapsed if elapsed > 0 else 0
+        print(f"   Wrote {rows} rows from {table} in {elapsed:.2f}s ({rate:,.0f} rows/sec)")
+
+    # Written last, so an interrupted snapshot has no manifest and is never loaded
+    with open(os.path.join(snapshot_dir, MANIFEST), "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+    return manifest
+
+def read_manifest(snapshot_dir: str) -> Dict[str, Any]:
+    with open(os.path.join(snapshot_dir, MANIFEST), encoding="utf-8") as file:
+        manifest = json.load(file)
+    if manifest.get("snapshot_version") not in READABLE_SNAPSHOT_VERSIONS:
+        raise ValueError(f"Unsupported snapshot version {manifest.get('snapshot_version')} "
+                         f"in {snapshot_dir}")
+    return manifest
+
+def load_snapshot(snapshot_dir: str, tables: Optional[Sequence[str]] = None,
+                  use_mmap: bool = True) -> Dict[str, Dict[str, Any]]:
+    """Load a snapshot as ``{table: {column: array}}`` without touching SQLite.
+
+    Numeric columns are int64 arrays (money in cents, NULL as MISSING, with
+    a ``<name>_null`` mask array for nullable ones), memory-mapped where the
+    format allows; text columns are lists.
+    """
+    manifest = read_manifest(snapshot_dir)
+    fmt = manifest["format"]
+    result: Dict[str, Dict[str, Any]] = {}
+
+    for table in tables or manifest["tables"]:
+        entry = manifest["tables"][table]
+        columns: Dict[str, Any] = {}
+        if fmt == "parquet":
+            if pq is None:
+                raise ImportError("pyarrow is required to read a parquet snapshot")
+            path = os.path.join(snapshot_dir, entry["columns"][0]["file"])
+            parquet = pq.read_table(path, memory_map=use_mmap)
+            for column in entry["columns"]:
+                for name in filter(None, (column["name"], column.get("null_mask"))):
+                    values = parquet.column(name)
+                    if column["kind"] == TEXT or np is None:
+                        columns[name] = values.to_pylist()
+                    else:
+                        columns[name] = values.to_numpy()
+        else:
+            for column in entry["columns"]:
+                path = os.path.join(snapshot_dir, column["file"])
+                if column["kind"] == TEXT:
+                    columns[column["name"]] = _read_text(path)
+                else:
+                    columns[column["name"]] = _read_numeric(path, fmt, manifest["byteorder"],
+                                                            use_mmap)
+                if "null_mask" in column:
+                    columns[column["null_mask"]] = _read_numeric(
+                        os.path.join(snapshot_dir, column["null_mask_file"]), fmt,
+                        manifest["byteorder"], use_mmap)
+
+        for name, values in columns.items():
+            if len(values) != entry["rows"]:
+                raise ValueError(f"Snapshot column {table}.{name} has {len(values)} rows, "
+                                 f"manifest says {entry['rows']}")
+        result[table] = columns
+    return result
+
+def _iter_rows(columns: Sequence[Any], batch_size: int) -> Iterator[tuple]:
+    """Row tuples from column arrays, converting one batch of each column at a time."""
+    total = len(columns[0]) if columns else 0
+    for start in range(0, total, batch_size):
+        yield from zip(*(_as_list(column[start:start + batch_size]) for column in columns))
+
+def _placeholder(column: Dict[str, Any]) -> str:
+    # Cents and NULLs are decoded by SQLite rather than per value in Python
+    value = "?"
+    if "null_mask" in column:
+        # Parameters are the mask, then the value
+        value = "CASE WHEN ? THEN NULL ELSE ? END"
+    elif column["nullable"] and column["kind"] != TEXT:
+        # Version 1 snapshot: MISSING is the only NULL marker
+        value = f"NULLIF(?, {MISSING})"
+    return f"{value} / 100.0" if column["kind"] == MONEY else value
+
+def _restore_arrays(columns: Sequence[Dict[str, Any]], data: Dict[str, Any]) -> List[Any]:
+    """Arrays in the parameter order of ``_placeholder`` for each column."""
+    arrays = []
+    for column in columns:
+        if "null_mask" in column:
+            arrays.append(data[column["null_mask"]])
+        arrays.append(data[column["name"]])
+    return arrays
+
+def restore_snapshot(snapshot_dir: str, db_path: str, batch_size: int = 10000) -> Dict[str, int]:
+    """Bulk-insert a snapshot's base tables into an empty database, keeping ids.
+
+    product_sales and the rollups are filled by their triggers as rows arrive.
+    """
+    db = DatabaseManager(db_path)
+    conn = db.get_connection()
+    for table in RESTORE_TABLES:
+        if conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() is not None:
+            raise ValueError(f"Cannot restore into {db_path}: {table} already has rows")
+
+    manifest = read_manifest(snapshot_dir)
+    data = load_snapshot(snapshot_dir, RESTORE_TABLES)
+    counts = {}
+
+    print(f"Restoring snapshot {snapshot_dir} into {db_path}...")
+    for table in RESTORE_TABLES:
+        start = time.perf_counter()
+        spec = manifest["tables"][table]["columns"]
+        count = db.bulk_insert(
+            table,
+            [column["source"] for column in spec],
+            _iter_rows(_restore_arrays(spec, data[table]), batch_size),
+            batch_size,
+            [_placeholder(column) for column in spec],
+        )
+        counts[table] = count
+        elapsed = time.perf_counter() - start
+        rate = count / elapsed if elapsed > 0 else 0
+        print(f"   Restored {count} rows into {table} in {elapsed:.2f}s ({rate:,.0f} rows/sec)")
+    return counts
@@ -0,0 +1,169 @@
+import csv
+import os
+import random
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Dict, List, Optional, Sequence, Tuple
+from database import DatabaseManager
+
+CATEGORY_COLUMNS = ["id", "name", "description"]
+PRODUCT_COLUMNS = ["id", "name", "sku", "category_id", "price", "cost", "description",
+                   "stock_quantity", "is_active"]
+CUSTOMER_COLUMNS = ["id", "email", "first_name", "last_name", "phone"]
+ORDER_COLUMNS = ["id", "customer_id", "order_date", "status", "total_amount",
+                 "shipping_cost", "tax_amount"]
+ORDER_ITEM_COLUMNS = ["id", "order_id", "product_id", "quantity", "unit_price", "total_price"]
+
+STATUSES = ["completed", "shipped", "pending", "cancelled"]
+STATUS_WEIGHTS = [85, 7, 5, 3]
+
+FIRST_NAMES = ["John", "Jane", "Bob", "Alice", "Charlie", "Diana", "Edward", "Fiona",
+               "George", "Hannah", "Ivan", "Julia", "Kevin", "Laura", "Mike", "Nina"]
+LAST_NAMES = ["Doe", "Smith", "Wilson", "Brown", "Davis", "Miller", "Jones", "Garcia",
+              "Martin", "Lee", "Clark", "Lewis", "Walker", "Hall", "Young", "King"]
+
+def zipf_cum_weights(n: int, skew: float) -> List[float]:
+    """Cumulative Zipf weights for ranks 1..n; skew 0 gives a uniform distribution."""
+    return list(accumulate(1.0 / (rank ** skew) for rank in range(1, n + 1)))
+
+class _TableWriter:
+    """Send generated rows to a CSV file and/or the database as each chunk is produced."""
+
+    def __init__(self, table: str, columns: Sequence[str], db: Optional[DatabaseManager],
+                 csv_dir: Optional[str], batch_size: int):
+        self.table = table
+        self.columns = columns
+        self.db = db
+        self.batch_size = batch_size
+        self.count = 0
+        self.file = None
+        self.writer = None
+        if csv_dir is not None:
+            self.file = open(os.path.join(csv_dir, f"{table}.csv"), 'w', encoding='utf-8', newline='')
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(columns)
+
+    def write(self, rows: List[tuple]):
+        if self.writer is not None:
+            self.writer.writerows(rows)
+        if self.db is not None:
+            self.db.bulk_insert(self.table, self.columns, rows, self.batch_size)
+        self.count += len(rows)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+
+def generate_synthetic_data(db_path: Optional[str] = None, csv_dir: Optional[str] = None,
+                            orders: int = 10000, products: int = 1000, customers: int = 5000,
+                            categories: int = 20, max_items_per_order: int = 5,
+                            product_skew: float = 1.1, customer_skew: float = 0.8,
+                            start_date: Optional[datetime] = None, days: int = 365,
+                            seed: int = 42, batch_size: int = 10000,
+                            fresh: bool = False) -> Dict[str, int]:
+    """Generate a reproducible e-commerce dataset of any size.
+
+    Rows are produced in chunks of ``batch_size`` orders and written with bulk
+    inserts to ``db_path`` and/or as CSV files (in the ``data/`` layout read by
+    CSVLoader) to ``csv_dir``, so memory use does not grow with ``orders``.
+    Product and customer popularity follow Zipf distributions with the given
+    skews, and order dates increase steadily over ``days`` from ``start_date``.
+    ``fresh`` fills an empty ``db_path`` via ``DatabaseManager.fresh_load``.
+    """
+    if db_path is None and csv_dir is None:
+        raise ValueError("Specify db_path, csv_dir or both")
+
+    rng = random.Random(seed)
+    db = DatabaseManager(db_path) if db_path is not None else None
+    if csv_dir is not None:
+        os.makedirs(csv_dir, exist_ok=True)
+    start_date = start_date or datetime.now().replace(microsecond=0) - timedelta(days=days)
+
+    def writer(table: str, columns: Sequence[str]) -> _TableWriter:
+        return _TableWriter(table, columns, db, csv_dir, batch_size)
+
+    counts = {}
+
+    with db.fresh_load() if db is not None and fresh else nullcontext():
+        table = writer("categories", CATEGORY_COLUMNS)
+        table.write([(i, f"Category {i}", f"Synthetic category {i}") for i in range(1, categories + 1)])
+        table.close()
+        counts["categories"] = table.count
+
+        prices: List[int] = []
+        table = writer("products", PRODUCT_COLUMNS)
+        for first in range(1, products + 1, batch_size):
+            rows = []
+            for i in range(first, min(first + batch_size, products + 1)):
+                price_cents = max(99, int(rng.lognormvariate(8.0, 1.0)))
+                cost_cents = price_cents * rng.randint(40, 70) // 100
+                prices.append(price_cents)
+                rows.append((i, f"Product {i}", f"SKU{i:08d}", rng.randint(1, categories),
+                             price_cents / 100, cost_cents / 100, f"Synthetic product {i}",
+                             rng.randint(0, 500), 1))
+            table.write(rows)
+        table.close()
+        counts["products"] = table.count
+
+        table = writer("customers", CUSTOMER_COLUMNS)
+        for first in range(1, customers + 1, batch_size):
+            rows = [
+                (i, f"customer{i}@example.com", rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES),
+                 f"555-{i % 10000:04d}")
+                for i in range(first, min(first + batch_size, customers + 1))
+            ]
+            table.write(rows)
+        table.close()
+        counts["customers"] = table.count
+
+        product_weights = zipf_cum_weights(products, product_skew)
+        customer_weights = zipf_cum_weights(customers, customer_skew)
+        product_ids = range(1, products + 1)
+        customer_ids = range(1, customers + 1)
+        span_seconds = days * 86400
+
+        order_table = writer("orders", ORDER_COLUMNS)
+        item_table = writer("order_items", ORDER_ITEM_COLUMNS)
+        item_id = 0
+        for first in range(1, orders + 1, batch_size):
+            last = min(first + batch_size, orders + 1)
+            chunk = last - first
+            buyers = rng.choices(customer_ids, cum_weights=customer_weights, k=chunk)
+            statuses = rng.choices(STATUSES, weights=STATUS_WEIGHTS, k=chunk)
+            order_rows: List[Tuple] = []
+            item_rows: List[Tuple] = []
+
+            for offset, order_id in enumerate(range(first, last)):
+                num_items = rng.randint(1, max_items_per_order)
+                picked = set(rng.choices(product_ids, cum_weights=product_weights, k=num_items))
+                subtotal = 0
+                for product_id in picked:
+                    quantity = rng.randint(1, 3)
+                    unit_cents = prices[product_id - 1]
+                    line_cents = unit_cents * quantity
+                    subtotal += line_cents
+                    item_id += 1
+                    item_rows.append((item_id, order_id, product_id, quantity,
+                                      unit_cents / 100, line_cents / 100))
+
+                shipping_cents = 999 if subtotal < 5000 else 0
+                tax_cents = round(subtotal * 0.08)
+                seconds = (order_id - 1 + rng.random()) * span_seconds / orders
+                order_date = start_date + timedelta(seconds=int(seconds))
+                order_rows.append((order_id, buyers[offset], order_date.isoformat(" "), statuses[offset],
+                                   (subtotal + shipping_cents + tax_cents) / 100,
+                                   shipping_cents / 100, tax_cents / 100))
+
+            # Orders first so anything keyed on the order (e.g. rollups) sees it
+            order_table.write(order_rows)
+            item_table.write(item_rows)
+        order_table.close()
+        item_table.close()
+        counts["orders"] = order_table.count
+        counts["order_items"] = item_table.count
+
+    return counts
+
+if __name__ == "__main__":
+    print(generate_synthetic_data(csv_dir="synthetic_data"))
@@ -0,0 +1,33 @@
+import pytest
+from conftest import DATA_DIR
+from approximate_analyzer import ApproximateSalesAnalyzer
+from csv_loader import CSVLoader
+from sales_analyzer import SalesAnalyzer
+
+@pytest.fixture
+def loaded_db(db_path):
+    CSVLoader(db_path, DATA_DIR).bulk_load_all_data()
+    return db_path
+
+def test_top_products_match_exact_analyzer_on_small_data(loaded_db):
+    exact = SalesAnalyzer(loaded_db, cache_size=0).get_top_selling_products(5)
+    approximate = ApproximateSalesAnalyzer(loaded_db, cache_size=0).get_top_selling_products(5)
+
+    key = lambda row: (row["sku"], row["quantity_sold"])
+    assert sorted(map(key, approximate)) == sorted(map(key, exact))
+    exact_by_sku = {row["sku"]: row for row in exact}
+    for row in approximate:
+        assert row["revenue"] == pytest.approx(exact_by_sku[row["sku"]]["revenue"])
+        assert row["avg_price"] == pytest.approx(exact_by_sku[row["sku"]]["avg_price"])
+
+def test_sketches_saved_without_a_sketch_start_over(loaded_db):
+    analyzer = ApproximateSalesAnalyzer(loaded_db, cache_size=0)
+    expected = analyzer.get_top_selling_products(5)
+    conn = analyzer.db.get_connection()
+    conn.execute("DELETE FROM sketch_state WHERE name = 'product_lines'")
+    conn.commit()
+
+    reloaded = ApproximateSalesAnalyzer(loaded_db, cache_size=0)
+
+    assert reloaded.sketches.item_watermark == 0
+    assert reloaded.get_top_selling_products(5) == expected
@@ -0,0 +1,55 @@
+import asyncio
+import sqlite3
+import threading
+import time
+import pytest
+from conftest import DATA_DIR
+from async_analyzer import AsyncSalesAnalyzer
+from csv_loader import CSVLoader
+from sales_analyzer import SalesAnalyzer
+
+# Counts to a billion one row at a time: minutes unless interrupted
+SLOW_SQL = """
+WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 1000000000)
+SELECT COUNT(*) FROM n
+"""
+
+def test_timeout_interrupts_the_query_and_keeps_the_connection_usable(db_path, monkeypatch):
+    CSVLoader(db_path, DATA_DIR).bulk_load_all_data()
+    expected = SalesAnalyzer(db_path, cache_size=0).get_revenue_by_category()
+    outcome = {}
+    finished = threading.Event()
+
+    async def scenario():
+        async with AsyncSalesAnalyzer(db_path, max_workers=1, cache_size=0) as analyzer:
+            def slow_report(*args):
+                conn = analyzer.analyzer.db.get_connection()
+                outcome["conn"] = conn
+                try:
+                    conn.execute(SLOW_SQL).fetchone()
+                except sqlite3.OperationalError as e:
+                    outcome["error"] = e
+                    outcome["stopped_at"] = time.perf_counter()
+                    raise
+                finally:
+                    finished.set()
+
+            with monkeypatch.context() as patch:
+                patch.setattr(analyzer.analyzer, "get_revenue_by_category", slow_report)
+                with pytest.raises(TimeoutError):
+                    await analyzer.get_revenue_by_category(timeout=0.2)
+                timed_out_at = time.perf_counter()
+                assert await asyncio.get_running_loop().run_in_executor(None, finished.wait, 10)
+
+            # The single worker reuses the interrupted connection for the next call
+            revenue = await analyzer.get_revenue_by_category()
+            conn = await asyncio.get_running_loop().run_in_executor(
+                analyzer._executor, analyzer.analyzer.db.get_connection)
+            return timed_out_at, revenue, conn
+
+    timed_out_at, revenue, conn = asyncio.run(scenario())
+
+    assert "interrupted" in str(outcome["error"])
+    assert outcome["stopped_at"] - timed_out_at < 5
+    assert conn is outcome["conn"]
+    assert revenue == expected
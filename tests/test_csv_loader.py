@@ -0,0 +1,162 @@
+import csv
+import os
+import shutil
+import pytest
+from conftest import DATA_DIR, table_counts
+from csv_loader import CSVLoader
+from parallel_loader import ParallelCSVLoader
+
+def copy_data(tmp_path) -> str:
+    data_dir = str(tmp_path / "data")
+    shutil.copytree(DATA_DIR, data_dir)
+    return data_dir
+
+def fact_rows(db) -> dict:
+    conn = db.get_connection()
+    return {
+        "orders": conn.execute("SELECT * FROM orders ORDER BY id").fetchall(),
+        "order_items": conn.execute("SELECT * FROM order_items ORDER BY id").fetchall(),
+    }
+
+def test_incremental_load_matches_bulk_load_on_shipped_data(tmp_path):
+    bulk = CSVLoader(str(tmp_path / "bulk.db"), DATA_DIR)
+    bulk.bulk_load_all_data()
+    incremental = CSVLoader(str(tmp_path / "incremental.db"), DATA_DIR)
+    counts = incremental.incremental_load_all_data(producer_closed=True)
+
+    assert table_counts(incremental.db) == table_counts(bulk.db)
+    assert counts["orders"] == table_counts(bulk.db)["orders"]
+    assert [tuple(r) for r in fact_rows(incremental.db)["orders"]] == \
+        [tuple(r) for r in fact_rows(bulk.db)["orders"]]
+
+def test_incremental_rerun_is_idempotent(tmp_path):
+    loader = CSVLoader(str(tmp_path / "incremental.db"), DATA_DIR)
+    loader.incremental_load_all_data()
+    before = table_counts(loader.db)
+
+    counts = loader.incremental_load_all_data()
+
+    assert table_counts(loader.db) == before
+    assert counts == {table: 0 for table in counts}
+
+def test_incremental_reports_inserted_rows_after_rescan(tmp_path):
+    data_dir = copy_data(tmp_path)
+    loader = CSVLoader(str(tmp_path / "incremental.db"), data_dir)
+    loader.incremental_load_all_data()
+    path = os.path.join(data_dir, "orders.csv")
+    with open(path, "rb") as f:
+        content = f.read()
+    # Shrinking the file forces a rescan from the start; every row is already loaded
+    with open(path, "wb") as f:
+        f.write(content[:content.rindex(b"\n")])
+
+    counts = loader.incremental_load_all_data()
+
+    assert counts["orders"] == 0
+
+def test_unterminated_last_row_waits_until_the_producer_closes_the_file(tmp_path):
+    data_dir = copy_data(tmp_path)
+    path = os.path.join(data_dir, "orders.csv")
+    with open(path, newline="") as f:
+        ids = [int(row["id"]) for row in csv.DictReader(f)]
+    loader = CSVLoader(str(tmp_path / "incremental.db"), data_dir)
+
+    # The shipped file has no trailing newline, so its last row may still be being written
+    loader.incremental_load_all_data()
+    assert table_counts(loader.db)["orders"] == len(ids) - 1
+    with open(path, "a") as f:
+        f.write(f"\n{ids[-1] + 1},1,2024-02-01 10:00:00,completed,10.00,0.00,0.00")
+    assert loader.incremental_load_all_data()["orders"] == 1
+    with open(path, "a") as f:
+        f.write(f"\n{ids[-1] + 2},1,2024-02-01 11:00:00,pend")
+    assert loader.incremental_load_all_data()["orders"] == 1
+    # Complete as far as the bytes go, but only the producer knows no more follow
+    with open(path, "a") as f:
+        f.write("ing,20.00,0.00,0.00")
+    assert loader.incremental_load_all_data()["orders"] == 0
+    assert loader.incremental_load_all_data(producer_closed=True)["orders"] == 1
+
+    conn = loader.db.get_connection()
+    assert table_counts(loader.db)["orders"] == len(ids) + 2
+    assert conn.execute("SELECT status FROM orders WHERE id = ?", (ids[-1] + 2,)).fetchone()[0] == "pending"
+
+def test_fresh_load_refuses_a_database_with_orders(tmp_path):
+    loader = CSVLoader(str(tmp_path / "fresh.db"), DATA_DIR)
+    loader.bulk_load_all_data(fresh=True)
+    before = table_counts(loader.db)
+
+    with pytest.raises(ValueError):
+        loader.bulk_load_all_data(fresh=True)
+
+    assert table_counts(loader.db) == before
+    conn = loader.db.get_connection()
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger'").fetchone()[0] > 0
+
+def test_every_load_mode_loads_the_same_rows(tmp_path):
+    modes = {
+        "row by row": lambda loader: loader.load_all_data(),
+        "row by row, sorted input": lambda loader: loader.load_all_data(sorted_input=True),
+        "bulk": lambda loader: loader.bulk_load_all_data(),
+        "bulk, fresh": lambda loader: loader.bulk_load_all_data(fresh=True),
+        "incremental": lambda loader: loader.incremental_load_all_data(producer_closed=True),
+    }
+    counts = {}
+    for index, (mode, load) in enumerate(modes.items()):
+        loader = CSVLoader(str(tmp_path / f"mode{index}.db"), DATA_DIR)
+        load(loader)
+        counts[mode] = table_counts(loader.db)
+    parallel = ParallelCSVLoader(str(tmp_path / "parallel.db"), DATA_DIR, workers=2)
+    parallel.parallel_load_all_data()
+    counts["parallel"] = table_counts(parallel.db)
+
+    expected = counts["bulk"]
+    assert expected["orders"] == 20 and expected["order_items"] == 34
+    assert counts == {mode: expected for mode in counts}
+
+# Columns holding ids, per file, moved up by OFFSET in shifted_data
+ID_COLUMNS = {
+    "categories.csv": ["id"],
+    "products.csv": ["id", "category_id"],
+    "customers.csv": ["id"],
+    "orders.csv": ["customer_id"],
+    "order_items.csv": ["product_id"],
+}
+OFFSET = 100
+
+def shifted_data(tmp_path) -> str:
+    """A copy of the shipped data whose dimension ids do not start at 1."""
+    data_dir = copy_data(tmp_path)
+    for file_name, columns in ID_COLUMNS.items():
+        path = os.path.join(data_dir, file_name)
+        with open(path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        for row in rows:
+            for column in columns:
+                row[column] = str(int(row[column]) + OFFSET)
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+    return data_dir
+
+def sales_lines(db) -> list:
+    return [tuple(row) for row in db.get_connection().execute("""
+        SELECT oi.id, o.id, cu.email, p.sku, c.name, oi.quantity
+        FROM order_items oi
+        JOIN orders o ON o.id = oi.order_id
+        JOIN customers cu ON cu.id = o.customer_id
+        JOIN products p ON p.id = oi.product_id
+        JOIN categories c ON c.id = p.category_id
+        ORDER BY oi.id
+    """)]
+
+@pytest.mark.parametrize("fresh", [False, True])
+def test_bulk_load_keeps_source_ids_of_every_table(tmp_path, fresh):
+    shipped = CSVLoader(str(tmp_path / "shipped.db"), DATA_DIR)
+    shipped.bulk_load_all_data()
+    loader = CSVLoader(str(tmp_path / "shifted.db"), shifted_data(tmp_path))
+    loader.bulk_load_all_data(fresh=fresh)
+
+    assert sales_lines(loader.db) == sales_lines(shipped.db)
+    conn = loader.db.get_connection()
+    assert conn.execute("SELECT MIN(id) FROM products").fetchone()[0] == OFFSET + 1
@@ -0,0 +1,93 @@
+import os
+import re
+import sqlite3
+import pytest
+import database
+from connection_pool import ConnectionPool
+from database import BASE_DIR, MIGRATIONS, SCHEMA_VERSION, DatabaseManager
+
+V1_SCHEMA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schema_v1.sql")
+
+def triggers(conn) -> dict:
+    return {row[0]: row[1] for row in conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger'")}
+
+def test_version_5_database_migrates_to_current_product_sales_triggers(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = DatabaseManager(path).get_connection()
+    current = triggers(conn)
+    # Put back the triggers as migration 002 shipped them
+    with open(os.path.join(BASE_DIR, MIGRATIONS[2])) as f:
+        statements = re.findall(r"CREATE TRIGGER .*?END;", f.read(), re.S)
+    for statement in statements:
+        conn.execute(f"DROP TRIGGER {statement.split()[2]}")
+    conn.executescript("\n".join(statements))
+    # Tables and triggers that later migrations add rather than replace
+    for version in range(6, SCHEMA_VERSION + 1):
+        with open(os.path.join(BASE_DIR, MIGRATIONS[version])) as f:
+            script = f.read()
+        for name in set(re.findall(r"CREATE TRIGGER (\w+)", script)) - set(re.findall(r"DROP TRIGGER (\w+)", script)):
+            conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        for name in re.findall(r"CREATE TABLE (\w+)", script):
+            conn.execute(f"DROP TABLE {name}")
+    conn.execute("PRAGMA user_version = 5")
+    conn.commit()
+    assert triggers(conn) != current
+
+    migrated = DatabaseManager(path, pool=ConnectionPool(path)).get_connection()
+
+    assert migrated.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    assert triggers(migrated) == current
+
+def schema(path: str) -> dict:
+    conn = sqlite3.connect(path)
+    rows = conn.execute("SELECT type, name, sql FROM sqlite_master WHERE name NOT LIKE 'sqlite_%'")
+    objects = {(kind, name): " ".join(sql.split()) for kind, name, sql in rows}
+    conn.close()
+    return objects
+
+def version_1_database(path: str):
+    conn = sqlite3.connect(path)
+    with open(V1_SCHEMA) as f:
+        conn.executescript(f.read())
+    conn.executescript("""
+        INSERT INTO categories (id, name) VALUES (1, 'Books');
+        INSERT INTO products (id, name, sku, category_id, price) VALUES (1, 'Novel', 'BK-1', 1, 10.00);
+        INSERT INTO customers (id, email, first_name, last_name) VALUES (1, 'a@example.com', 'A', 'B');
+        INSERT INTO orders (id, customer_id, order_date, status, total_amount)
+            VALUES (1, 1, '2024-03-01 10:00:00', 'completed', 30.00);
+        INSERT INTO order_items (order_id, product_id, quantity, unit_price, total_price) VALUES (1, 1, 3, 10.00, 30.00);
+    """)
+    conn.close()
+
+def test_version_1_database_upgrades_one_migration_at_a_time(tmp_path, monkeypatch):
+    path = str(tmp_path / "v1.db")
+    version_1_database(path)
+
+    for target in range(2, SCHEMA_VERSION + 1):
+        monkeypatch.setattr(database, "SCHEMA_VERSION", target)
+        conn = DatabaseManager(path, pool=ConnectionPool(path)).get_connection()
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == target
+        conn.close()
+
+    fresh = str(tmp_path / "fresh.db")
+    DatabaseManager(fresh, pool=ConnectionPool(fresh)).close()
+    assert schema(path) == schema(fresh)
+    conn = DatabaseManager(path, pool=ConnectionPool(path)).get_connection()
+    assert tuple(conn.execute("SELECT total_quantity_sold, line_count FROM product_sales").fetchone()) == (3, 1)
+    assert tuple(conn.execute("SELECT total_orders, total_items_sold FROM sales_daily").fetchone()) == (1, 3)
+
+def test_failed_migration_leaves_the_previous_version(tmp_path, monkeypatch):
+    path = str(tmp_path / "v1.db")
+    version_1_database(path)
+    broken = tmp_path / "003_broken.sql"
+    broken.write_text("CREATE TABLE half_done (id INTEGER);\nCREATE TABLE orders (id INTEGER);\n")
+    monkeypatch.setitem(MIGRATIONS, 3, str(broken))
+
+    with pytest.raises(sqlite3.OperationalError):
+        DatabaseManager(path, pool=ConnectionPool(path))
+
+    conn = sqlite3.connect(path)
+    # Migration 2 stays applied; none of migration 3 does
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == 2
+    assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'product_sales'").fetchone()
+    assert not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'half_done'").fetchone()
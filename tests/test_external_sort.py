@@ -0,0 +1,57 @@
+import os
+import random
+from conftest import DATA_DIR, table_counts
+from csv_loader import CSVLoader
+from external_sort import external_sort, merge_join
+
+def shuffled_orders_and_items(seed: int = 7):
+    rng = random.Random(seed)
+    orders = [[str(order_id), f"customer-{order_id % 13}"] for order_id in range(1, 201)]
+    # Some orders have no items and some items have no order
+    items = [[str(item_id), str(rng.randint(1, 230)), str(rng.randint(1, 5))] for item_id in range(1, 601)]
+    rng.shuffle(orders)
+    rng.shuffle(items)
+    return orders, items
+
+def test_external_sort_spills_runs_and_merges_them(tmp_path):
+    _, items = shuffled_orders_and_items()
+    key = lambda row: int(row[1])
+    runs = tmp_path / "runs"
+    runs.mkdir()
+
+    rows = external_sort(items, key, max_rows=64, tmp_dir=str(runs))
+    first = next(rows)
+    assert len(os.listdir(runs)) == -(-len(items) // 64)
+    result = [first] + list(rows)
+
+    # Stable, like sorted(): equal order ids keep their input order
+    assert result == sorted(items, key=key)
+    assert os.listdir(runs) == []
+
+def test_merge_join_of_spilled_runs_matches_an_in_memory_join(tmp_path):
+    orders, items = shuffled_orders_and_items()
+    order_key = lambda row: int(row[0])
+    item_key = lambda row: int(row[1])
+
+    joined = merge_join(external_sort(orders, order_key, max_rows=16, tmp_dir=str(tmp_path)),
+                        external_sort(items, item_key, max_rows=50, tmp_dir=str(tmp_path)),
+                        order_key, item_key)
+
+    by_order = {}
+    for item in items:
+        by_order.setdefault(int(item[1]), []).append(item)
+    expected = [(order, sorted(by_order.get(order_key(order), []), key=lambda item: int(item[0])))
+                for order in sorted(orders, key=order_key)]
+    assert [(order, sorted(group, key=lambda item: int(item[0]))) for order, group in joined] == expected
+
+def test_row_by_row_load_with_a_tiny_memory_cap_matches_bulk_load(tmp_path):
+    bulk = CSVLoader(str(tmp_path / "bulk.db"), DATA_DIR)
+    bulk.bulk_load_all_data()
+    capped = CSVLoader(str(tmp_path / "capped.db"), DATA_DIR, max_rows_in_memory=3)
+    capped.load_all_data()
+
+    assert table_counts(capped.db) == table_counts(bulk.db)
+    query = ("SELECT o.customer_id, o.order_date, oi.product_id, oi.quantity FROM order_items oi "
+             "JOIN orders o ON o.id = oi.order_id ORDER BY 1, 2, 3, 4")
+    lines = lambda db: [tuple(row) for row in db.get_connection().execute(query)]
+    assert lines(capped.db) == lines(bulk.db)
@@ -0,0 +1,31 @@
+import os
+from database import BASE_DIR, MIGRATIONS, DatabaseManager
+from index_advisor import CANDIDATE_INDEXES, IndexAdvisor, IndexTrial
+
+def test_migration_is_written_to_the_given_path_only(tmp_path, db_path):
+    advisor = IndexAdvisor(db_path)
+    trials = [IndexTrial(name, sql, accepted=True) for name, sql in CANDIDATE_INDEXES[:2]]
+    shipped = sorted(os.listdir(os.path.join(BASE_DIR, "migrations")))
+    path = str(tmp_path / "advised.sql")
+
+    name, statements = advisor.write_migration(trials, path)
+
+    assert name == f"migrations/{max(MIGRATIONS) + 1:03d}_advised_indexes.sql"
+    assert sorted(os.listdir(os.path.join(BASE_DIR, "migrations"))) == shipped
+    script = open(path).read()
+    conn = DatabaseManager(db_path).get_connection()
+    conn.executescript(script)
+    conn.executescript(script)  # already applied: IF NOT EXISTS keeps it a no-op
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {name for name, _ in CANDIDATE_INDEXES[:2]} <= names
+    assert len(statements) == 2
+
+def test_migration_is_printed_without_a_path(db_path, capsys):
+    advisor = IndexAdvisor(db_path)
+    trials = [IndexTrial(name, sql, accepted=True) for name, sql in CANDIDATE_INDEXES[:1]]
+
+    _, statements = advisor.write_migration(trials)
+
+    output = capsys.readouterr().out
+    assert output.startswith(f"-- Schema version {max(MIGRATIONS) + 1}:")
+    assert f"{statements[0]};\n" in output
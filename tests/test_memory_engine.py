@@ -0,0 +1,119 @@
+import pytest
+from conftest import DATA_DIR, rounded
+from csv_loader import CSVLoader
+from memory_engine import InMemorySalesAnalyzer
+from sales_analyzer import SalesAnalyzer
+
+def reports(analyzer) -> tuple:
+    return (
+        analyzer.get_top_selling_products(100),
+        analyzer.get_top_selling_products(100, category="Electronics", status="completed"),
+        analyzer.get_revenue_by_category(),
+        analyzer.get_sales_trend(granularity="week"),
+    )
+
+@pytest.fixture
+def loader(db_path):
+    loader = CSVLoader(db_path, DATA_DIR)
+    loader.bulk_load_all_data()
+    return loader
+
+def assert_matches_sql(memory, exact):
+    assert rounded(reports(memory)) == rounded(reports(exact))
+
+def test_refresh_appends_new_rows_and_late_joins(loader, db_path):
+    memory = InMemorySalesAnalyzer(db_path, cache_size=0)
+    exact = SalesAnalyzer(db_path, cache_size=0)
+    assert_matches_sql(memory, exact)
+
+    conn = loader.db.get_connection()
+    next_order = conn.execute("SELECT MAX(id) FROM orders").fetchone()[0] + 1
+    # An item whose order and product arrive in later commits
+    conn.execute("INSERT INTO order_items (order_id, product_id, quantity, unit_price, total_price) "
+                 "VALUES (?, 1000, 3, 5.00, 15.00)", (next_order,))
+    conn.commit()
+    loader.db.bump_data_version()
+    assert memory.engine.refresh() == 1
+    assert_matches_sql(memory, exact)
+
+    conn.execute("INSERT INTO orders (id, customer_id, order_date, status, total_amount) "
+                 "VALUES (?, 1, '2024-12-30 09:00:00', 'completed', 15.00)", (next_order,))
+    conn.execute("INSERT INTO products (id, name, sku, category_id, price) "
+                 "VALUES (1000, 'Late product', 'LATE-1', 1, 5.00)")
+    conn.commit()
+    loader.db.bump_data_version()
+    memory.engine.refresh()
+    assert_matches_sql(memory, exact)
+    assert "LATE-1" in [row["sku"] for row in memory.get_top_selling_products(100)]
+
+    # Moving a product to another category moves its earlier items
+    conn.execute("UPDATE products SET category_id = 2 WHERE id = 1")
+    conn.commit()
+    loader.db.bump_data_version()
+    memory.engine.refresh()
+    assert_matches_sql(memory, exact)
+
+def test_refresh_grows_buffers_without_copying_history(loader, db_path):
+    memory = InMemorySalesAnalyzer(db_path, cache_size=0)
+    memory.engine.refresh()
+    buffer = memory.engine._columns["item_ids"].data
+    conn = loader.db.get_connection()
+    order_id = conn.execute("SELECT MAX(id) FROM orders").fetchone()[0]
+    conn.execute("INSERT INTO order_items (order_id, product_id, quantity, unit_price, total_price) "
+                 "VALUES (?, 1, 1, 1.00, 1.00)", (order_id,))
+    conn.commit()
+    loader.db.bump_data_version()
+
+    assert memory.engine.refresh() == 1
+    assert memory.engine._columns["item_ids"].data is buffer
+
+def test_refresh_rereads_the_catalog_only_after_it_changed(loader, db_path, monkeypatch):
+    memory = InMemorySalesAnalyzer(db_path, cache_size=0)
+    exact = SalesAnalyzer(db_path, cache_size=0)
+    memory.engine.refresh()
+    full_reads = []
+    load_dimensions = memory.engine._load_dimensions
+    monkeypatch.setattr(memory.engine, "_load_dimensions",
+                        lambda conn: full_reads.append(1) or load_dimensions(conn))
+    conn = loader.db.get_connection()
+
+    def write(sql):
+        conn.execute(sql)
+        conn.commit()
+        loader.db.bump_data_version()
+        memory.engine.refresh()
+        assert_matches_sql(memory, exact)
+
+    order_id = conn.execute("SELECT MAX(id) FROM orders").fetchone()[0]
+    write(f"INSERT INTO order_items (order_id, product_id, quantity, unit_price, total_price) "
+          f"VALUES ({order_id}, 1, 2, 3.00, 6.00)")
+    write("UPDATE products SET stock_quantity = stock_quantity - 2 WHERE id = 1")
+    write("INSERT INTO products (id, name, sku, category_id, price) VALUES (1001, 'New', 'NEW-1', 2, 3.00)")
+    write(f"INSERT INTO order_items (order_id, product_id, quantity, unit_price, total_price) "
+          f"VALUES ({order_id}, 1001, 4, 3.00, 12.00)")
+    assert not full_reads
+    assert "NEW-1" in [row["sku"] for row in memory.get_top_selling_products(100)]
+
+    write("UPDATE products SET sku = 'RENAMED-1' WHERE id = 1001")
+    write("UPDATE categories SET name = 'Renamed category' WHERE id = 2")
+    assert len(full_reads) == 2
+    assert "Renamed category" in memory.get_revenue_by_category()
+
+def test_queries_run_on_a_snapshot_taken_under_the_lock(loader, db_path):
+    memory = InMemorySalesAnalyzer(db_path, cache_size=0)
+    engine = memory.engine
+    engine.refresh()
+    before = engine.group_by(["product", "status"])
+    snapshot = engine._snapshot()
+
+    conn = loader.db.get_connection()
+    order_id = conn.execute("SELECT MAX(id) FROM orders").fetchone()[0]
+    conn.execute("INSERT INTO order_items (order_id, product_id, quantity, unit_price, total_price) "
+                 "VALUES (?, 1, 5, 2.00, 10.00)", (order_id,))
+    conn.commit()
+    loader.db.bump_data_version()
+    assert engine.refresh() == 1
+
+    # A query that started before the refresh still sees the rows it started with
+    assert type(engine).group_by.__wrapped__(snapshot, ["product", "status"]) == before
+    assert engine.group_by(["product", "status"]) != before
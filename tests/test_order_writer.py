@@ -0,0 +1,94 @@
+import queue
+import threading
+import time
+from decimal import Decimal
+import pytest
+from database import DatabaseManager
+from models import Customer, Order, OrderItem
+from order_writer import BatchedOrderWriter
+
+class RecordingDB:
+    """Stands in for DatabaseManager.create_orders; optionally holds each write until released."""
+
+    def __init__(self, block: bool = False):
+        self.batches = []
+        self.next_id = 1
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        if not block:
+            self.release.set()
+
+    def create_orders(self, orders):
+        self.entered.set()
+        self.release.wait(5)
+        self.batches.append(len(orders))
+        ids = list(range(self.next_id, self.next_id + len(orders)))
+        self.next_id += len(orders)
+        return ids
+
+def new_order(customer_id=1) -> tuple:
+    return Order(customer_id=customer_id, total_amount=Decimal("10.00")), [
+        OrderItem(product_id=1, quantity=1, unit_price=Decimal("10.00"), total_price=Decimal("10.00"))]
+
+def test_full_batch_is_written_without_waiting_for_delay():
+    db = RecordingDB()
+    with BatchedOrderWriter(db, max_batch=5, max_delay=60) as writer:
+        futures = [writer.submit(*new_order()) for _ in range(5)]
+        assert [f.result(timeout=5) for f in futures] == [1, 2, 3, 4, 5]
+        assert db.batches == [5]
+
+def test_partial_batch_is_written_after_delay():
+    db = RecordingDB()
+    with BatchedOrderWriter(db, max_batch=100, max_delay=0.05) as writer:
+        started = time.monotonic()
+        futures = [writer.submit(*new_order()) for _ in range(3)]
+        assert [f.result(timeout=5) for f in futures] == [1, 2, 3]
+        assert time.monotonic() - started < 2
+        assert db.batches == [3]
+
+def test_submit_blocks_when_buffer_is_full():
+    db = RecordingDB(block=True)
+    writer = BatchedOrderWriter(db, max_batch=1, max_delay=0, max_pending=2)
+    try:
+        writer.submit(*new_order())
+        assert db.entered.wait(5)  # the writer is holding the first order
+        writer.submit(*new_order())
+        writer.submit(*new_order())
+        with pytest.raises(queue.Full):
+            writer.submit(*new_order(), timeout=0.05)
+    finally:
+        db.release.set()
+        writer.close()
+    assert sum(db.batches) == 3
+
+def test_bad_order_fails_alone(tmp_path):
+    db = DatabaseManager(str(tmp_path / "writer.db"))
+    customer_id = db.add_customer(Customer(email="a@example.com", first_name="A", last_name="B"))
+    with BatchedOrderWriter(db, max_batch=10, max_delay=60) as writer:
+        good = [writer.submit(*new_order(customer_id)) for _ in range(3)]
+        bad = writer.submit(*new_order(customer_id=None))
+        more = writer.submit(*new_order(customer_id))
+        writer.flush(timeout=5)
+        with pytest.raises(Exception):
+            bad.result(timeout=5)
+        order_ids = [f.result(timeout=5) for f in good + [more]]
+    count = db.get_connection().execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+    assert count == 4 and len(set(order_ids)) == 4
+
+def test_cancelled_order_is_not_written_and_writer_survives():
+    db = RecordingDB(block=True)
+    writer = BatchedOrderWriter(db, max_batch=10, max_delay=0)
+    try:
+        first = writer.submit(*new_order())
+        assert db.entered.wait(5)
+        queued = [writer.submit(*new_order()) for _ in range(3)]
+        assert queued[1].cancel()
+        assert not first.cancel()  # already being written
+        db.release.set()
+        results = [f.result(timeout=5) for f in (first, queued[0], queued[2])]
+        assert results == [1, 2, 3]
+        assert writer.submit(*new_order()).result(timeout=5) == 4
+    finally:
+        db.release.set()
+        writer.close()
+    assert sum(db.batches) == 4
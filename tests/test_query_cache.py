@@ -0,0 +1,56 @@
+import subprocess
+import sys
+import threading
+import pytest
+from conftest import DATA_DIR
+from csv_loader import CSVLoader
+from sales_analyzer import SalesAnalyzer
+
+@pytest.fixture
+def analyzer(db_path):
+    CSVLoader(db_path, DATA_DIR).bulk_load_all_data()
+    return SalesAnalyzer(db_path)
+
+ADD_ITEM_SQL = ("INSERT INTO order_items (order_id, product_id, quantity, unit_price, total_price) "
+                "VALUES (1, 1, 100, 1.00, 100.00)")
+
+def quantity_of(analyzer, product_id=1) -> int:
+    sku = analyzer.db.get_connection().execute("SELECT sku FROM products WHERE id = ?", (product_id,)).fetchone()[0]
+    return {row["sku"]: row["quantity_sold"] for row in analyzer.get_top_selling_products(100)}[sku]
+
+def test_repeated_report_is_served_from_cache(analyzer):
+    analyzer.get_top_selling_products(100)
+    analyzer.get_top_selling_products(100)
+    assert analyzer.cache_stats()["hits"] == 1
+
+def test_write_in_this_process_invalidates(analyzer):
+    before = quantity_of(analyzer)
+    conn = analyzer.db.get_connection()
+    conn.execute(ADD_ITEM_SQL)
+    conn.commit()
+    analyzer.db.bump_data_version()
+    assert quantity_of(analyzer) == before + 100
+
+def test_write_from_another_process_invalidates(analyzer):
+    before = quantity_of(analyzer)
+    script = (f"import sqlite3; conn = sqlite3.connect({analyzer.db.db_path!r}); "
+              f"conn.execute({ADD_ITEM_SQL!r}); conn.commit()")
+    subprocess.run([sys.executable, "-c", script], check=True)
+    assert quantity_of(analyzer) == before + 100
+
+def test_write_seen_by_readers_on_other_threads(analyzer):
+    before = quantity_of(analyzer)
+    # Readers on threads whose pooled connections have seen different numbers of commits
+    warm = threading.Thread(target=quantity_of, args=(analyzer,))
+    warm.start()
+    warm.join()
+    script = (f"import sqlite3; conn = sqlite3.connect({analyzer.db.db_path!r}); "
+              f"conn.execute({ADD_ITEM_SQL!r}); conn.commit()")
+    subprocess.run([sys.executable, "-c", script], check=True)
+
+    results = []
+    reader = threading.Thread(target=lambda: results.append(quantity_of(analyzer)))
+    reader.start()
+    reader.join()
+    assert results == [before + 100]
+    assert quantity_of(analyzer) == before + 100
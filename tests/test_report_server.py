@@ -0,0 +1,54 @@
+import json
+import sqlite3
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from conftest import DATA_DIR
+from csv_loader import CSVLoader
+from report_server import ReportService, make_server
+from sales_analyzer import SalesAnalyzer
+
+@pytest.fixture
+def server(db_path):
+    CSVLoader(db_path, DATA_DIR).bulk_load_all_data()
+    service = ReportService(SalesAnalyzer(db_path, cache_size=0), interval=3600, poll=0.02, min_interval=0)
+    service.start()
+    assert service.wait_ready(10)
+    server = make_server(service, port=0)  # ephemeral port
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    service.stop()
+
+def get(server, path: str) -> dict:
+    with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}{path}", timeout=10) as response:
+        return json.loads(response.read())
+
+def quantity_sold(body: dict, sku: str) -> int:
+    return next(row["quantity_sold"] for row in body["data"] if row["sku"] == sku)
+
+def test_concurrent_requests_share_one_computation_and_see_new_writes(server, db_path):
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        bodies = list(pool.map(lambda _: get(server, "/reports/top_products"), range(32)))
+    assert all(body["data"] == bodies[0]["data"] for body in bodies)
+    assert {body["status"]["computations"] for body in bodies} == {1}
+    top = bodies[0]["data"][0]
+    sold = quantity_sold(bodies[0], top["sku"])
+
+    # Written by another connection, as another process would
+    conn = sqlite3.connect(db_path)
+    conn.execute("INSERT INTO order_items (order_id, product_id, quantity, unit_price, total_price) "
+                 "SELECT 1, id, 1000, price, price * 1000 FROM products WHERE sku = ?", (top["sku"],))
+    conn.commit()
+    conn.close()
+
+    deadline = time.monotonic() + 10
+    while get(server, "/health")["computations"] < 2 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    body = get(server, "/reports/top_products")
+    assert body["status"]["computations"] == 2
+    assert quantity_sold(body, top["sku"]) == sold + 1000
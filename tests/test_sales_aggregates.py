@@ -0,0 +1,90 @@
+from datetime import datetime
+from decimal import Decimal
+import pytest
+from conftest import DATA_DIR
+from csv_loader import CSVLoader
+from models import Order, OrderItem
+
+AGGREGATE_TABLES = {
+    "product_sales": "product_id",
+    "sales_daily": "period_start",
+    "sales_weekly": "period_start",
+    "sales_monthly": "period_start",
+}
+
+@pytest.fixture
+def db(db_path):
+    loader = CSVLoader(db_path, DATA_DIR)
+    loader.bulk_load_all_data()
+    return loader.db
+
+def aggregates(db) -> dict:
+    conn = db.get_connection()
+    return {table: [tuple(round(v, 6) if isinstance(v, float) else v for v in row)
+                    for row in conn.execute(f"SELECT * FROM {table} ORDER BY {key}")]
+            for table, key in AGGREGATE_TABLES.items()}
+
+def assert_match_raw_aggregates(db):
+    maintained = aggregates(db)
+    db.rebuild_sales_summary()
+    db.rebuild_rollups()
+    assert maintained == aggregates(db)
+
+def test_aggregates_after_load(db):
+    assert_match_raw_aggregates(db)
+
+def test_aggregates_after_inserts(db):
+    item = OrderItem(product_id=1, quantity=2, unit_price=Decimal("5.00"), total_price=Decimal("10.00"))
+    db.create_order(Order(customer_id=1, order_date=datetime(2025, 1, 3, 12), total_amount=Decimal("10.00")),
+                    [item, OrderItem(product_id=2, quantity=1, unit_price=Decimal("7.50"),
+                                     total_price=Decimal("7.50"))])
+    # A second line for a product the order already has must not count the order twice
+    db.create_orders([(Order(customer_id=2, order_date=datetime(2025, 2, 1), total_amount=Decimal("20.00")),
+                       [item, item])])
+    assert_match_raw_aggregates(db)
+
+def test_aggregates_after_deletes(db):
+    conn = db.get_connection()
+    # One line of a multi-line order, then whole orders with their items
+    conn.execute("""DELETE FROM order_items WHERE id = (
+        SELECT MIN(id) FROM order_items WHERE order_id IN (
+            SELECT order_id FROM order_items GROUP BY order_id HAVING COUNT(*) > 1))""")
+    conn.execute("DELETE FROM order_items WHERE order_id IN (SELECT id FROM orders WHERE id % 3 = 0)")
+    conn.execute("DELETE FROM orders WHERE id % 3 = 0")
+    conn.commit()
+    assert_match_raw_aggregates(db)
+
+@pytest.mark.parametrize("change", [
+    "quantity = quantity + 2, total_price = total_price * 2",
+    "unit_price = unit_price + 1",
+    "product_id = 3",
+    # Moves lines onto a product the order may already have, or off one it keeps
+    "product_id = CASE WHEN product_id = 1 THEN 2 ELSE 1 END",
+    "order_id = 1",
+])
+def test_aggregates_after_item_updates(db, change):
+    conn = db.get_connection()
+    conn.execute(f"UPDATE order_items SET {change} WHERE id % 4 = 1")
+    conn.commit()
+    assert_match_raw_aggregates(db)
+
+@pytest.mark.parametrize("change", [
+    "total_amount = total_amount + 10",
+    "order_date = datetime(order_date, '+1 day')",
+    # Into other weeks and months, emptying some periods and creating others
+    "order_date = datetime(order_date, '+40 days'), total_amount = total_amount / 2",
+    "order_date = NULL",
+    "status = 'cancelled'",
+])
+def test_aggregates_after_order_updates(db, change):
+    conn = db.get_connection()
+    conn.execute(f"UPDATE orders SET {change} WHERE id % 3 = 1")
+    conn.commit()
+    assert_match_raw_aggregates(db)
+
+def test_aggregates_after_deleting_orders_before_their_items(db):
+    conn = db.get_connection()
+    conn.execute("DELETE FROM orders WHERE id % 2 = 0")
+    conn.execute("DELETE FROM order_items WHERE order_id % 2 = 0")
+    conn.commit()
+    assert_match_raw_aggregates(db)
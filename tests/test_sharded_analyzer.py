@@ -0,0 +1,45 @@
+import shutil
+import pytest
+from conftest import DATA_DIR, rounded
+from csv_loader import CSVLoader
+from database import DatabaseManager
+from sales_analyzer import SalesAnalyzer
+from sharded_analyzer import ShardedSalesAnalyzer
+
+SHARDS = 3
+
+@pytest.fixture
+def databases(tmp_path):
+    """One database with every order, and SHARDS copies that each keep the orders with id % SHARDS == n."""
+    single = str(tmp_path / "single.db")
+    CSVLoader(single, DATA_DIR).bulk_load_all_data()
+    DatabaseManager(single).get_connection().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    shards = []
+    for shard in range(SHARDS):
+        path = str(tmp_path / f"shard{shard}.db")
+        shutil.copyfile(single, path)
+        conn = DatabaseManager(path).get_connection()
+        conn.execute("DELETE FROM order_items WHERE order_id % ? != ?", (SHARDS, shard))
+        conn.execute("DELETE FROM orders WHERE id % ? != ?", (SHARDS, shard))
+        conn.commit()
+        shards.append(path)
+    assert sum(DatabaseManager(path).get_connection().execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+               for path in shards) == 20
+    return single, shards
+
+def summary(rows) -> list:
+    return sorted(rounded([row.sku, row.total_quantity_sold, float(row.total_revenue),
+                           float(row.avg_selling_price), row.number_of_orders]) for row in rows)
+
+def test_sharded_reports_equal_single_database(databases):
+    single, shards = databases
+    exact = SalesAnalyzer(single, cache_size=0)
+    with ShardedSalesAnalyzer(shards) as sharded:
+        assert rounded(sharded.get_top_selling_products(100)) == rounded(exact.get_top_selling_products(100))
+        assert rounded(sharded.get_top_selling_products(5, category="Electronics", status="completed")) == \
+            rounded(exact.get_top_selling_products(5, category="Electronics", status="completed"))
+        assert rounded(sharded.get_revenue_by_category()) == rounded(exact.get_revenue_by_category())
+        # A window wide enough to reach the shipped data
+        daily = exact.get_daily_sales_report(100000)
+        assert daily and rounded(sharded.get_daily_sales_report(100000)) == rounded(daily)
+        assert summary(sharded.iter_sales_summary()) == summary(exact.iter_sales_summary())
@@ -0,0 +1,49 @@
+import pytest
+from conftest import DATA_DIR, TABLES, table_counts
+from csv_loader import CSVLoader
+from database import DatabaseManager
+from snapshot import FORMATS, default_format, export_snapshot, load_snapshot, restore_snapshot
+
+def available_formats():
+    return [fmt for fmt in FORMATS if fmt == "raw" or FORMATS.index(fmt) >= FORMATS.index(default_format())]
+
+def dump(db_path) -> dict:
+    conn = DatabaseManager(db_path).get_connection()
+    return {table: [tuple(row) for row in conn.execute(f"SELECT * FROM {table} ORDER BY 1")]
+            for table in TABLES + ["product_sales", "sales_daily"]}
+
+@pytest.fixture
+def source_db(tmp_path):
+    path = str(tmp_path / "source.db")
+    loader = CSVLoader(path, DATA_DIR)
+    loader.bulk_load_all_data()
+    conn = loader.db.get_connection()
+    # Real values that a sentinel would confuse with NULL, next to real NULLs
+    conn.execute("UPDATE products SET stock_quantity = -1, cost = -0.01 WHERE id = 1")
+    conn.execute("UPDATE products SET stock_quantity = NULL, cost = NULL, category_id = NULL WHERE id = 2")
+    conn.execute("UPDATE orders SET shipping_cost = NULL WHERE id = 1")
+    conn.commit()
+    return path
+
+@pytest.mark.parametrize("fmt", available_formats())
+def test_snapshot_round_trip(tmp_path, source_db, fmt):
+    snapshot_dir = str(tmp_path / f"snapshot-{fmt}")
+    restored = str(tmp_path / "restored.db")
+
+    export_snapshot(source_db, snapshot_dir, fmt)
+    counts = restore_snapshot(snapshot_dir, restored)
+
+    assert counts == table_counts(DatabaseManager(source_db))
+    assert dump(restored) == dump(source_db)
+
+def test_snapshot_keeps_nulls_apart_from_minus_one(tmp_path, source_db):
+    snapshot_dir = str(tmp_path / "snapshot")
+    export_snapshot(source_db, snapshot_dir, "raw", tables=["products"])
+    products = load_snapshot(snapshot_dir)["products"]
+
+    ids = list(products["id"])
+    first, second = ids.index(1), ids.index(2)
+    assert (products["stock_quantity"][first], products["stock_quantity_null"][first]) == (-1, 0)
+    assert (products["cost_cents"][first], products["cost_cents_null"][first]) == (-1, 0)
+    assert products["stock_quantity_null"][second] == 1
+    assert products["cost_cents_null"][second] == 1